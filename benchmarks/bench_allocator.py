@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of automatic address allocation.
+
+Registers without addresses are packed into the free ranges left between registers with fixed addresses.
+Run it from the project root:
+
+    python3 benchmarks/bench_allocator.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import Register, RegisterMap, AddressAllocator, Configuration  # noqa: E402
+
+REGS_NUM = 100000
+FIXED_NUM = 10000
+
+
+def build_rmap():
+    """Create register map with registers at fixed addresses and free ranges of different sizes between them."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        addr = 0
+        for i in range(FIXED_NUM):
+            rmap.add_regs(Register('fixed%d' % i, 'Register', addr))
+            addr += 4 * (2 + i % 7)
+    return rmap
+
+
+def main():
+    print("%6s %10s %10s %10s %8s %8s" % ('fit', 'registers', 'time, s', 'span, KB', 'gaps', 'ratio'))
+    for fit in ('first', 'best'):
+        rmap = build_rmap()
+        regs = [Register('reg%d' % i, 'Register') for i in range(REGS_NUM)]
+        alloc = AddressAllocator(rmap, fit=fit, reserved=[(0x1000, 0x2000)])
+        start = time.perf_counter()
+        alloc.add_regs(regs)
+        run_time = time.perf_counter() - start
+        stats = alloc.utilization()
+        print("%6s %10d %10.4f %10d %8d %8.2f" % (fit, REGS_NUM, run_time, stats['span'] // 1024, stats['gaps'],
+                                                  stats['ratio']))
+
+
+if __name__ == '__main__':
+    main()
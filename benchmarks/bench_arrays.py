@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of a register map with register arrays against the same map with single registers.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_arrays.py
+"""
+
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterArray, RegisterMap, Configuration  # noqa: E402
+
+
+def add_bfields(reg):
+    reg.add_bfields([
+        BitField('addr', 'Address', lsb=0, width=16),
+        BitField('len', 'Length', lsb=16, width=12),
+        BitField('en', 'Enable', lsb=31),
+    ])
+    return reg
+
+
+def build_rmap(tables_num, count, arrays):
+    """Create register map with tables of DMA descriptors."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i in range(tables_num):
+            base = i * count * 4
+            if arrays:
+                rmap.add_regs(add_bfields(RegisterArray('dma%d_desc' % i, 'Descriptor', base, count, 4)))
+            else:
+                for j in range(count):
+                    rmap.add_regs(add_bfields(Register('dma%d_desc%d' % (i, j), 'Descriptor', base + j * 4)))
+    return rmap
+
+
+def main():
+    print("%8s %8s %8s %12s %12s %12s" % ('tables', 'count', 'arrays', 'build, s', 'memory, KB', 'iterate, s'))
+    for tables_num, count in [(16, 256), (64, 256)]:
+        for arrays in [False, True]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            rmap = build_rmap(tables_num, count, arrays)
+            build_time = time.perf_counter() - start
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            start = time.perf_counter()
+            regs_num = sum(1 for _ in rmap)
+            iter_time = time.perf_counter() - start
+            assert regs_num == tables_num * count
+            print("%8d %8d %8s %12.4f %12d %12.4f" % (tables_num, count, arrays, build_time, memory // 1024, iter_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of register map variants created with clone() versus reading the map file for every variant.
+
+Variants differ in bridge type, data width and register reset, as in tests of HDL.
+Run it from the project root:
+
+    python3 benchmarks/bench_clone.py
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+sys.path.insert(0, '.')
+from corsair import RegisterMapReader, Configuration  # noqa: E402
+
+VARIANTS_NUM = 100
+
+
+def write_map(path, regs_num, bfields_num=8):
+    """Write map file with registers with several bit fields each."""
+    regmap = [{
+        'name': 'reg%d' % i,
+        'description': 'Register %d' % i,
+        'address': 4 * i,
+        'bfields': [{
+            'name': 'bf%d' % j,
+            'description': 'Bit field %d' % j,
+            'lsb': 4 * j,
+            'width': 4,
+            'access': 'rw' if j % 2 else 'ro',
+        } for j in range(bfields_num)]
+    } for i in range(regs_num)]
+    with open(path, 'w') as f:
+        json.dump({'regmap': regmap}, f)
+
+
+def variant_config(i):
+    """Configuration of the variant."""
+    config = Configuration()
+    config['lb_bridge']['type'].value = ['apb', 'axil', 'amm'][i % 3]
+    config['register_reset'].value = ['sync_pos', 'sync_neg', 'async_pos', 'async_neg', 'init_only'][i % 5]
+    return config
+
+
+def read_map(path, config):
+    with redirect_stdout(io.StringIO()):
+        return RegisterMapReader()(path, config)
+
+
+def main():
+    print("%8s %10s %12s %14s %10s" % ('regs', 'load, s', 'reload, s', 'clone, s', 'speedup'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for regs_num in [1000, 4000]:
+            path = os.path.join(tmpdir, 'map%d.json' % regs_num)
+            write_map(path, regs_num)
+            start = time.perf_counter()
+            rmap = read_map(path, Configuration())
+            load_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for i in range(VARIANTS_NUM):
+                variant = read_map(path, variant_config(i))
+            reload_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for i in range(VARIANTS_NUM):
+                variant = rmap.clone(variant_config(i))
+            clone_time = time.perf_counter() - start
+            assert variant.fingerprint() != rmap.fingerprint()
+            print("%8d %10.3f %12.3f %14.3f %10.1f" % (regs_num, load_time, reload_time, clone_time,
+                                                       reload_time / clone_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of encoding and decoding of register words.
+
+NumPy is required for arrays of words. Run it from the project root:
+
+    python3 benchmarks/bench_codec.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, vectorized  # noqa: E402
+
+
+def create_reg():
+    """Create register with four bit fields."""
+    reg = Register('ctrl', 'Control', 0x0)
+    reg.add_bfields([
+        BitField('en', 'Enable', lsb=0),
+        BitField('mode', 'Mode', lsb=1, width=3),
+        BitField('len', 'Length', lsb=8, width=12),
+        BitField('addr', 'Address', lsb=20, width=12),
+    ])
+    return reg
+
+
+def main():
+    codec = create_reg().codec
+    print("%12s %10s %10s %10s" % ('words', 'type', 'encode, s', 'decode, s'))
+    words_num = 100000
+    # bits 4-7 are not used by bit fields
+    words = [i * 2654435761 % 2**32 & 0xffffff0f for i in range(words_num)]
+    start = time.perf_counter()
+    fields = [codec.decode(word) for word in words]
+    decode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    encoded = [codec.encode(field) for field in fields]
+    encode_time = time.perf_counter() - start
+    assert encoded == words
+    print("%12d %10s %10.4f %10.4f" % (words_num, 'int', encode_time, decode_time))
+    if not vectorized.is_available():
+        print("NumPy is not installed!")
+        return
+    np = vectorized.np
+    for words_num in [1000000, 10000000]:
+        words = (np.arange(words_num, dtype=np.uint64) * np.uint64(2654435761)) % np.uint64(2**32)
+        words = words.astype(np.uint32) & np.uint32(0xffffff0f)
+        start = time.perf_counter()
+        fields = codec.decode(words)
+        decode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        encoded = codec.encode(fields)
+        encode_time = time.perf_counter() - start
+        assert (encoded == words).all()
+        print("%12d %10s %10.4f %10.4f" % (words_num, 'ndarray', encode_time, decode_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of load time and memory of regular and columnar register maps.
+
+Registers are loaded in bulk mode the same way as RegisterMapReader does it.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_columnar.py
+"""
+
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, ColumnarRegisterMap  # noqa: E402
+
+
+def make_data(regs_num, bfields_num):
+    """Create register map data like a file reader does."""
+    return [{
+        'name': 'reg%d' % i,
+        'description': 'Register %d' % i,
+        'address': 4 * i,
+        'bfields': [{
+            'name': 'bf%d' % j,
+            'description': 'Bit field %d of register %d' % (j, i),
+            'lsb': 4 * j,
+            'width': 4,
+            'initial': j,
+            'access': 'rw',
+        } for j in range(bfields_num)]
+    } for i in range(regs_num)]
+
+
+def load(rmap_cls, data):
+    """Create a map with registers from the data."""
+    rmap = rmap_cls()
+    with rmap.bulk():
+        for data_reg in data:
+            reg = Register(data_reg['name'], data_reg['description'], data_reg['address'])
+            for data_bf in data_reg['bfields']:
+                reg.add_bfields(BitField(**data_bf))
+            rmap.add_regs(reg)
+    return rmap
+
+
+def bench_load(rmap_cls, data):
+    """Measure load time and memory of a map with registers from the data."""
+    start = time.perf_counter()
+    load(rmap_cls, data)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    rmap = load(rmap_cls, data)
+    used, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rmap, elapsed, used - start_mem, peak - start_mem
+
+
+def main():
+    bfields_num = 8
+    print("%10s %22s %10s %14s %14s" % ('bfields', 'map', 'time, s', 'used, MB', 'peak, MB'))
+    for regs_num in [1000, 10000, 50000]:
+        data = make_data(regs_num, bfields_num)
+        for rmap_cls in [RegisterMap, ColumnarRegisterMap]:
+            rmap, elapsed, used, peak = bench_load(rmap_cls, data)
+            print("%10d %22s %10.3f %14.2f %14.2f" % (regs_num * bfields_num, rmap_cls.__name__,
+                                                      elapsed, used / 2**20, peak / 2**20))
+            del rmap
+
+
+if __name__ == '__main__':
+    main()
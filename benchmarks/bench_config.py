@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of creating, loading and copying many variant configurations.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_config.py
+"""
+
+import itertools
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import Configuration  # noqa: E402
+
+
+def build_variants():
+    """Create values of all the combinations of bridges, data widths and reset types, which are allowed."""
+    widths = {'amm': [8, 32, 128], 'apb': [8, 16, 32], 'axil': [32, 64], 'none': [16, 1024]}
+    variants = []
+    for bridge, reset, increment in itertools.product(widths, ['sync_pos', 'async_neg', 'init_only'], range(1, 100)):
+        for data_width in widths[bridge]:
+            # bridge goes after the data width, which it allows
+            variants.append({
+                'data_width': data_width,
+                'lb_bridge': {'type': bridge},
+                'register_reset': reset,
+                'regmap': {'address_increment_mode': 'custom', 'address_increment_value': hex(increment)},
+            })
+    return variants
+
+
+def measure(func, variants):
+    start = time.perf_counter()
+    result = [func(values) for values in variants]
+    return result, time.perf_counter() - start
+
+
+def load(values):
+    config = Configuration()
+    config.values = values
+    return config
+
+
+def main():
+    variants = build_variants()
+    print("%-12s %10s %10s" % ('action', 'configs', 'time, s'))
+    _, run_time = measure(lambda values: Configuration(), variants)
+    print("%-12s %10d %10.4f" % ('create', len(variants), run_time))
+    configs, run_time = measure(load, variants)
+    print("%-12s %10d %10.4f" % ('load', len(variants), run_time))
+    _, run_time = measure(lambda config: config.clone(), configs)
+    print("%-12s %10d %10.4f" % ('clone', len(variants), run_time))
+
+
+if __name__ == '__main__':
+    main()
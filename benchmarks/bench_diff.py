@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of structural difference between two big register maps with a few changes.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_diff.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, RegisterMapDiff, Configuration  # noqa: E402
+
+
+def build_rmap(regs_num):
+    """Create register map with two bit fields in every register."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i in range(regs_num):
+            reg = Register('reg%d' % i, 'Register %d' % i, address=4 * i)
+            reg.add_bfields([
+                BitField('bf_a', 'Bit field A', lsb=0, width=8, initial=i & 0xff),
+                BitField('bf_b', 'Bit field B', lsb=16, width=8, access='ro'),
+            ])
+            rmap.add_regs(reg)
+    return rmap
+
+
+def main():
+    print("%10s %10s %14s" % ('regs', 'changes', 'diff, s'))
+    for regs_num in [10000, 100000]:
+        old = build_rmap(regs_num)
+        new = build_rmap(regs_num)
+        for i in range(0, regs_num, 1000):
+            new[i]['bf_a'].initial = 0
+        start = time.perf_counter()
+        rmap_diff = RegisterMapDiff(old, new)
+        duration = time.perf_counter() - start
+        print("%10d %10d %14.4f" % (regs_num, len(rmap_diff.changed), duration))
+
+
+if __name__ == '__main__':
+    main()
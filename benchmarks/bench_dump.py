@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of decoding binary dumps of the register space.
+
+Dumps are created in a temporary directory. Run it from the project root:
+
+    python3 benchmarks/bench_dump.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, DumpDecoder, Configuration  # noqa: E402
+
+REGS_NUM = 100000
+DUMP_SIZE = 256 * 2**20
+
+
+def build_rmap():
+    """Create register map with registers spread over the dump."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i in range(REGS_NUM):
+            reg = Register('reg%d' % i, 'Register', i * (DUMP_SIZE // REGS_NUM // 4 * 4))
+            reg.add_bfields([BitField('bf%d' % j, 'Bit field', lsb=j * 8, width=8) for j in range(4)])
+            rmap.add_regs(reg)
+    return rmap
+
+
+def write_dump(path, changed_offset=None):
+    """Write dump filled with a pattern, optionally with a single changed byte."""
+    chunk = bytes(range(256)) * 4096
+    with open(path, 'wb') as f:
+        for _ in range(DUMP_SIZE // len(chunk)):
+            f.write(chunk)
+        if changed_offset is not None:
+            f.seek(changed_offset)
+            f.write(b'\xaa')
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    records_num = func()
+    run_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return records_num, run_time, peak
+
+
+def main():
+    rmap = build_rmap()
+    decoder = DumpDecoder(rmap)
+    with tempfile.TemporaryDirectory() as tmpdir, open(os.devnull, 'w') as devnull:
+        old_path, new_path = os.path.join(tmpdir, 'old.bin'), os.path.join(tmpdir, 'new.bin')
+        write_dump(old_path)
+        write_dump(new_path, rmap['reg777'].address + 1)
+        print("%8s %10s %10s %10s %16s" % ('action', 'dump, MB', 'records', 'time, s', 'peak memory, KB'))
+        for action, func in [
+            ('decode', lambda: decoder.write(decoder.decode(old_path), devnull)),
+            ('diff', lambda: decoder.write(decoder.diff(old_path, new_path), devnull)),
+        ]:
+            records_num, run_time, peak = measure(func)
+            print("%8s %10d %10d %10.4f %16d" % (action, DUMP_SIZE // 2**20, records_num, run_time, peak // 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the queries of registers and bit fields by categories against the walks over the whole map.
+
+Only a few registers of the map have FIFO bit fields, as it is usual for real designs. Run it from the project root:
+
+    python3 benchmarks/bench_index.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, Configuration  # noqa: E402
+
+REGS_NUM = [10000, 100000]
+FIFO_EVERY = 1000
+QUERIES_NUM = 20
+
+
+def build_rmap(regs_num):
+    """Create register map with 4 bit fields per register and a FIFO bit field in every 1000th register."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i in range(regs_num):
+            reg = Register('reg%d' % i, 'Register', i * 4, write_lock=(i % FIFO_EVERY == 1))
+            for j in range(4):
+                fifo = i % FIFO_EVERY == 0 and j == 0
+                reg.add_bfields(BitField('bf%d' % j, 'Bit field', lsb=8 * j, width=8, access='wo' if fifo else 'rw',
+                                         modifiers=['fifo'] if fifo else []))
+            rmap.add_regs(reg)
+    return rmap
+
+
+def walk(rmap):
+    return [(reg, bf) for reg in rmap for bf in reg if 'fifo' in bf.modifiers]
+
+
+def measure(func):
+    start = time.perf_counter()
+    for _ in range(QUERIES_NUM):
+        result = func()
+    return result, (time.perf_counter() - start) / QUERIES_NUM
+
+
+def main():
+    print("%10s %12s %12s %12s %12s" % ('registers', 'walk, ms', 'build, ms', 'query, ms', 'update, ms'))
+    for regs_num in REGS_NUM:
+        rmap = build_rmap(regs_num)
+        walked, walk_time = measure(lambda: walk(rmap))
+        start = time.perf_counter()
+        rmap.bfields_with(modifier='fifo')
+        build_time = time.perf_counter() - start
+        queried, query_time = measure(lambda: rmap.bfields_with(modifier='fifo'))
+        assert [(reg.name, bf.name) for reg, bf in walked] == [(reg.name, bf.name) for reg, bf in queried]
+        start = time.perf_counter()
+        rmap['reg5']['bf1'].modifiers = ['fifo']
+        rmap.bfields_with(modifier='fifo')
+        update_time = time.perf_counter() - start
+        print("%10d %12.3f %12.3f %12.3f %12.3f" % (regs_num, walk_time * 1e3, build_time * 1e3, query_time * 1e3,
+                                                    update_time * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of memory consumed by a register map with a lot of repeated bit fields.
+
+Every register has the same status flags and a few unique bit fields. The map is read from a JSON file
+with RegisterMapReader, so every bit field gets its own copies of strings from the parser.
+The script reports memory per bit field and the number of bit field definitions shared.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_intern.py
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+sys.path.insert(0, '.')
+from corsair import RegisterMapReader, Configuration  # noqa: E402
+from corsair.regmap import _BitFieldSpec  # noqa: E402
+
+# bit fields repeated in every register
+FLAGS = [
+    {'name': 'en', 'description': 'Enable the channel', 'lsb': 0, 'width': 1, 'access': 'rw'},
+    {'name': 'busy', 'description': 'Channel is busy with a transfer', 'lsb': 1, 'width': 1, 'access': 'ro',
+     'modifiers': ['hwu']},
+    {'name': 'err', 'description': 'Transfer error, write 1 to clear', 'lsb': 2, 'width': 1, 'access': 'rw',
+     'modifiers': ['hwu', 'w1tc']},
+    {'name': 'done', 'description': 'Transfer is done', 'lsb': 3, 'width': 1, 'access': 'ro',
+     'modifiers': ['hwu']},
+]
+
+
+def write_map(path, regs_num, unique_num):
+    """Write map file, where every register has the flags and unique_num unique bit fields."""
+    regmap = [{
+        'name': 'reg%d' % i,
+        'description': 'Register %d' % i,
+        'address': 4 * i,
+        'bfields': FLAGS + [{
+            'name': 'val%d' % j,
+            'description': 'Value %d of the register %d' % (j, i),
+            'lsb': 8 + 8 * j,
+            'width': 8,
+            'initial': i % 256,
+        } for j in range(unique_num)]
+    } for i in range(regs_num)]
+    with open(path, 'w') as f:
+        json.dump({'regmap': regmap}, f)
+
+
+def read_map(path):
+    """Read map file and measure memory taken by the map."""
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        rmap = RegisterMapReader()(path, Configuration())
+    # data parsed from the file are freed already
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return rmap, used
+
+
+def main():
+    regs_num = 20000
+    print("%8s %10s %10s %12s %10s" % ('regs', 'bfields', 'specs', 'memory, MB', 'B/bfield'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for unique_num in [0, 1, 3]:
+            path = os.path.join(tmpdir, 'map%d.json' % unique_num)
+            write_map(path, regs_num, unique_num)
+            rmap, used = read_map(path)
+            bfields_num = sum(len(reg) for reg in rmap)
+            print("%8d %10d %10d %12.1f %10.1f" % (regs_num, bfields_num, len(_BitFieldSpec._pool),
+                                                   used / 2**20, used / bfields_num))
+            del rmap
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of the register layout optimization for an access profile.
+
+Register map has registers with a few narrow bit fields, and the profile has sequences of bit fields
+from registers spread over the map. Run it from the project root:
+
+    python3 benchmarks/bench_layout.py
+"""
+
+import random
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, LayoutOptimizer, Configuration  # noqa: E402
+
+REGS_NUM = [1000, 5000]
+SEQS_NUM = 200
+
+
+def build_rmap(regs_num):
+    """Create register map, where every register has 1 to 3 bit fields of 1 to 8 bits."""
+    rnd = random.Random(42)
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i in range(regs_num):
+            reg = Register('reg%d' % i, 'Register', i * 4)
+            lsb = 0
+            for j in range(rnd.randint(1, 3)):
+                width = rnd.randint(1, 8)
+                reg.add_bfields(BitField('bf%d' % j, 'Bit field', width=width, lsb=lsb))
+                lsb += width
+            rmap.add_regs(reg)
+    return rmap
+
+
+def build_profile(rmap):
+    """Create profile with sequences of 2 to 4 random registers and frequent sequences first."""
+    rnd = random.Random(7)
+    regs = list(rmap)
+    return [(['%s.%s' % (reg.name, reg[0].name) for reg in rnd.sample(regs, rnd.randint(2, 4))], SEQS_NUM - i)
+            for i in range(SEQS_NUM)]
+
+
+def main():
+    print("%10s %10s %14s %14s %10s %10s" % ('registers', 'sequences', 'transactions', 'optimized',
+                                             'reduction', 'time, s'))
+    for regs_num in REGS_NUM:
+        rmap = build_rmap(regs_num)
+        opt = LayoutOptimizer(rmap, build_profile(rmap))
+        start = time.perf_counter()
+        _, report = opt.optimize()
+        run_time = time.perf_counter() - start
+        print("%10d %10d %14d %14d %10.2f %10.4f" % (regs_num, SEQS_NUM, report['transactions'],
+                                                     report['transactions_optimized'], report['reduction'], run_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of memory consumed by bit fields and registers.
+
+Bit fields are created the same way as readers do it, so every field gets its own copies of strings.
+The script fails if memory per bit field exceeds the target.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_memory.py
+"""
+
+import sys
+import json
+import tracemalloc
+sys.path.insert(0, '.')
+from corsair import BitField, Register  # noqa: E402
+
+# target for memory per bit field (including its share of a register), bytes
+BYTES_PER_BFIELD_TARGET = 200
+
+
+def build_regs(regs_num, bfields_num=8):
+    """Create registers from JSON-like data to avoid sharing of string literals."""
+    data = json.loads(json.dumps([{
+        'name': 'reg%d' % i,
+        'description': 'Register %d' % i,
+        'address': 4 * i,
+        'bfields': [{
+            'name': 'bf%d' % j,
+            'description': 'Bit field %d' % j,
+            'lsb': 4 * j,
+            'width': 4,
+            'access': 'rw' if j % 2 else 'ro',
+            'modifiers': ['hwu'],
+        } for j in range(bfields_num)]
+    } for i in range(regs_num)]))
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    regs = []
+    for data_reg in data:
+        reg = Register(data_reg['name'], data_reg['description'], data_reg['address'])
+        for data_bf in data_reg['bfields']:
+            reg.add_bfields(BitField(**data_bf))
+        regs.append(reg)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return regs, used
+
+
+def main():
+    regs_num, bfields_num = 10000, 8
+    regs, used = build_regs(regs_num, bfields_num)
+    bytes_per_bfield = used / (regs_num * bfields_num)
+    print("%d registers x %d bit fields: %.1f MB, %.1f bytes per bit field (target %d)" % (
+        regs_num, bfields_num, used / 2**20, bytes_per_bfield, BYTES_PER_BFIELD_TARGET))
+    if bytes_per_bfield > BYTES_PER_BFIELD_TARGET:
+        sys.exit("Target is not reached!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of register map pickling versus reading the map file.
+
+Pickled map is what workers of a process pool get, so it is compared with reading the map file in every worker.
+Run it from the project root:
+
+    python3 benchmarks/bench_pickle.py
+"""
+
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+sys.path.insert(0, '.')
+from corsair import RegisterMapReader, Configuration  # noqa: E402
+
+WORKERS_NUM = 4
+
+
+def write_map(path, regs_num, bfields_num=8):
+    """Write map file with registers with several bit fields each."""
+    regmap = [{
+        'name': 'reg%d' % i,
+        'description': 'Register %d' % i,
+        'address': 4 * i,
+        'bfields': [{
+            'name': 'bf%d' % j,
+            'description': 'Bit field %d' % j,
+            'lsb': 4 * j,
+            'width': 4,
+            'initial': i % 16,
+            'access': 'rw' if j % 2 else 'ro',
+        } for j in range(bfields_num)]
+    } for i in range(regs_num)]
+    with open(path, 'w') as f:
+        json.dump({'regmap': regmap}, f)
+
+
+def read_map(path, columnar=False):
+    with redirect_stdout(io.StringIO()):
+        return RegisterMapReader()(path, Configuration(), columnar=columnar)
+
+
+def regs_num_of(rmap):
+    """Job for a worker."""
+    return len(rmap)
+
+
+def main():
+    print("%8s %9s %10s %10s %10s %10s %10s %10s" % ('regs', 'columnar', 'file, KB', 'read, s', 'pickle, KB',
+                                                     'dumps, s', 'loads, s', 'pool, s'))
+    with tempfile.TemporaryDirectory() as tmpdir, ProcessPoolExecutor(WORKERS_NUM) as pool:
+        for regs_num in [1000, 10000, 50000]:
+            path = os.path.join(tmpdir, 'map%d.json' % regs_num)
+            write_map(path, regs_num)
+            for columnar in [False, True]:
+                start = time.perf_counter()
+                rmap = read_map(path, columnar)
+                read_time = time.perf_counter() - start
+                start = time.perf_counter()
+                data = pickle.dumps(rmap)
+                dumps_time = time.perf_counter() - start
+                start = time.perf_counter()
+                pickle.loads(data)
+                loads_time = time.perf_counter() - start
+                start = time.perf_counter()
+                lens = list(pool.map(regs_num_of, [rmap] * WORKERS_NUM))
+                pool_time = time.perf_counter() - start
+                assert lens == [regs_num] * WORKERS_NUM
+                print("%8d %9s %10d %10.3f %10d %10.3f %10.3f %10.3f" % (
+                    regs_num, columnar, os.path.getsize(path) // 1024, read_time, len(data) // 1024,
+                    dumps_time, loads_time, pool_time))
+
+
+if __name__ == '__main__':
+    main()
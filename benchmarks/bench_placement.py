@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of automatic placement of bit fields into registers.
+
+Bit fields of random widths, some of them aligned to byte lanes and some of them in groups to be kept together,
+are placed into registers. Run it from the project root:
+
+    python3 benchmarks/bench_placement.py
+"""
+
+import random
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, BitFieldPlacer  # noqa: E402
+
+FIELDS_NUM = [10000, 50000]
+
+
+def build_items(fields_num):
+    """Create bit fields with every 10th one aligned and every 5th one grouped with the next one."""
+    rnd = random.Random(42)
+    bfields = [BitField('bf%d' % i, 'Bit field', width=rnd.choice([1, 1, 2, 3, 4, 5, 8, 12, 16]))
+               for i in range(fields_num)]
+    aligned = [bf.name for bf in bfields[::10]]
+    items = []
+    idx = 0
+    while idx < fields_num:
+        if idx % 5 == 0 and idx + 1 < fields_num:
+            items.append(bfields[idx:idx + 2])
+            idx += 2
+        else:
+            items.append(bfields[idx])
+            idx += 1
+    return items, aligned, sum(bf.width for bf in bfields)
+
+
+def main():
+    print("%10s %10s %12s %10s" % ('fields', 'registers', 'lower bound', 'time, s'))
+    for fields_num in FIELDS_NUM:
+        items, aligned, bits = build_items(fields_num)
+        start = time.perf_counter()
+        regs = BitFieldPlacer(data_width=32).place(items, aligned=aligned)
+        run_time = time.perf_counter() - start
+        print("%10d %10d %12d %10.4f" % (fields_num, len(regs), -(-bits // 32), run_time))
+
+
+if __name__ == '__main__':
+    main()
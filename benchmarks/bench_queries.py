@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of address queries of a register map against the naive scans of all the registers.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_queries.py
+"""
+
+import random
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import Register, RegisterMap, ColumnarRegisterMap, Configuration  # noqa: E402
+
+QUERIES_NUM = 200
+
+
+def build_rmap(rmap_cls, regs_num):
+    """Create register map with a free word after every 16 registers."""
+    rmap = rmap_cls(Configuration())
+    with rmap.bulk():
+        rmap.add_regs([Register('reg%d' % i, 'Register', (i + i // 16) * 4) for i in range(regs_num)])
+    return rmap
+
+
+def naive_at(rmap, addr):
+    return [reg for reg in rmap.regs if reg.address == addr]
+
+
+def naive_in_range(rmap, lo, hi):
+    return [reg for reg in rmap.regs if lo <= reg.address < hi]
+
+
+def naive_gaps(rmap, lo, hi):
+    gaps = []
+    free_addr = lo
+    for reg in rmap.regs:
+        if reg.address >= hi:
+            break
+        if reg.address > free_addr:
+            gaps.append((free_addr, reg.address))
+        free_addr = max(free_addr, reg.address + 4)
+    if free_addr < hi:
+        gaps.append((free_addr, hi))
+    return gaps
+
+
+def measure(func, queries):
+    start = time.perf_counter()
+    results = [func(*query) for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    print("%22s %8s %8s %14s %14s" % ('map', 'regs', 'query', 'naive, us', 'indexed, us'))
+    random.seed(0)
+    for rmap_cls in [RegisterMap, ColumnarRegisterMap]:
+        for regs_num in [10000, 100000]:
+            rmap = build_rmap(rmap_cls, regs_num)
+            end = rmap.regs[-1].address
+            addrs = [random.randrange(0, end) // 4 * 4 for _ in range(QUERIES_NUM)]
+            queries = {
+                'at': ([(addr,) for addr in addrs], naive_at, rmap.at),
+                'in_range': ([(addr, addr + 0x100) for addr in addrs], naive_in_range, rmap.in_range),
+                'gaps': ([(addr, addr + 0x100) for addr in addrs], naive_gaps,
+                         lambda lo, hi: rmap.gaps(lo=lo, hi=hi)),
+            }
+            for name, (args, naive, indexed) in queries.items():
+                naive_time, naive_results = measure(lambda *query: naive(rmap, *query), args[:20])
+                indexed_time, indexed_results = measure(indexed, args)
+                assert [[getattr(reg, 'name', reg) for reg in result] for result in naive_results] == \
+                    [[getattr(reg, 'name', reg) for reg in result] for result in indexed_results[:20]]
+                print("%22s %8d %8s %14.1f %14.1f" % (rmap_cls.__name__, regs_num, name, naive_time * 1e6,
+                                                      indexed_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of filling a wide register with many single-bit fields.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_register_bfields.py
+"""
+
+import sys
+import time
+import random
+sys.path.insert(0, '.')
+from corsair import BitField, Register  # noqa: E402
+
+
+def bench_add_bfields(width, shuffle=False):
+    """Measure time of adding single-bit fields to all bits of a register one by one."""
+    bfields = [BitField('flag%d' % i, 'Status flag %d' % i, lsb=i, access='ro') for i in range(width)]
+    if shuffle:
+        random.Random(width).shuffle(bfields)
+    reg = Register('status', 'Status flags', address=0)
+    start = time.perf_counter()
+    for bf in bfields:
+        reg.add_bfields(bf)
+    return time.perf_counter() - start
+
+
+def main():
+    print("%10s %10s %12s %16s" % ('bfields', 'order', 'time, s', 'per field, us'))
+    for width in [64, 128, 256, 512, 1024]:
+        for shuffle in [False, True]:
+            elapsed = bench_add_bfields(width, shuffle)
+            print("%10d %10s %12.4f %16.2f" % (width, 'random' if shuffle else 'ascending',
+                                               elapsed, elapsed / width * 1e6))
+
+
+if __name__ == '__main__':
+    main()
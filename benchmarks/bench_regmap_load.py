@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of register map loading time versus number of registers.
+
+Time per register should stay (almost) constant when the number of registers grows,
+i.e. load time grows linearly for registers in ascending order of addresses
+and linear-logarithmically for registers in random order or added in bulk mode.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_regmap_load.py
+"""
+
+import sys
+import time
+import random
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, Configuration  # noqa: E402
+
+
+def build_regs(regs_num, bfields_num=4):
+    """Create list of registers with several bit fields each."""
+    regs = []
+    for i in range(regs_num):
+        reg = Register('reg%d' % i, 'Register %d' % i, address=4 * i)
+        reg.add_bfields([BitField('bf%d' % j, 'Bit field %d' % j, lsb=8 * j, width=8) for j in range(bfields_num)])
+        regs.append(reg)
+    return regs
+
+
+def bench_load(regs_num, shuffle=False, bulk=False):
+    """Measure time of filling a map and looking up every register by name."""
+    regs = build_regs(regs_num)
+    if shuffle:
+        random.Random(regs_num).shuffle(regs)
+    start = time.perf_counter()
+    rmap = RegisterMap(Configuration())
+    if bulk:
+        with rmap.bulk():
+            for reg in regs:
+                rmap.add_regs(reg)
+    else:
+        for reg in regs:
+            rmap.add_regs(reg)
+    for reg in regs:
+        rmap[reg.name][regs[0][0].name]
+    return time.perf_counter() - start
+
+
+def main():
+    print("%10s %10s %6s %12s %16s" % ('regs', 'order', 'bulk', 'time, s', 'per reg, us'))
+    for regs_num in [1000, 2000, 4000, 8000, 16000, 32000, 64000]:
+        for shuffle, bulk in [(False, False), (True, False), (True, True)]:
+            elapsed = bench_load(regs_num, shuffle, bulk)
+            print("%10d %10s %6s %12.4f %16.2f" % (regs_num, 'random' if shuffle else 'ascending', bulk,
+                                                   elapsed, elapsed / regs_num * 1e6))
+
+
+if __name__ == '__main__':
+    main()
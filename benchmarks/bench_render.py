@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of HDL and documentation rendering for a large register map.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_render.py
+"""
+
+import sys
+import io
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, Configuration, HdlWriter, DocsWriter  # noqa: E402
+
+
+def build_rmap(regs_num, bfields_num=8):
+    """Create register map with fields of different kinds."""
+    kinds = [('rw', []), ('rw', ['hwu']), ('ro', []), ('ro', ['hwu', 'rtc']), ('wo', ['sc']), ('rw', ['hwu', 'w1tc'])]
+    config = Configuration()
+    config['name'].value = 'regs'
+    rmap = RegisterMap(config)
+    with rmap.bulk():
+        for i in range(regs_num):
+            reg = Register('reg%d' % i, 'Register %d' % i, address=4 * i)
+            for j in range(bfields_num):
+                access, modifiers = kinds[(i + j) % len(kinds)]
+                reg.add_bfields(BitField('bf%d' % j, 'Bit field %d' % j, lsb=4 * j, width=4,
+                                         access=access, modifiers=modifiers))
+            rmap.add_regs(reg)
+    return rmap
+
+
+def bench_render(writer, rmap, path):
+    """Measure time of rendering a file with a writer."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        writer(path, rmap)
+    return time.perf_counter() - start
+
+
+def main():
+    regs_num = 2000
+    rmap = build_rmap(regs_num)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        hdl_times = [bench_render(HdlWriter(), rmap, str(Path(tmpdir) / 'regs.v')) for _ in range(2)]
+        docs_time = bench_render(DocsWriter(), rmap, str(Path(tmpdir) / 'regs.md'))
+    print("%d registers: HDL %.3f s (again %.3f s), docs %.3f s" % (regs_num, hdl_times[0], hdl_times[1], docs_time))
+
+
+if __name__ == '__main__':
+    main()
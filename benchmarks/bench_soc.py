@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of checking and building the address space of a system on chip.
+
+Register maps of a few IP types are instantiated as thousands of blocks with millions of registers in total.
+Run it from the project root:
+
+    python3 benchmarks/bench_soc.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import Register, RegisterMap, AddressSpace, Configuration  # noqa: E402
+
+IP_NUM = 10
+BLOCKS_NUM = 3000
+REGS_NUM = 1000
+WINDOW = 0x1000
+
+
+def build_space():
+    """Create address space with blocks placed into windows with free space between them."""
+    ips = []
+    for i in range(IP_NUM):
+        rmap = RegisterMap(Configuration())
+        with rmap.bulk():
+            rmap.add_regs([Register('ip%d_reg%d' % (i, j), 'Register', j * 4) for j in range(REGS_NUM)])
+        ips.append(rmap)
+    soc = AddressSpace()
+    for i in range(BLOCKS_NUM):
+        soc.add_block('blk%d' % i, ips[i % IP_NUM], 2 * i * WINDOW, WINDOW)
+    return soc, ips
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    soc, ips = build_space()
+    print("%-32s %10s %10s" % ('action', 'problems', 'time, s'))
+    for action, change in [
+        ('full check', None),
+        ('check of one block moved', lambda: soc.move_block('blk1500', base=2998 * WINDOW + 0x800)),
+        ('check of one block moved back', lambda: soc.move_block('blk1500', base=3000 * WINDOW)),
+        ('check of one IP out of windows', lambda: ips[0].add_regs(Register('extra0', 'Register', WINDOW))),
+        ('check of another IP changed', lambda: ips[1].add_regs(Register('extra1', 'Register', WINDOW - 4))),
+    ]:
+        if change is not None:
+            change()
+        problems, run_time = measure(soc.check)
+        print("%-32s %10d %10.4f" % (action, len(problems), run_time))
+    for i in range(0, BLOCKS_NUM, IP_NUM):
+        soc.move_block('blk%d' % i, size=2 * WINDOW)
+    problems, run_time = measure(soc.check)
+    print("%-32s %10d %10.4f" % ('check of windows resized', len(problems), run_time))
+    top, run_time = measure(soc.build)
+    print("%-32s %10s %10.4f" % ('build of %d registers' % len(top), '-', run_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of a chip-level map built from IP-level maps as submaps against the same map concatenated flat.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_submaps.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, Configuration  # noqa: E402
+
+
+def build_ip(regs_num):
+    """Create IP-level register map."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i in range(regs_num):
+            reg = Register('reg%d' % i, 'Register', i * 4)
+            reg.add_bfields([
+                BitField('data', 'Data', lsb=0, width=16),
+                BitField('en', 'Enable', lsb=31),
+            ])
+            rmap.add_regs(reg)
+    return rmap
+
+
+def build_flat(ips, block_size):
+    """Concatenate IP-level maps into a single flat map."""
+    rmap = RegisterMap(Configuration())
+    with rmap.bulk():
+        for i, ip in enumerate(ips):
+            for reg in ip:
+                flat_reg = Register('ip%d_%s' % (i, reg.name), reg.description, i * block_size + reg.address)
+                flat_reg.add_bfields([BitField(bf.name, bf.description, bf.initial, bf.width, bf.lsb, bf.access)
+                                      for bf in reg])
+                rmap.add_regs(flat_reg)
+    return rmap
+
+
+def build_hier(ips, block_size):
+    """Place IP-level maps into a chip-level map as submaps."""
+    rmap = RegisterMap(Configuration())
+    for i, ip in enumerate(ips):
+        rmap.add_submap('ip%d' % i, ip, i * block_size)
+    return rmap
+
+
+def main():
+    print("%8s %8s %8s %12s %14s %12s" % ('ips', 'regs', 'hier', 'build, s', 'revalidate, s', 'iterate, s'))
+    for ips_num, regs_num in [(32, 1000), (64, 2000)]:
+        block_size = 0x10000
+        for hier in [False, True]:
+            ips = [build_ip(regs_num) for _ in range(ips_num)]
+            start = time.perf_counter()
+            rmap = build_hier(ips, block_size) if hier else build_flat(ips, block_size)
+            build_time = time.perf_counter() - start
+            rmap._validate()
+            # change a single register of an IP and validate the whole map again
+            reg = rmap['ip7_reg5'].reg if hier else rmap['ip7_reg5']
+            reg['en'].initial = 1
+            start = time.perf_counter()
+            rmap._validate()
+            revalidate_time = time.perf_counter() - start
+            start = time.perf_counter()
+            regs_num_total = sum(1 for _ in rmap)
+            iter_time = time.perf_counter() - start
+            assert regs_num_total == ips_num * regs_num
+            print("%8d %8d %8s %12.4f %14.6f %12.4f" % (ips_num, regs_num, hier, build_time, revalidate_time,
+                                                        iter_time))
+
+
+if __name__ == '__main__':
+    main()
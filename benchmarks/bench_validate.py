@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of register map validation with a lot of complementary registers.
+
+Run it from the project root:
+
+    python3 benchmarks/bench_validate.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap  # noqa: E402
+
+
+def build_rmap(pairs_num):
+    """Create register map with complementary pairs only."""
+    rmap = RegisterMap()
+    with rmap.bulk():
+        for i in range(pairs_num):
+            for access in ['ro', 'wo']:
+                reg = Register('reg%d_%s' % (i, access), 'Register %d' % i, address=4 * i, complementary=True)
+                reg.add_bfields(BitField('data', 'Data', width=32, access=access))
+                rmap.add_regs(reg)
+    return rmap
+
+
+def main():
+    print("%10s %14s %14s" % ('regs', 'first, s', 'again, s'))
+    for pairs_num in [1000, 5000, 20000]:
+        rmap = build_rmap(pairs_num)
+        times = []
+        for _ in range(2):
+            start = time.perf_counter()
+            rmap._validate()
+            times.append(time.perf_counter() - start)
+        print("%10d %14.4f %14.6f" % (len(rmap), times[0], times[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark of vectorized checks in bulk mode against the per-register ones.
+
+NumPy is required for vectorized checks. Run it from the project root:
+
+    python3 benchmarks/bench_vectorized.py
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+from corsair import BitField, Register, RegisterMap, ColumnarRegisterMap, Configuration  # noqa: E402
+from corsair import vectorized  # noqa: E402
+
+
+def create_regs(regs_num):
+    """Create registers with four bit fields each."""
+    regs = []
+    for i in range(regs_num):
+        reg = Register('reg%d' % i, 'Register', i * 4)
+        reg.add_bfields([BitField('bf%d' % j, 'Bit field', lsb=j * 8, width=8, initial=j) for j in range(4)])
+        regs.append(reg)
+    return regs
+
+
+def main():
+    if not vectorized.is_available():
+        print("NumPy is not installed!")
+        return
+    print("%10s %22s %10s %10s" % ('regs', 'map', 'vectorize', 'add, s'))
+    for regs_num in [50000, 200000]:
+        for rmap_cls in [RegisterMap, ColumnarRegisterMap]:
+            for vectorize in [False, True]:
+                regs = create_regs(regs_num)
+                rmap = rmap_cls(Configuration())
+                start = time.perf_counter()
+                with rmap.bulk(vectorize):
+                    rmap.add_regs(regs)
+                add_time = time.perf_counter() - start
+                assert len(rmap) == regs_num
+                print("%10d %22s %10s %10.4f" % (regs_num, rmap_cls.__name__, vectorize, add_time))
+
+
+if __name__ == '__main__':
+    main()
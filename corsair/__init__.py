@@ -14,6 +14,11 @@ except (ImportError, ModuleNotFoundError) as e:
     __version__ = 'git-latest'
 
 from .config import (
+    Rule,
+    AnyValue,
+    OneOf,
+    AtLeast,
+    OneOfFor,
     Parameter,
     ParameterGroup,
     Configuration
@@ -22,9 +27,49 @@ from .config import (
 from .regmap import (
     BitField,
     Register,
+    RegisterArray,
+    RegisterArrayElement,
+    Submap,
+    SubmapRegister,
     RegisterMap
 )
 
+from .columnar import (
+    BitFieldView,
+    RegisterView,
+    ColumnarRegisterMap
+)
+
+from .codec import (
+    RegisterCodec
+)
+
+from .allocator import (
+    AddressAllocator
+)
+
+from .placement import (
+    BitFieldPlacer
+)
+
+from .layout import (
+    LayoutOptimizer
+)
+
+from .soc import (
+    AddressSpace
+)
+
+from .dump import (
+    DumpDecoder
+)
+
+from .diff import (
+    BitFieldChange,
+    RegisterChange,
+    RegisterMapDiff
+)
+
 from .readers import (
     RegisterMapReader,
     ConfigurationReader
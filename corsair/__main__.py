@@ -7,6 +7,8 @@
 import sys
 import os
 import argparse
+import contextlib
+import copy
 from pathlib import Path
 import corsair
 from . import utils
@@ -53,6 +55,32 @@ def parse_arguments():
                         metavar='<file>',
                         dest='dump_config',
                         help='dump configuration to <file>')
+    parser.add_argument('--diff',
+                        metavar=('<old>', '<new>'),
+                        nargs=2,
+                        dest='diff',
+                        help='show structural difference between register maps from <old> and <new> files')
+    parser.add_argument('--decode-dump',
+                        metavar='<file>',
+                        nargs='+',
+                        dest='decode_dump',
+                        help='decode binary dump <file> of the register space with register map;'
+                             ' if two files are given, show bit fields with different values')
+    parser.add_argument('--dump-base',
+                        metavar='<addr>',
+                        dest='dump_base',
+                        default='0',
+                        help='base address of the binary dump (default: 0)')
+    parser.add_argument('--dump-endian',
+                        dest='dump_endian',
+                        choices=['little', 'big'],
+                        default='little',
+                        help='byte order of the binary dump (default: little)')
+    parser.add_argument('--dump-format',
+                        dest='dump_format',
+                        choices=['jsonl', 'csv'],
+                        default='jsonl',
+                        help='format of the binary dump report (default: jsonl)')
     parser.add_argument('--output-dir',
                         metavar='<dir>',
                         dest='outdir',
@@ -91,6 +119,17 @@ def parse_arguments():
     if args.dump_config and not (args.regmap or args.config):
         parser.error("Not able to proceed without -r/--regmap or -c/--config argument!")
 
+    if args.decode_dump and not args.regmap:
+        parser.error("Not able to proceed without -r/--regmap argument!")
+
+    if args.decode_dump and len(args.decode_dump) > 2:
+        parser.error("Not able to decode more than two binary dumps at once!")
+
+    try:
+        args.dump_base = int(args.dump_base, 0)
+    except ValueError:
+        parser.error("Wrong base address '%s' of the binary dump!" % args.dump_base)
+
     return args
 
 
@@ -116,16 +155,38 @@ def main():
         config = corsair.Configuration()
         corsair.ConfigurationWriter()(args.template_config, config)
 
-    # parse input files
-    if args.config:
-        config = corsair.ConfigurationReader()(args.config)
-    else:
-        config = corsair.Configuration()
+    # parse input files, where progress goes to stderr, if stdout is used for the report of dumps decoding
+    with contextlib.redirect_stdout(sys.stderr) if args.decode_dump else contextlib.nullcontext():
+        if args.config:
+            config = corsair.ConfigurationReader()(args.config)
+        else:
+            config = corsair.Configuration()
 
-    if args.regmap:
-        rmap = corsair.RegisterMapReader()(args.regmap, config)
-    else:
-        rmap = corsair.RegisterMap(config)
+        if args.regmap:
+            rmap = corsair.RegisterMapReader()(args.regmap, config)
+        else:
+            rmap = corsair.RegisterMap(config)
+
+    # compare register maps
+    if args.diff:
+        old_rmap = corsair.RegisterMapReader()(args.diff[0], copy.deepcopy(config))
+        new_rmap = corsair.RegisterMapReader()(args.diff[1], copy.deepcopy(config))
+        rmap_diff = corsair.RegisterMapDiff(old_rmap, new_rmap)
+        if rmap_diff:
+            print(rmap_diff)
+        else:
+            print('No differences found.')
+        sys.exit(1 if rmap_diff else 0)
+
+    # decode binary dumps
+    if args.decode_dump:
+        decoder = corsair.DumpDecoder(rmap, args.dump_base, args.dump_endian)
+        if len(args.decode_dump) == 1:
+            decoder.write(decoder.decode(args.decode_dump[0]), sys.stdout, args.dump_format)
+            sys.exit(0)
+        else:
+            changes_num = decoder.write(decoder.diff(*args.decode_dump), sys.stdout, args.dump_format)
+            sys.exit(1 if changes_num else 0)
 
     # dump files
     if args.dump_regmap:
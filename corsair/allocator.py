@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Allocation of addresses for registers without addresses.
+"""
+
+from bisect import bisect_left, insort
+import heapq
+from .regmap import RegisterArray
+from . import utils
+
+
+class _FreeGaps():
+    """Free address ranges in allocation units, which are taken from the start to satisfy requests.
+
+    First fit uses a segment tree with the largest range size of every subtree, so the lowest range,
+    which is large enough, is found in O(log g) for g ranges. Best fit uses sorted sizes of the ranges
+    and a heap of ranges for every size, so the smallest range, which is large enough, is found
+    with a binary search.
+    """
+    def __init__(self, gaps, best_fit=False):
+        self._starts = [start for start, _ in gaps]
+        sizes = [end - start for start, end in gaps]
+        self._best_fit = best_fit
+        if best_fit:
+            # indexes of ranges for every size; index order is the address order
+            self._by_size = {}
+            for idx, size in enumerate(sizes):
+                self._by_size.setdefault(size, []).append(idx)
+            self._size_keys = sorted(self._by_size)
+        else:
+            self._leaves = 1 << max(len(sizes) - 1, 0).bit_length()
+            self._tree = [0] * self._leaves + sizes + [0] * (self._leaves - len(sizes))
+            for node in range(self._leaves - 1, 0, -1):
+                self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def take(self, size):
+        """Take the specified number of units from the start of a free range and return the first unit or None."""
+        if self._best_fit:
+            return self._take_best(size)
+        return self._take_first(size)
+
+    def _take_first(self, size):
+        tree = self._tree
+        if not self._starts or tree[1] < size:
+            return None
+        node = 1
+        while node < self._leaves:
+            node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        idx = node - self._leaves
+        start = self._starts[idx]
+        self._starts[idx] = start + size
+        tree[node] -= size
+        node //= 2
+        while node:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            largest = left if left > right else right
+            if tree[node] == largest:
+                break
+            tree[node] = largest
+            node //= 2
+        return start
+
+    def _take_best(self, size):
+        keys = self._size_keys
+        key_idx = bisect_left(keys, size)
+        if key_idx == len(keys):
+            return None
+        old_size = keys[key_idx]
+        bucket = self._by_size[old_size]
+        idx = heapq.heappop(bucket)
+        if not bucket:
+            del self._by_size[old_size]
+            del keys[key_idx]
+        start = self._starts[idx]
+        self._starts[idx] = start + size
+        new_size = old_size - size
+        if new_size:
+            if new_size in self._by_size:
+                heapq.heappush(self._by_size[new_size], idx)
+            else:
+                self._by_size[new_size] = [idx]
+                insort(keys, new_size)
+        return start
+
+
+class AddressAllocator():
+    """Allocator of addresses for registers without addresses in free address ranges of a register map.
+
+    Registers are placed into the free ranges between registers, register arrays and submaps
+    already present in the map, in the order they are given. First fit takes the lowest free range,
+    which is large enough, and best fit takes the smallest one. Addresses are aligned according to
+    the address alignment of the map, every register occupies data width in bytes, and a register array
+    occupies a contiguous range from its first to its last element. Complementary registers without addresses
+    are paired in the order they are given, and every pair takes a single address. Reserved ranges are never used.
+
+    Free ranges are searched in O(log g) time for g ranges, so n registers are placed in O(n log n),
+    and then they are added to the map in a single bulk operation.
+
+    Examples:
+
+        >>> from corsair import Register, RegisterMap, Configuration
+        >>> rmap = RegisterMap(Configuration())
+        >>> rmap.add_regs([Register('id', address=0x0), Register('irq', address=0x10)])
+        >>> alloc = AddressAllocator(rmap, reserved=[(0x4, 0x8)])
+        >>> alloc.add_regs([Register('ctrl'), Register('stat'), Register('data')])
+        >>> [(reg.name, hex(reg.address)) for reg in rmap]
+        [('id', '0x0'), ('ctrl', '0x8'), ('stat', '0xc'), ('irq', '0x10'), ('data', '0x14')]
+        >>> alloc.utilization()
+        {'span': 24, 'used': 20, 'reserved': 4, 'free': 0, 'gaps': 0, 'ratio': 0.83}
+    """
+    def __init__(self, rmap, fit='first', reserved=(), lo=0, hi=None):
+        if fit not in ('first', 'best'):
+            raise ValueError("Unknown allocation strategy '%s'!" % fit)
+        self.rmap = rmap
+        self.fit = fit
+        self.lo = lo
+        self.hi = hi
+        reserved = [(utils.try_hex_to_dec(start), utils.try_hex_to_dec(end)) for start, end in reserved]
+        for start, end in reserved:
+            if start >= end:
+                raise ValueError("Reserved address range (%s, %s) is empty!" % (start, end))
+        self.reserved = self._merge(reserved)
+
+    def __repr__(self):
+        return 'AddressAllocator(%s, %s)' % (repr(self.rmap), repr(self.fit))
+
+    def _hi(self):
+        return 2**self.rmap.config['address_width'].value if self.hi is None else self.hi
+
+    @staticmethod
+    def _merge(ranges):
+        """Sort address ranges and merge the ones overlapping or touching each other."""
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _free_gaps(self, align, reserved):
+        """Free ranges of the map without the reserved ones in allocation units of the alignment size."""
+        units = []
+        for start, end in self._cut_reserved(self.rmap.gaps(lo=self.lo, hi=self._hi()), reserved):
+            first, last = -(-start // align), end // align
+            if first < last:
+                units.append((first, last))
+        return units
+
+    def _cut_reserved(self, gaps, reserved):
+        """Cut the reserved ranges out of the free ranges."""
+        idx = 0
+        for start, end in gaps:
+            while idx < len(reserved) and reserved[idx][1] <= start:
+                idx += 1
+            res_idx = idx
+            while res_idx < len(reserved) and reserved[res_idx][0] < end:
+                if reserved[res_idx][0] > start:
+                    yield (start, reserved[res_idx][0])
+                start = max(start, reserved[res_idx][1])
+                res_idx += 1
+            if start < end:
+                yield (start, end)
+
+    def _requests(self, regs, step):
+        """Group the registers without addresses into requests of (size in bytes, registers)."""
+        requests = []
+        pending_compl = None
+        for reg in regs:
+            if isinstance(reg, RegisterArray):
+                if reg.stride is None:
+                    self.rmap._stride_apply(reg)
+                requests.append(((reg.count - 1) * reg.stride + step, [reg]))
+            elif reg.complementary:
+                if pending_compl is None:
+                    pending_compl = [reg]
+                    requests.append((step, pending_compl))
+                else:
+                    pending_compl.append(reg)
+                    pending_compl = None
+            else:
+                requests.append((step, [reg]))
+        if pending_compl is not None:
+            raise ValueError("Register '%s' with no address has no complementary pair!" % (pending_compl[0].name))
+        return requests
+
+    def add_regs(self, new_regs):
+        """Allocate addresses for the registers without addresses and add all the registers to the map.
+
+        Addresses of the registers with addresses are not allocated to the other registers. All the registers
+        are added in a single bulk operation, so none of them is added and addresses allocated are cleared
+        if any register fails the checks.
+
+        Args:
+            new_regs : register or list of registers
+
+        Raises:
+            ValueError: An error occured if there is no free range for a register or any register fails the checks.
+        """
+        new_regs = utils.listify(new_regs)
+        align = self.rmap._addr_alignment()
+        step = self.rmap.config['data_width'].value // 8
+        # ranges of the registers with addresses are not free for the others, as if they were in the map
+        placed = []
+        for reg in new_regs:
+            if isinstance(reg, RegisterArray) and reg.address is not None:
+                placed.append((reg.address, reg.address + (reg.stride or step) * (reg.count - 1) + step))
+            elif reg.address is not None:
+                placed.append((reg.address, reg.address + step))
+        free = _FreeGaps(self._free_gaps(align, self._merge(self.reserved + placed)), best_fit=(self.fit == 'best'))
+        unplaced = [reg for reg in new_regs if reg.address is None]
+        try:
+            for size, regs in self._requests(unplaced, step):
+                start = free.take(-(-size // align))
+                if start is None:
+                    raise ValueError("Not able to find free address range of %d bytes for register '%s'!" %
+                                     (size, regs[0].name))
+                for reg in regs:
+                    reg.address = start * align
+            with self.rmap.bulk(vectorize=True):
+                self.rmap.add_regs(new_regs)
+        except ValueError:
+            for reg in unplaced:
+                reg.address = None
+            raise
+
+    def utilization(self):
+        """Returns dictionary with address space utilization of the map.
+
+        Only the range from the lowest address of the allocator to the end of the last register is considered.
+
+        Returns:
+            Dictionary with 'span' size of the range in bytes, 'used' bytes occupied by registers and submaps,
+            'reserved' bytes, 'free' bytes, 'gaps' number of free ranges and 'ratio' of used bytes to the size
+            rounded to two digits.
+        """
+        span_end = max(self.lo, self.rmap._addr_extent())
+        span = span_end - self.lo
+        # reserved ranges are free from the point of view of the map
+        map_free = self.rmap.gaps(lo=self.lo, hi=span_end)
+        gaps = list(self._cut_reserved(map_free, self.reserved))
+        used = span - sum(end - start for start, end in map_free)
+        free = sum(end - start for start, end in gaps)
+        reserved = span - used - free
+        return {
+            'span': span,
+            'used': used,
+            'reserved': reserved,
+            'free': free,
+            'gaps': len(gaps),
+            'ratio': round(used / span, 2) if span else 0.0,
+        }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Encoding of bit field values into register words and decoding of register words into bit field values.
+"""
+
+from operator import index
+from .vectorized import np
+
+
+class RegisterCodec():
+    """Encoder and decoder of register words.
+
+    Positions and masks of bit fields are computed once, when the codec is created.
+    Values and words can be integers or NumPy arrays of unsigned integers, so millions of words
+    are processed at once. NumPy arrays are supported for registers not wider than 64 bits.
+
+    Codec is usually taken from :attr:`Register.codec`, which is created again after the register is changed.
+
+    Examples:
+
+        >>> from corsair import BitField, Register
+        >>> reg = Register('ctrl', address=0)
+        >>> reg.add_bfields([
+        ...     BitField('en', lsb=0, initial=1),
+        ...     BitField('mode', lsb=4, width=4),
+        ...     BitField('stat', lsb=8, width=8, access='ro'),
+        ... ])
+        >>> hex(reg.codec.encode(mode=5))
+        '0x51'
+        >>> reg.codec.decode(0x1251)
+        {'en': 1, 'mode': 5, 'stat': 18}
+    """
+    def __init__(self, reg):
+        self.name = reg.name
+        self.initial = reg.initial
+        self.names = reg.names
+        # (lsb, mask) for every bit field by name
+        self._fields = {bf.name: (bf.lsb, (1 << bf.width) - 1) for bf in reg}
+        self._writable = {bf.name for bf in reg if 'w' in bf.access}
+        self._wide = any(bf.msb >= 64 for bf in reg)
+        if np is not None and not self._wide:
+            self._np_fields = {name: (np.uint64(lsb), np.uint64(mask)) for name, (lsb, mask) in self._fields.items()}
+            self._np_initial = np.uint64(self.initial)
+
+    def __repr__(self):
+        return 'RegisterCodec(%s)' % repr(self.name)
+
+    def _is_array(self, value):
+        """Check if the value is a NumPy array and the register can be processed with NumPy."""
+        if np is None or not isinstance(value, np.ndarray):
+            return False
+        if self._wide:
+            raise ValueError("Register '%s' is wider than 64 bits and can't be processed with NumPy!" % self.name)
+        return True
+
+    def _field(self, name):
+        """Get (lsb, mask) of a bit field to be written."""
+        try:
+            field = self._fields[name]
+        except KeyError:
+            raise KeyError("There is no bit field with a name '%s' in '%s' register!" % (name, self.name))
+        if name not in self._writable:
+            raise ValueError("Bit field '%s' of '%s' register is read-only!" % (name, self.name))
+        return field
+
+    def encode(self, values=None, **kwargs):
+        """Pack values of bit fields into a register word.
+
+        Bit fields not specified take their initial values.
+
+        Args:
+            values : dictionary with values by bit field names; keyword arguments can be used as well
+
+        Returns:
+            Register word, or NumPy array of words if any of the values is an array.
+
+        Raises:
+            KeyError: An error occured if there is no such bit field.
+            ValueError: An error occured if bit field is read-only or value does not fit its width.
+        """
+        values = dict(values or {}, **kwargs)
+        if any(self._is_array(value) for value in values.values()):
+            word = self._np_initial
+            for name, value in values.items():
+                self._field(name)
+                lsb, mask = self._np_fields[name]
+                value = np.asarray(value).astype(np.uint64)
+                if (value > mask).any():
+                    raise ValueError("Value for '%s' bit field of '%s' register does not fit its width!" %
+                                     (name, self.name))
+                word = (word & ~(mask << lsb)) | (value << lsb)
+            return word
+        word = self.initial
+        for name, value in values.items():
+            lsb, mask = self._field(name)
+            try:
+                value = index(value)
+            except TypeError:
+                value = None
+            if value is None or value < 0 or value > mask:
+                raise ValueError("Value '%s' for '%s' bit field of '%s' register does not fit its width!" %
+                                 (values[name], name, self.name))
+            word = (word & ~(mask << lsb)) | (value << lsb)
+        return word
+
+    def decode(self, word, names=None):
+        """Unpack values of bit fields from a register word.
+
+        Args:
+            word : register word or NumPy array of words
+            names : list with names of bit fields to be decoded; all bit fields are decoded if not set
+
+        Returns:
+            Dictionary with values by bit field names; values are NumPy arrays if the word is an array.
+
+        Raises:
+            KeyError: An error occured if there is no such bit field.
+        """
+        if names is None:
+            names = self.names
+        try:
+            if self._is_array(word):
+                word = word.astype(np.uint64, copy=False)
+                return {name: (word >> self._np_fields[name][0]) & self._np_fields[name][1] for name in names}
+            return {name: (word >> self._fields[name][0]) & self._fields[name][1] for name in names}
+        except KeyError as e:
+            raise KeyError("There is no bit field with a name '%s' in '%s' register!" % (e.args[0], self.name))
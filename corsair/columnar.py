@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Columnar storage of a register map.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from .regmap import (BitField, Register, RegisterArray, RegisterMap, _BitFieldSpec, _ACCESS_MODES,
+                     _MODIFIERS_COMBINATIONS)
+from . import utils
+from .vectorized import np
+
+# all allowed combinations of access modifiers
+_MODIFIERS_TABLE = tuple(sorted(set(comb for combs in _MODIFIERS_COMBINATIONS.values() for comb in combs)))
+
+# register flags
+_FLAG_ACCESS_STROBES = 0x1
+_FLAG_COMPLEMENTARY = 0x2
+_FLAG_WRITE_LOCK = 0x4
+
+# names of all the columns and indexes of a map
+_COLUMNS = ('_strings', '_reg_name', '_reg_desc', '_reg_addr', '_reg_flags', '_reg_bf_start', '_reg_bf_num',
+            '_bf_name', '_bf_desc', '_bf_initial', '_bf_initial_big', '_bf_width', '_bf_lsb', '_bf_access',
+            '_bf_modifiers', '_order', '_addrs')
+
+# the largest initial value to be stored in a column
+_INITIAL_MAX = 2**64 - 1
+
+
+def _column(name):
+    """Read-only property to get an item of the map column."""
+    return property(lambda self: getattr(self._cmap, name)[self._idx])
+
+
+def _str_column(name):
+    """Read-only property to get a string referenced by an item of the map column."""
+    return property(lambda self: self._cmap._strings[getattr(self._cmap, name)[self._idx]])
+
+
+def _flag_column(flag):
+    """Read-only property to get a flag of the register."""
+    return property(lambda self: bool(self._cmap._reg_flags[self._idx] & flag))
+
+
+class BitFieldView(BitField):
+    """Read-only bit field, which data is stored in a :class:`ColumnarRegisterMap`.
+
+    Views are created on demand, so two views of the same bit field are different objects.
+    """
+    __slots__ = ('_cmap', '_idx')
+
+    def __init__(self, cmap, idx):
+        self._cmap = cmap
+        self._idx = idx
+        self._cache = None
+
+    def __repr__(self):
+        return 'BitFieldView(%s)' % repr(self.name)
+
+    def __reduce__(self):
+        # view is pickled as a copy
+        clone = self.clone()
+        return (object.__new__, (clone.__class__,), clone.__getstate__())
+
+    _parent = None
+    _name = _str_column('_bf_name')
+    _description = _str_column('_bf_desc')
+    _width = _column('_bf_width')
+    _lsb = _column('_bf_lsb')
+
+    @property
+    def _initial(self):
+        return self._cmap._bf_initial_big.get(self._idx, self._cmap._bf_initial[self._idx])
+
+    @property
+    def _access(self):
+        return _ACCESS_MODES[self._cmap._bf_access[self._idx]]
+
+    @property
+    def _modifiers(self):
+        return _MODIFIERS_TABLE[self._cmap._bf_modifiers[self._idx]]
+
+    @property
+    def _spec(self):
+        return _BitFieldSpec(self._name, self._description, self._initial, self._width, self._access, self._modifiers)
+
+
+class RegisterView(Register):
+    """Read-only register, which data is stored in a :class:`ColumnarRegisterMap`.
+
+    Views are created on demand, so two views of the same register are different objects.
+    """
+    __slots__ = ('_cmap', '_idx')
+
+    def __init__(self, cmap, idx):
+        self._cmap = cmap
+        self._idx = idx
+        self._cache = None
+
+    def __repr__(self):
+        return 'RegisterView(%s, %s, %s)' % (repr(self.name), repr(self.description), repr(self.address))
+
+    def __reduce__(self):
+        # view is pickled as a copy
+        clone = self.clone()
+        return (object.__new__, (clone.__class__,), clone.__getstate__())
+
+    _parent = None
+    _name = _str_column('_reg_name')
+    _description = _str_column('_reg_desc')
+    _address = _column('_reg_addr')
+    _access_strobes = _flag_column(_FLAG_ACCESS_STROBES)
+    _complementary = _flag_column(_FLAG_COMPLEMENTARY)
+    _write_lock = _flag_column(_FLAG_WRITE_LOCK)
+
+    @property
+    def _bfields(self):
+        start = self._cmap._reg_bf_start[self._idx]
+        return [BitFieldView(self._cmap, i) for i in range(start, start + self._cmap._reg_bf_num[self._idx])]
+
+    @property
+    def _bfields_by_name(self):
+        return {bf.name: bf for bf in self._bfields}
+
+    @property
+    def _mask(self):
+        mask = 0
+        for bf in self._bfields:
+            mask |= bf.mask
+        return mask
+
+
+class _RegisterViews(Sequence):
+    """Registers of a :class:`ColumnarRegisterMap` in ascending order of addresses."""
+    def __init__(self, cmap):
+        self._cmap = cmap
+
+    def __len__(self):
+        return len(self._cmap._order)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [RegisterView(self._cmap, row) for row in self._cmap._order[key]]
+        return RegisterView(self._cmap, self._cmap._order[key])
+
+
+class _RegisterNameIndex(Mapping):
+    """Registers of a :class:`ColumnarRegisterMap` by names."""
+    def __init__(self, cmap):
+        self._cmap = cmap
+
+    def __len__(self):
+        return len(self._cmap._rows_by_name)
+
+    def __iter__(self):
+        return iter(self._cmap._rows_by_name)
+
+    def __contains__(self, key):
+        return key in self._cmap._rows_by_name
+
+    def __getitem__(self, key):
+        return RegisterView(self._cmap, self._cmap._rows_by_name[key])
+
+
+class ColumnarRegisterMap(RegisterMap):
+    """CSR map with registers and bit fields stored in parallel typed arrays.
+
+    Attributes of registers and bit fields are packed into :mod:`array` columns,
+    and all the strings are stored once in a string table. Registers are checked the same way
+    as for :class:`RegisterMap` and then packed, so a map of any size takes memory in proportion to its raw data.
+    :class:`RegisterView` and :class:`BitFieldView` read-only objects are created on demand
+    during iteration or access via name or index, so all the writers work with such a map unchanged.
+
+    Views are read-only, so registers and bit fields have to be modified before they are added to the map.
+
+    Examples:
+
+        >>> cmap = ColumnarRegisterMap()
+        >>> reg = Register('reg_a', 'Register A', address=0)
+        >>> reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=8, initial=42))
+        >>> cmap.add_regs(reg)
+        >>> cmap['reg_a']['bf_a'].initial
+        42
+    """
+    def __repr__(self):
+        return 'ColumnarRegisterMap(%s)' % (repr(self.config))
+
+    def _init_storage(self):
+        self._strings = ['']
+        self._string_ids = {'': 0}
+        # register columns
+        self._reg_name = array('I')
+        self._reg_desc = array('I')
+        self._reg_addr = array('Q')
+        self._reg_flags = array('B')
+        self._reg_bf_start = array('I')
+        self._reg_bf_num = array('H')
+        # bit field columns
+        self._bf_name = array('I')
+        self._bf_desc = array('I')
+        self._bf_initial = array('Q')
+        self._bf_initial_big = {}
+        self._bf_width = array('H')
+        self._bf_lsb = array('H')
+        self._bf_access = array('B')
+        self._bf_modifiers = array('B')
+        # indexes
+        self._rows_by_name = {}
+        self._order = array('I')
+        self._addrs = array('Q')
+        # register arrays are always expanded
+        self._arrays = []
+
+    def _clone_storage(self, cmap):
+        """Copy all the columns to the empty map; views are created for the copy on demand."""
+        state = self._storage_state()
+        cmap._restore_storage({name: value[:] if isinstance(value, array) else value.copy()
+                               for name, value in state.items()})
+
+    def _storage_state(self):
+        """All the columns and indexes to be pickled. Lookup tables for names and strings are restored on demand."""
+        return {name: getattr(self, name) for name in _COLUMNS}
+
+    def _restore_storage(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._string_ids = None
+        # register with no name is named after its bit field
+        self._rows_by_name = {self._strings[name] if name else RegisterView(self, row).name: row
+                              for row, name in enumerate(self._reg_name)}
+
+    @property
+    def _regs(self):
+        return _RegisterViews(self)
+
+    @property
+    def _regs_by_name(self):
+        return _RegisterNameIndex(self)
+
+    def _str_id(self, value):
+        """Get index of the string in the string table."""
+        if self._string_ids is None:
+            self._string_ids = {string: i for i, string in enumerate(self._strings)}
+        try:
+            return self._string_ids[value]
+        except KeyError:
+            self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+            return self._string_ids[value]
+
+    def _pack_reg(self, reg):
+        """Store register data in the columns and return a view to it."""
+        row = len(self._reg_addr)
+        self._reg_name.append(self._str_id(reg._name))
+        self._reg_desc.append(self._str_id(reg._description))
+        self._reg_addr.append(reg.address)
+        self._reg_flags.append((_FLAG_ACCESS_STROBES if reg.access_strobes else 0) |
+                               (_FLAG_COMPLEMENTARY if reg.complementary else 0) |
+                               (_FLAG_WRITE_LOCK if reg.write_lock else 0))
+        self._reg_bf_start.append(len(self._bf_lsb))
+        self._reg_bf_num.append(len(reg))
+        for bf in reg:
+            if bf.initial > _INITIAL_MAX:
+                self._bf_initial_big[len(self._bf_initial)] = bf.initial
+                self._bf_initial.append(0)
+            else:
+                self._bf_initial.append(bf.initial)
+            self._bf_name.append(self._str_id(bf.name))
+            self._bf_desc.append(self._str_id(bf.description))
+            self._bf_width.append(bf.width)
+            self._bf_lsb.append(bf.lsb)
+            self._bf_access.append(_ACCESS_MODES.index(bf.access))
+            self._bf_modifiers.append(_MODIFIERS_TABLE.index(tuple(bf.modifiers)))
+        return RegisterView(self, row)
+
+    def _truncate(self, regs_num, bfields_num):
+        """Remove all registers and bit fields stored after the specified amounts."""
+        for col in [self._reg_name, self._reg_desc, self._reg_addr, self._reg_flags,
+                    self._reg_bf_start, self._reg_bf_num]:
+            del col[regs_num:]
+        for col in [self._bf_name, self._bf_desc, self._bf_initial, self._bf_width,
+                    self._bf_lsb, self._bf_access, self._bf_modifiers]:
+            del col[bfields_num:]
+        for idx in [idx for idx in self._bf_initial_big if idx >= bfields_num]:
+            del self._bf_initial_big[idx]
+
+    def _attach_reg(self, reg):
+        view = self._pack_reg(reg)
+        idx = bisect_right(self._addrs, view.address)
+        self._addrs.insert(idx, view.address)
+        self._order.insert(idx, view._idx)
+        self._rows_by_name[view.name] = view._idx
+        # views are not persistent, so fingerprint and indexes are computed from scratch
+        self._fp_sum = None
+        self._index = None
+
+    def add_regs(self, new_regs):
+        """Add register or list of registers.
+
+        Register arrays are expanded and every element is packed as a single register.
+        """
+        regs = []
+        for reg in utils.listify(new_regs):
+            if isinstance(reg, RegisterArray):
+                if reg.address is None:
+                    self._addr_apply(reg)
+                if reg.stride is None:
+                    self._stride_apply(reg)
+                regs.extend(reg.elements())
+            else:
+                regs.append(reg)
+        super().add_regs(regs)
+
+    def _add_pending_reg(self, reg):
+        super()._add_pending_reg(reg)
+        # bit fields of a register exceeding data width may not fit the columns, and it fails the checks anyway
+        if not reg._mask >> self.config['data_width'].value:
+            self._pending[-1] = self._pack_reg(reg)
+
+    def _pack_regs(self, regs):
+        """Take attributes of the registers and their bit fields for vectorized checks right from the columns."""
+        if not all(isinstance(reg, RegisterView) for reg in regs):
+            return super()._pack_regs(regs)
+        rows = np.fromiter((view._idx for view in regs), dtype=np.int64, count=len(regs))
+        bf_start = np.asarray(self._reg_bf_start, dtype=np.int64)[rows]
+        bf_num = np.asarray(self._reg_bf_num, dtype=np.int64)[rows]
+        bf_reg = np.repeat(np.arange(len(regs)), bf_num)
+        # indexes of bit fields of every register are consecutive
+        bf_idx = np.arange(len(bf_reg)) - np.repeat(np.cumsum(bf_num) - bf_num, bf_num) + np.repeat(bf_start, bf_num)
+        return (np.asarray(self._reg_addr, dtype=np.uint64)[rows], bf_reg,
+                np.asarray(self._bf_lsb)[bf_idx], np.asarray(self._bf_width)[bf_idx])
+
+    def _attach_regs(self, new_regs, regs):
+        for view in new_regs:
+            self._rows_by_name[view.name] = view._idx
+        self._order = array('I', sorted(range(len(self._reg_addr)), key=self._reg_addr.__getitem__))
+        self._addrs = array('Q', (self._reg_addr[row] for row in self._order))
+        self._index = None
+        # string lookup table is needed only to add registers, it will be restored on demand
+        self._string_ids = None
+
+    @contextmanager
+    def bulk(self, vectorize=False):
+        """Context manager to add a lot of registers at once.
+
+        Registers are packed to the columns immediately, so no register objects are kept until the end.
+        Packed data is dropped if any error occurs.
+
+        Args:
+            vectorize : use vectorized checks, see :meth:`RegisterMap.bulk`
+        """
+        if self._pending is not None:
+            # already in bulk mode
+            yield self
+            return
+        regs_num, bfields_num = len(self._reg_addr), len(self._bf_lsb)
+        try:
+            with super().bulk(vectorize):
+                yield self
+        except BaseException:
+            self._truncate(regs_num, bfields_num)
+            raise
@@ -4,9 +4,111 @@
 """Configuration module.
 """
 
+import hashlib
+import json
 from . import utils
 
 
+class Rule():
+    """Base class for named validation rules of parameter values.
+
+    Rules are declarative: they keep only the data they check against, so they are compared by value,
+    printed and pickled as any other object. A rule is called with a value and returns True if the value is OK.
+    """
+    # parameters, which values are used by the rule
+    deps = ()
+
+    def __eq__(self, other):
+        return self.__class__ == other.__class__ and vars(self) == vars(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(repr(v) for v in vars(self).values()))
+
+    def __call__(self, val):
+        raise NotImplementedError
+
+    def check(self, val, values):
+        """Check the value, where values of the parameters the rule depends on are taken from the dictionary
+        by ids of the parameters, if they are there, and from the parameters themselves otherwise."""
+        return self(val)
+
+    def _rebind(self, copies):
+        """Returns the rule, which depends on the copies of the parameters found in the dictionary by ids."""
+        return self
+
+
+class AnyValue(Rule):
+    """Any value is allowed.
+
+    Examples:
+
+        >>> AnyValue()(42)
+        True
+    """
+    def __call__(self, val):
+        return True
+
+
+class OneOf(Rule):
+    """Value is one of the allowed values.
+
+    Examples:
+
+        >>> OneOf(['amm', 'apb'])('apb')
+        True
+    """
+    def __init__(self, allowed):
+        self.allowed = allowed
+
+    def __call__(self, val):
+        return val in self.allowed
+
+
+class AtLeast(Rule):
+    """Value is not less than the minimum.
+
+    Examples:
+
+        >>> AtLeast(1)(0)
+        False
+    """
+    def __init__(self, minimum):
+        self.minimum = minimum
+
+    def __call__(self, val):
+        return val >= self.minimum
+
+
+class OneOfFor(Rule):
+    """Value is one of the values allowed for the current value of the other parameter.
+
+    Examples:
+
+        >>> bridge = Parameter('type', 'apb')
+        >>> OneOfFor(bridge, {'apb': [8, 16, 32], 'axil': [32, 64]})(64)
+        False
+    """
+    def __init__(self, param, allowed):
+        self.param = param
+        self.allowed = allowed
+
+    @property
+    def deps(self):
+        return (self.param,)
+
+    def __call__(self, val):
+        return val in self.allowed[self.param.value]
+
+    def check(self, val, values):
+        return val in self.allowed.get(values.get(id(self.param), self.param.value), ())
+
+    def _rebind(self, copies):
+        return OneOfFor(copies.get(id(self.param), self.param), self.allowed)
+
+
 class Parameter():
     """Generic parameter.
 
@@ -19,11 +121,12 @@ class Parameter():
 
     Attributes:
         name: Name of the parameter.
-        validator: Lambda function to perform value validation.
-            Returns True if value check is OK, and False otherwise.
+        validator: Function or :class:`Rule` to perform value validation.
+            Returns True if value check is OK, and False otherwise. Use rules to be able to pickle the parameter.
     """
-    def __init__(self, name, value=None, validator=lambda val: True):
+    def __init__(self, name, value=None, validator=AnyValue()):
         self._value = None
+        self._parent = None
 
         self.name = name
         self.validator = validator
@@ -58,6 +161,27 @@ class Parameter():
         """Returns dictionary with parameters's name and value."""
         return {'name': self.name, 'value': self.value}
 
+    def clone(self):
+        """Returns a copy of the parameter with the same validator. Value is not checked again."""
+        param = self.__class__.__new__(self.__class__)
+        param.__dict__.update(self.__dict__)
+        param._parent = None
+        return param
+
+    def _changed(self):
+        """Called when the validator of the parameter is changed."""
+        if self._parent is not None:
+            self._parent._changed()
+
+    @property
+    def validator(self):
+        return self._validator
+
+    @validator.setter
+    def validator(self, new_validator):
+        self._validator = new_validator
+        self._changed()
+
     @property
     def value(self):
         """Value of the parameter.
@@ -83,8 +207,10 @@ class Parameter():
     def _validate(self):
         """Check parameter value correctness."""
         if self.validator(self.value) is False:
-            raise ValueError('"%s" parameter with "%s" value failed the check!' % (self.name,
-                                                                                   self.value))
+            raise ValueError(self._error(self.value))
+
+    def _error(self, value):
+        return '"%s" parameter with "%s" value failed the check!' % (self.name, value)
 
 
 class ParameterGroup():
@@ -124,6 +250,9 @@ class ParameterGroup():
     def __init__(self, name):
         self.name = name
         self._params = {}
+        self._parent = None
+        # compiled schema: parameters of the group and its subgroups, which depend on a parameter, by its id
+        self._schema = None
 
     def __eq__(self, other):
         if self.__class__ != other.__class__:
@@ -153,6 +282,33 @@ class ParameterGroup():
         raise KeyError("Not able to set '%s' item directly in '%s' group!"
                        " Try use add_params() method." % (key, self.name))
 
+    def __getstate__(self):
+        # schema is keyed by ids of the parameters, so it is compiled again after loading
+        state = self.__dict__.copy()
+        state['_schema'] = None
+        return state
+
+    def _changed(self):
+        """Called when parameters of the group or its subgroups are added, or their validators are changed."""
+        self._schema = None
+        if self._parent is not None:
+            self._parent._changed()
+
+    def _compile(self):
+        """Get the schema of the group, which is compiled once until the group is changed."""
+        if self._schema is None:
+            schema = {}
+            stack = [self]
+            while stack:
+                for param in stack.pop()._params.values():
+                    if isinstance(param, ParameterGroup):
+                        stack.append(param)
+                    else:
+                        for dep in getattr(param.validator, 'deps', ()):
+                            schema[id(dep)] = schema.get(id(dep), ()) + (param,)
+            self._schema = schema
+        return self._schema
+
     def as_str(self, indent=''):
         """Returns indented string with group members and their values"""
         new_indent = indent + '  '
@@ -164,6 +320,61 @@ class ParameterGroup():
         """Returns dictionary with group's key attributes."""
         return self.values
 
+    def clone(self):
+        """Returns a copy of the group with copies of all the parameters and groups contained.
+
+        Rules, which depend on the parameters of the group, are bound to the copies of the parameters.
+
+        Examples:
+
+            >>> config = Configuration()
+            >>> config['data_width'].value = 16
+            >>> variant = config.clone()
+            >>> variant['lb_bridge']['type'].value = 'axil'
+            >>> variant['data_width'].value = 64
+            >>> config['data_width'].value, variant['data_width'].value
+            (16, 64)
+        """
+        group = self.__class__.__new__(self.__class__)
+        ParameterGroup.__init__(group, self.name)
+        group._copy_params(self)
+        return group
+
+    def _copy_params(self, other):
+        """Fill the group with copies of the parameters and groups of the other group and of its schema."""
+        copies = {}
+        self._copy_tree(other, copies)
+        # only the parameters depending on others have to be bound to the copies
+        schema = {}
+        for key, params in other._compile().items():
+            params = tuple(copies[id(param)] for param in params)
+            for param in params:
+                if isinstance(param.validator, Rule):
+                    param._validator = param.validator._rebind(copies)
+            schema[id(copies[key]) if key in copies else key] = params
+        self._schema = schema
+
+    def _copy_tree(self, other, copies):
+        for name, param in other._params.items():
+            if isinstance(param, ParameterGroup):
+                copy = ParameterGroup(param.name)
+                copy._copy_tree(param, copies)
+            else:
+                # the same as Parameter.clone()
+                copy = param.__class__.__new__(param.__class__)
+                copy.__dict__.update(param.__dict__)
+            copy._parent = self
+            self._params[name] = copy
+            copies[id(param)] = copy
+
+    def fingerprint(self):
+        """Returns hexadecimal digest of all the values of the group.
+
+        Digest depends only on the values, but not on the order they were set or the input file formatting.
+        """
+        data = json.dumps(self.values, sort_keys=True, default=repr)
+        return hashlib.sha256(data.encode()).hexdigest()
+
     @property
     def names(self):
         """Names of all parameters/groups contained."""
@@ -188,6 +399,8 @@ class ParameterGroup():
             if p.name in self._params:
                 raise KeyError("Item with name '%s' is already present in '%s' group!" % (p.name, self.name))
             self._params[p.name] = p
+            p._parent = self
+        self._changed()
 
     @property
     def values(self):
@@ -199,6 +412,13 @@ class ParameterGroup():
         Setter:
             Sets only parameters/groups specified in the input dictionary,
             but if parameter/group does not exist, it will create it.
+
+            All the new values are checked at once before any of them is set, so the order of the values
+            does not matter: rules, which depend on other parameters, see their new values. Only the values
+            changed are checked, and the parameters, which depend on the ones changed, are checked again too.
+
+            Raises:
+                ValueError: An error occured if any of the new values fails the check.
         """
         values = {}
         for name in self.names:
@@ -210,31 +430,92 @@ class ParameterGroup():
 
     @values.setter
     def values(self, new_values):
-        for name in new_values.keys():
-            try:
-                # if parameter/group exists
-                if isinstance(self[name], ParameterGroup):
-                    self[name].values = new_values[name]
-                else:
-                    self[name].value = new_values[name]
-            except KeyError:
-                # else if parameter/group does not exists
-                if isinstance(new_values[name], dict):
-                    self.add_params(ParameterGroup(name=name))
-                    self[name].values = new_values[name]
-                else:
-                    self.add_params(Parameter(name=name, value=new_values[name]))
+        pending = {}
+        new_items = []
+        self._collect_values(new_values, pending, new_items)
+        # check parameters with values changed and the ones depending on them
+        schema = self._compile()
+        values = {}
+        checked = {}
+        for key, (param, value, changed) in pending.items():
+            values[key] = value
+            if changed:
+                checked[key] = param
+                for dependent in schema.get(key, ()):
+                    checked[id(dependent)] = dependent
+        errors = []
+        for key, param in checked.items():
+            value = values.get(key, param._value)
+            validator = param.validator
+            if (validator.check(value, values) if isinstance(validator, Rule) else validator(value)) is False:
+                errors.append(param._error(value))
+        if errors:
+            raise ValueError(' '.join(errors))
+        for param, value, _ in pending.values():
+            param._value = value
+        for group, name, value in new_items:
+            if isinstance(value, dict):
+                group.add_params(ParameterGroup(name=name))
+                group[name].values = value
+            else:
+                group.add_params(Parameter(name=name, value=value))
+
+    def _collect_values(self, new_values, pending, new_items):
+        """Collect new values of the parameters by their ids, and the parameters/groups to be created."""
+        for name, value in new_values.items():
+            param = self._params.get(name)
+            if param is None:
+                new_items.append((self, name, value))
+            elif isinstance(param, ParameterGroup):
+                if not isinstance(value, dict):
+                    raise ValueError("Value '%s' of '%s' group is not a dictionary!" % (value, name))
+                param._collect_values(value, pending, new_items)
+            else:
+                # store all 0x-like hexademical strings as integers if possible
+                value = utils.try_hex_to_dec(value)
+                old = param._value
+                pending[id(param)] = (param, value, value.__class__ is not old.__class__ or value != old)
 
 
 class Configuration(ParameterGroup):
-    """Collection of global parameters."""
+    """Collection of global parameters.
+
+    Default parameters and their schema are created once for every class of configuration,
+    and a new configuration gets copies of them, so thousands of configurations are created and loaded fast.
+
+    Examples:
+
+        Values are checked all together, so a bridge, which allows a data width, can follow the data width:
+
+        >>> config = Configuration()
+        >>> config['lb_bridge']['type'].value = 'apb'
+        >>> config.values = {'data_width': 64, 'lb_bridge': {'type': 'axil'}}
+        >>> config['data_width'].value
+        64
+        >>> config.values = {'lb_bridge': {'type': 'apb'}}
+        Traceback (most recent call last):
+        ...
+        ValueError: "data_width" parameter with "64" value failed the check!
+    """
     def __init__(self):
         super().__init__('configuration')
-        self._init_default_params()
+        self._copy_params(self._defaults())
 
     def __repr__(self):
         return 'Configuration()'
 
+    @classmethod
+    def _defaults(cls):
+        """Get the group with default parameters of the class, which is created and compiled once."""
+        defaults = cls.__dict__.get('_default_params')
+        if defaults is None:
+            defaults = cls.__new__(cls)
+            ParameterGroup.__init__(defaults, 'configuration')
+            defaults._init_default_params()
+            defaults._compile()
+            cls._default_params = defaults
+        return defaults
+
     def _init_default_params(self):
         """Initalize all default params"""
         # group regmap
@@ -242,25 +523,25 @@ class Configuration(ParameterGroup):
         self['regmap'].add_params([
             Parameter(name='read_filler', value=0x0),
             Parameter(name='address_increment_mode', value='none',
-                      validator=lambda val: val in ['none', 'data_width', 'custom']),
-            Parameter(name='address_increment_value', value=4, validator=lambda val: val >= 1),
+                      validator=OneOf(['none', 'data_width', 'custom'])),
+            Parameter(name='address_increment_value', value=4, validator=AtLeast(1)),
             Parameter(name='address_alignment_mode', value='data_width',
-                      validator=lambda val: val in ['none', 'data_width', 'custom']),
-            Parameter(name='address_alignment_value', value=4, validator=lambda val: val >= 1)
+                      validator=OneOf(['none', 'data_width', 'custom'])),
+            Parameter(name='address_alignment_value', value=4, validator=AtLeast(1))
         ])
 
         # group lb_bridge
         self.add_params(ParameterGroup('lb_bridge'))
         lb_bridge_type_allowed = ['amm', 'apb', 'axil', 'none']
         self['lb_bridge'].add_params(
-            Parameter(name='type', value='none', validator=lambda val: val in lb_bridge_type_allowed)
+            Parameter(name='type', value='none', validator=OneOf(lb_bridge_type_allowed))
         )
 
         # group docs
         self.add_params(ParameterGroup('docs'))
         docs_type_allowed = ['md', 'asciidoc', 'asciidoc_rus']
         self['docs'].add_params(
-            Parameter(name='type', value='md', validator=lambda val: val in docs_type_allowed)
+            Parameter(name='type', value='md', validator=OneOf(docs_type_allowed))
         )
 
         # common params
@@ -273,7 +554,7 @@ class Configuration(ParameterGroup):
         self.add_params(Parameter(
             name='data_width',
             value=32,
-            validator=lambda val: val in data_width_allowed[self['lb_bridge']['type'].value])
+            validator=OneOfFor(self['lb_bridge']['type'], data_width_allowed))
         )
 
         addr_width_allowed = {
@@ -285,7 +566,7 @@ class Configuration(ParameterGroup):
         self.add_params(Parameter(
             name='address_width',
             value=32,
-            validator=lambda val: val in addr_width_allowed[self['lb_bridge']['type'].value])
+            validator=OneOfFor(self['lb_bridge']['type'], addr_width_allowed))
         )
 
         self.add_params([
@@ -295,4 +576,7 @@ class Configuration(ParameterGroup):
 
         reg_rst_allowlist = ['sync_pos', 'sync_neg', 'async_pos', 'async_neg', 'init_only']
         self.add_params(Parameter(name='register_reset', value='sync_pos',
-                                  validator=lambda val: val in reg_rst_allowlist))
+                                  validator=OneOf(reg_rst_allowlist)))
+
+        self.add_params(Parameter(name='register_arrays', value='unroll',
+                                  validator=OneOf(['unroll', 'generate'])))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Structural difference between register maps.
+"""
+
+# attributes to be compared for matched registers and bit fields
+_REG_ATTRS = ('name', 'description', 'address', 'access_strobes', 'complementary', 'write_lock')
+_BFIELD_ATTRS = ('name', 'description', 'initial', 'width', 'lsb', 'access', 'modifiers')
+
+
+def _attrs_changes(old, new, attrs):
+    """Get dictionary with (old, new) pairs for all the attributes that differ."""
+    changes = {}
+    for attr in attrs:
+        old_value, new_value = getattr(old, attr), getattr(new, attr)
+        if old_value != new_value:
+            changes[attr] = (old_value, new_value)
+    return changes
+
+
+def _match(old_items, new_items, primary, secondary):
+    """Match items by the primary key and then unmatched ones by the secondary key.
+
+    Returns list of (old, new) pairs, list of unmatched old items and list of unmatched new items.
+    """
+    old_by_primary = {primary(item): item for item in old_items}
+    matched = []
+    new_unmatched = []
+    for item in new_items:
+        old = old_by_primary.pop(primary(item), None)
+        if old is None:
+            new_unmatched.append(item)
+        else:
+            matched.append((old, item))
+    old_by_secondary = {}
+    for item in old_by_primary.values():
+        old_by_secondary.setdefault(secondary(item), []).append(item)
+    new_added = []
+    for item in new_unmatched:
+        candidates = old_by_secondary.get(secondary(item))
+        if candidates:
+            matched.append((candidates.pop(0), item))
+        else:
+            new_added.append(item)
+    old_removed = [item for items in old_by_secondary.values() for item in items]
+    return matched, old_removed, new_added
+
+
+class BitFieldChange():
+    """Changes of a bit field between two register maps.
+
+    Attributes:
+        old : bit field from the old map.
+        new : bit field from the new map.
+        changes : dictionary with (old value, new value) pairs for all the changed attributes.
+    """
+    def __init__(self, old, new, changes):
+        self.old = old
+        self.new = new
+        self.changes = changes
+
+    def __repr__(self):
+        return 'BitFieldChange(%s, %s)' % (repr(self.new.name), repr(self.changes))
+
+
+class RegisterChange():
+    """Changes of a register between two register maps.
+
+    Attributes:
+        old : register from the old map.
+        new : register from the new map.
+        changes : dictionary with (old value, new value) pairs for all the changed register attributes.
+        added_bfields : bit fields of the new register, which have no matches in the old one.
+        removed_bfields : bit fields of the old register, which have no matches in the new one.
+        modified_bfields : list of :class:`BitFieldChange` for bit fields changed.
+    """
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        self.changes = _attrs_changes(old, new, _REG_ATTRS)
+        # bit fields are matched by names and then by positions
+        matched, self.removed_bfields, self.added_bfields = _match(old, new, lambda bf: bf.name, lambda bf: bf.lsb)
+        self.modified_bfields = []
+        for old_bf, new_bf in matched:
+            changes = _attrs_changes(old_bf, new_bf, _BFIELD_ATTRS)
+            if changes:
+                self.modified_bfields.append(BitFieldChange(old_bf, new_bf, changes))
+
+    def __repr__(self):
+        return 'RegisterChange(%s, %s)' % (repr(self.new.name), repr(self.changes))
+
+    def __bool__(self):
+        return bool(self.changes or self.added_bfields or self.removed_bfields or self.modified_bfields)
+
+    @property
+    def is_moved(self):
+        """Register address was changed."""
+        return 'address' in self.changes
+
+
+class RegisterMapDiff():
+    """Structural difference between two register maps.
+
+    Registers are matched by names and then unmatched ones by addresses, so a renamed register is
+    reported as modified. Only matched registers with different digests are compared attribute by attribute,
+    so the time of comparison grows linearly with the size of the maps.
+
+    Attributes:
+        added : registers of the new map, which have no matches in the old one.
+        removed : registers of the old map, which have no matches in the new one.
+        changed : list of :class:`RegisterChange` for all the registers changed.
+
+    Examples:
+
+        >>> from corsair import BitField, Register, RegisterMap
+        >>> old = RegisterMap()
+        >>> old.add_regs([Register('reg_a', address=0x0), Register('reg_b', address=0x4)])
+        >>> new = RegisterMap()
+        >>> new.add_regs([Register('reg_b', address=0x8), Register('reg_c', address=0xC)])
+        >>> print(RegisterMapDiff(old, new))
+        - reg_a @ 0x0
+        ~ reg_b @ 0x8: address 0x4 -> 0x8
+        + reg_c @ 0xc
+    """
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        matched, self.removed, self.added = _match(old, new, lambda reg: reg.name, lambda reg: reg.address)
+        self.changed = []
+        for old_reg, new_reg in matched:
+            if old_reg._digest != new_reg._digest:
+                change = RegisterChange(old_reg, new_reg)
+                if change:
+                    self.changed.append(change)
+        self.added.sort(key=lambda reg: reg.address)
+        self.removed.sort(key=lambda reg: reg.address)
+        self.changed.sort(key=lambda change: change.new.address)
+
+    def __repr__(self):
+        return 'RegisterMapDiff(%d added, %d removed, %d changed)' % (
+            len(self.added), len(self.removed), len(self.changed))
+
+    def __str__(self):
+        return '\n'.join(self.lines())
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def moved(self):
+        """List of :class:`RegisterChange` for registers with changed addresses."""
+        return [change for change in self.changed if change.is_moved]
+
+    @property
+    def modified(self):
+        """List of :class:`RegisterChange` for registers with changes other than address."""
+        return [change for change in self.changed if set(change.changes) - {'address'} or
+                change.added_bfields or change.removed_bfields or change.modified_bfields]
+
+    def lines(self):
+        """Generate human readable lines with all the differences."""
+        def fmt(attr, value):
+            return hex(value) if attr in ('address', 'initial') else repr(value)
+
+        def fmt_changes(changes):
+            return ', '.join('%s %s -> %s' % (attr, fmt(attr, old), fmt(attr, new))
+                             for attr, (old, new) in changes.items())
+
+        for reg in self.removed:
+            yield '- %s @ %s' % (reg.name, hex(reg.address))
+        for change in self.changed:
+            head = '~ %s @ %s' % (change.new.name, hex(change.new.address))
+            if change.changes:
+                yield '%s: %s' % (head, fmt_changes(change.changes))
+            for bf in change.removed_bfields:
+                yield '%s: - %s' % (head, bf.name)
+            for bf_change in change.modified_bfields:
+                yield '%s: ~ %s: %s' % (head, bf_change.new.name, fmt_changes(bf_change.changes))
+            for bf in change.added_bfields:
+                yield '%s: + %s' % (head, bf.name)
+        for reg in self.added:
+            yield '+ %s @ %s' % (reg.name, hex(reg.address))
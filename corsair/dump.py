@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Decoding of binary dumps of the register space.
+"""
+
+import csv
+import json
+import mmap
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def _map_file(path):
+    """Memory map the file for reading and get a memoryview of it."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # empty file can't be mapped
+            yield memoryview(b'')
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+class DumpDecoder():
+    """Decoder of binary dumps of the register space.
+
+    Dump is a raw image of the register space starting from the base address, where every register
+    takes data width in bytes. Offsets and codecs of all the registers are computed once,
+    when the decoder is created. Dump files are memory mapped and registers are read via slices
+    of the mapping, so a dump of any size is processed in constant memory.
+    Registers outside of the dump are skipped.
+
+    Examples:
+
+        >>> from corsair import BitField, Register, RegisterMap, Configuration
+        >>> rmap = RegisterMap(Configuration())
+        >>> rmap.add_regs(Register('ctrl', address=0x104))
+        >>> rmap['ctrl'].add_bfields([BitField('en', lsb=0), BitField('len', lsb=8, width=8)])
+        >>> decoder = DumpDecoder(rmap, base=0x100)
+        >>> decoder.decode_bytes(bytes([0, 0, 0, 0, 0x01, 0x2a, 0, 0]))
+        [{'register': 'ctrl', 'address': 260, 'value': 10753, 'fields': {'en': 1, 'len': 42}}]
+    """
+    def __init__(self, rmap, base=0, endian='little'):
+        if endian not in ('little', 'big'):
+            raise ValueError("Unknown endianness '%s'!" % endian)
+        self.base = base
+        self.endian = endian
+        self.word_size = rmap.config['data_width'].value // 8
+        # (offset in the dump, name, address, codec) for every register
+        self._table = [(reg.address - base, reg.name, reg.address, reg.codec) for reg in rmap if reg.address >= base]
+
+    def __repr__(self):
+        return 'DumpDecoder(%s, %s)' % (repr(self.base), repr(self.endian))
+
+    def _decode_view(self, view):
+        """Decode all the registers found in the memoryview of a dump."""
+        for offset, name, address, codec in self._table:
+            if offset + self.word_size > len(view):
+                continue
+            value = int.from_bytes(view[offset:offset + self.word_size], self.endian)
+            yield {'register': name, 'address': address, 'value': value, 'fields': codec.decode(value)}
+
+    def decode_bytes(self, data):
+        """Decode all the registers found in the bytes-like object with a dump.
+
+        Returns:
+            List of dictionaries with 'register', 'address', 'value' and 'fields' keys.
+        """
+        return list(self._decode_view(memoryview(data)))
+
+    def decode(self, path):
+        """Decode all the registers found in the dump file.
+
+        Yields:
+            Dictionary with 'register', 'address', 'value' and 'fields' keys for every register.
+        """
+        with _map_file(path) as view:
+            yield from self._decode_view(view)
+
+    def diff(self, old_path, new_path):
+        """Compare two dump files field by field.
+
+        Only registers with different words are decoded.
+
+        Yields:
+            Dictionary with 'register', 'address', 'field', 'old' and 'new' keys for every bit field changed.
+        """
+        with _map_file(old_path) as old_view, _map_file(new_path) as new_view:
+            size = self.word_size
+            view_size = min(len(old_view), len(new_view))
+            for offset, name, address, codec in self._table:
+                # slices are not kept, so the mappings can be closed at any moment
+                if offset + size > view_size or old_view[offset:offset + size] == new_view[offset:offset + size]:
+                    continue
+                old_fields = codec.decode(int.from_bytes(old_view[offset:offset + size], self.endian))
+                new_fields = codec.decode(int.from_bytes(new_view[offset:offset + size], self.endian))
+                for field in codec.names:
+                    if old_fields[field] != new_fields[field]:
+                        yield {'register': name, 'address': address, 'field': field,
+                               'old': old_fields[field], 'new': new_fields[field]}
+
+    @staticmethod
+    def write(records, stream, fmt='jsonl'):
+        """Write records produced by :meth:`decode` or :meth:`diff` to the text stream.
+
+        Addresses and values are written as hexadecimal strings.
+
+        Args:
+            records : iterable with records
+            stream : text stream to write to
+            fmt : 'jsonl' to write a JSON object per line, or 'csv' to write a row per bit field
+
+        Returns:
+            Number of records written.
+        """
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError("Unknown report format '%s'!" % fmt)
+        writer = csv.writer(stream, lineterminator='\n') if fmt == 'csv' else None
+        header = True
+        records_num = 0
+        for record in records:
+            record = {key: ({k: hex(v) for k, v in value.items()} if key == 'fields' else
+                            value if key in ('register', 'field') else hex(value)) for key, value in record.items()}
+            if writer is None:
+                stream.write(json.dumps(record) + '\n')
+            elif 'fields' in record:
+                if header:
+                    writer.writerow(['register', 'address', 'value', 'field', 'field_value'])
+                for field, value in record['fields'].items():
+                    writer.writerow([record['register'], record['address'], record['value'], field, value])
+            else:
+                if header:
+                    writer.writerow(list(record))
+                writer.writerow(list(record.values()))
+            header = False
+            records_num += 1
+        return records_num
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Optimization of the register layout for the access profile of software.
+"""
+
+from itertools import combinations
+from .regmap import Register, RegisterArrayElement, SubmapRegister, RegisterMap
+from .allocator import AddressAllocator
+from .placement import BitFieldPlacer
+
+
+class LayoutOptimizer():
+    """Optimizer of the register layout for the access profile of software.
+
+    Profile is a list of (names, count) pairs: names of registers or bit fields ('reg.field') are accessed
+    together by a single read or a single write sequence, which happens count times per iteration of
+    the profile, e.g. per interrupt. Every register word touched by a sequence is a bus transaction,
+    and every range of consecutive words is a burst.
+
+    A new map is proposed in two steps:
+
+    * registers accessed together are merged in the order of the counts, while their bit fields fit
+      into a single register; bit fields of every register merged are kept together in the order given.
+      Only plain registers with the same flags are merged. Bit fields with the same names get the names
+      of their original registers as prefixes;
+    * registers are placed from the lowest address of the map with the hottest sequences first,
+      so registers accessed together are contiguous. Submaps keep their base addresses.
+
+    The original map is not changed, registers of the new map are copies.
+
+    Examples:
+
+        >>> from corsair import BitField, Register, RegisterMap, Configuration
+        >>> rmap = RegisterMap(Configuration())
+        >>> rmap.add_regs([Register('ctrl', address=0x0), Register('stat', address=0x4),
+        ...                Register('len', address=0x8), Register('cnt', address=0xc)])
+        >>> rmap['stat'].add_bfields(BitField('done', access='ro'))
+        >>> rmap['cnt'].add_bfields(BitField('val', width=16, access='ro'))
+        >>> rmap['ctrl'].add_bfields(BitField('mode', width=20))
+        >>> rmap['len'].add_bfields(BitField('val', width=16))
+        >>> opt = LayoutOptimizer(rmap, [(['stat.done', 'cnt.val'], 100), (['ctrl', 'len'], 1)])
+        >>> new_rmap, report = opt.optimize()
+        >>> [(reg.name, hex(reg.address)) for reg in new_rmap]
+        [('stat_cnt', '0x0'), ('ctrl', '0x4'), ('len', '0x8')]
+        >>> report['transactions'], report['transactions_optimized'], report['reduction']
+        (202, 102, 0.5)
+    """
+    def __init__(self, rmap, profile):
+        self.rmap = rmap
+        self.profile = [(list(names), count) for names, count in profile]
+
+    def __repr__(self):
+        return 'LayoutOptimizer(%s)' % repr(self.rmap)
+
+    @staticmethod
+    def _split(name):
+        """Split name into register and bit field names."""
+        reg_name, _, field_name = name.partition('.')
+        return reg_name, field_name
+
+    def estimate(self, rmap=None, renamed=None):
+        """Estimate bus transactions and bursts per iteration of the profile.
+
+        Args:
+            rmap : register map to be estimated; the map of the optimizer is used if not set
+            renamed : dictionary with new names of registers and bit fields by the names used in the profile
+
+        Returns:
+            Dictionary with 'transactions' and 'bursts' numbers.
+
+        Raises:
+            KeyError: An error occured if there is no such register or bit field.
+        """
+        rmap = self.rmap if rmap is None else rmap
+        renamed = renamed or {}
+        step = rmap.config['data_width'].value // 8
+        transactions = bursts = 0
+        for names, count in self.profile:
+            addrs = set()
+            for name in names:
+                reg_name, field_name = self._split(name)
+                if name in renamed:
+                    reg_name, field_name = self._split(renamed[name])
+                reg = rmap[renamed.get(reg_name, reg_name)]
+                if field_name:
+                    reg[field_name]
+                addrs.add(reg.address)
+            addrs = sorted(addrs)
+            transactions += count * len(addrs)
+            bursts += count * sum(1 for idx, addr in enumerate(addrs) if idx == 0 or addr - addrs[idx - 1] != step)
+        return {'transactions': transactions, 'bursts': bursts}
+
+    def _units(self):
+        """Get copies of the registers of the map as units to be placed, which are lists of registers.
+
+        Complementary registers at the same address are a single unit. Submaps are not units.
+        """
+        units = {}
+        unit_by_addr = {}
+        for reg in self.rmap._regs:
+            if reg.complementary and reg.address in unit_by_addr:
+                unit_by_addr[reg.address].append(reg.clone())
+                continue
+            units[reg.name] = [reg.clone()]
+            if reg.complementary:
+                unit_by_addr[reg.address] = units[reg.name]
+        return units
+
+    def _unit_name(self, name, unit_of):
+        """Get name of the unit of the register or None if the register is in a submap."""
+        reg = self.rmap[self._split(name)[0]]
+        if isinstance(reg, SubmapRegister):
+            return None
+        if isinstance(reg, RegisterArrayElement):
+            return reg.array.name
+        return unit_of[reg.name]
+
+    @staticmethod
+    def _can_merge(reg_a, reg_b):
+        """Check that registers are plain registers with the same flags."""
+        return all(type(reg) is Register and not reg.complementary for reg in (reg_a, reg_b)) and \
+            (reg_a.access_strobes, reg_a.write_lock) == (reg_b.access_strobes, reg_b.write_lock)
+
+    def _merge(self, reg_a, reg_b, names):
+        """Merge bit fields of two registers into a new register.
+
+        Bit fields of the second register with the same names as in the first one get its name as a prefix.
+
+        Returns:
+            Tuple with the new register and the dictionary with new names of the bit fields renamed,
+            or None if the registers can not be merged.
+        """
+        if not self._can_merge(reg_a, reg_b) or '%s_%s' % (reg_a.name, reg_b.name) in names:
+            return None
+        bf_renamed = {}
+        bfields = []
+        for bf in reg_b:
+            bf = bf.clone()
+            if bf.name in reg_a.names:
+                bf_renamed[bf.name] = '%s_%s' % (reg_b.name, bf.name)
+                bf.name = bf_renamed[bf.name]
+            bfields.append(bf)
+        if set(bf_renamed.values()) & set(reg_a.names):
+            return None
+        reg = reg_a.clone()
+        reg.name = '%s_%s' % (reg_a.name, reg_b.name)
+        reg.description = '; '.join(descr for descr in (reg_a.description, reg_b.description) if descr)
+        placer = BitFieldPlacer(self.rmap.config['data_width'].value)
+        if bfields and placer.place([bfields], regs=[reg]):
+            return None
+        return reg, bf_renamed
+
+    def optimize(self):
+        """Propose a new layout of the map.
+
+        Returns:
+            Tuple with the new map and the dictionary with 'transactions' and 'bursts' numbers
+            per iteration of the profile for the original map and for the new one ('transactions_optimized'
+            and 'bursts_optimized'), 'reduction' of transactions rounded to two digits and 'renamed' dictionary
+            with new names of the registers merged and the bit fields renamed ('reg.field') by their original names.
+
+        Raises:
+            KeyError: An error occured if there is no such register or bit field.
+        """
+        units = self._units()
+        unit_of = {reg.name: name for name, regs in units.items() for reg in regs}
+        # names of the units in every sequence in order of the first access
+        seqs = []
+        for names, count in self.profile:
+            seq = []
+            for name in names:
+                unit = self._unit_name(name, unit_of)
+                if unit is not None and unit not in seq:
+                    seq.append(unit)
+            seqs.append((seq, count))
+        # merge registers accessed together starting from the most frequent pairs
+        weights = {}
+        for seq, count in seqs:
+            for pair in combinations(seq, 2):
+                # pair is taken in order of the first access
+                weight = weights.setdefault(frozenset(pair), [0, pair])
+                weight[0] += count
+        names = set(self.rmap.names) | set(units)
+        renamed = {}
+        # original names of the bit fields of the registers merged by their current names
+        origins = {}
+        for _, (unit_a, unit_b) in sorted(weights.values(), key=lambda weight: -weight[0]):
+            unit_a, unit_b = renamed.get(unit_a, unit_a), renamed.get(unit_b, unit_b)
+            if unit_a == unit_b:
+                continue
+            merged = self._merge(units[unit_a][0], units[unit_b][0], names)
+            if merged is None:
+                continue
+            reg, bf_renamed = merged
+            for unit in (unit_a, unit_b):
+                if unit not in origins:
+                    origins[unit] = {bf.name: (unit, bf.name) for bf in units[unit][0]}
+            origins[reg.name] = dict(origins.pop(unit_a))
+            origins[reg.name].update((bf_renamed.get(bf_name, bf_name), origin)
+                                     for bf_name, origin in origins.pop(unit_b).items())
+            names.add(reg.name)
+            units[reg.name] = [reg]
+            del units[unit_a], units[unit_b]
+            for old, new in list(renamed.items()) + [(unit_a, None), (unit_b, None)]:
+                if new in (None, unit_a, unit_b):
+                    renamed[old] = reg.name
+        # hottest sequences first, and the rest of the registers in the original order
+        order = []
+        for seq, _ in sorted(seqs, key=lambda item: -item[1]):
+            order.extend(renamed.get(unit, unit) for unit in seq)
+        order.extend(units)
+        placed = set()
+        regs = []
+        for unit in order:
+            if unit not in placed:
+                placed.add(unit)
+                for reg in units[unit]:
+                    reg.address = None
+                    regs.append(reg)
+        new_rmap = RegisterMap(self.rmap.config.clone())
+        for block in self.rmap.submaps:
+            new_rmap.add_submap(block.name, block.rmap, block.base, block._size, block.prefix)
+        lo = min((reg.address for reg in self.rmap._regs), default=0)
+        AddressAllocator(new_rmap, lo=lo).add_regs(regs)
+        # new names of the registers and the bit fields renamed by their original names
+        renamed_names = {}
+        for unit, bfields in origins.items():
+            for bf_name, (orig_reg, orig_bf) in bfields.items():
+                renamed_names[orig_reg] = unit
+                if bf_name != orig_bf:
+                    renamed_names['%s.%s' % (orig_reg, orig_bf)] = '%s.%s' % (unit, bf_name)
+        before = self.estimate()
+        after = self.estimate(new_rmap, renamed_names)
+        reduction = 1 - after['transactions'] / before['transactions'] if before['transactions'] else 0.0
+        return new_rmap, {
+            'transactions': before['transactions'],
+            'transactions_optimized': after['transactions'],
+            'bursts': before['bursts'],
+            'bursts_optimized': after['bursts'],
+            'reduction': round(reduction, 2),
+            'renamed': renamed_names,
+        }
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Placement of bit fields without positions into registers.
+"""
+
+from functools import lru_cache
+from .regmap import Register
+from . import utils
+
+
+@lru_cache(maxsize=4096)
+def _free_runs(mask, width, lane):
+    """Get the largest run of free bits and the largest run of free bits starting at a byte lane."""
+    largest = largest_aligned = run = 0
+    for pos in range(width - 1, -1, -1):
+        run = 0 if (mask >> pos) & 1 else run + 1
+        largest = run if run > largest else largest
+        if pos % lane == 0 and run > largest_aligned:
+            largest_aligned = run
+    return largest, largest_aligned
+
+
+class _Bins():
+    """Registers being filled with the largest runs of free bits in every subtree of two segment trees.
+
+    One tree is for runs starting anywhere and another one is for runs starting at byte lanes,
+    so the lowest register with enough free bits for a block is found in O(log r) for r registers.
+    Registers not used yet are empty, so the lowest of them is opened when no used register fits.
+    """
+    def __init__(self, masks, capacity, width, lane):
+        self.width = width
+        self.lane = lane
+        self.masks = list(masks) + [0] * (capacity - len(masks))
+        self._leaves = 1 << max(capacity - 1, 0).bit_length()
+        self._trees = ([0] * (2 * self._leaves), [0] * (2 * self._leaves))
+        # registers not used yet are empty
+        self._trees[0][self._leaves:self._leaves + capacity] = [width] * capacity
+        self._trees[1][self._leaves:self._leaves + capacity] = [width] * capacity
+        for idx, mask in enumerate(masks):
+            self._trees[0][self._leaves + idx], self._trees[1][self._leaves + idx] = _free_runs(mask, width, lane)
+        for tree in self._trees:
+            for node in range(self._leaves - 1, 0, -1):
+                tree[node] = max(tree[2 * node], tree[2 * node + 1])
+
+    def find(self, size, aligned):
+        """Get index of the lowest register with a run of free bits large enough or None."""
+        tree = self._trees[aligned]
+        if tree[1] < size:
+            return None
+        node = 1
+        while node < self._leaves:
+            node = 2 * node if tree[2 * node] >= size else 2 * node + 1
+        return node - self._leaves
+
+    def take(self, idx, size, block_mask, aligned):
+        """Occupy the lowest suitable bits of the register with the block and get its position."""
+        mask = self.masks[idx]
+        step = self.lane if aligned else 1
+        for pos in range(0, self.width - size + 1, step):
+            if not mask & (block_mask << pos):
+                break
+        self.masks[idx] = mask | (block_mask << pos)
+        runs = _free_runs(self.masks[idx], self.width, self.lane)
+        for tree, run in zip(self._trees, runs):
+            node = self._leaves + idx
+            tree[node] = run
+            node //= 2
+            while node:
+                left, right = tree[2 * node], tree[2 * node + 1]
+                tree[node] = left if left > right else right
+                node //= 2
+        return pos
+
+
+class BitFieldPlacer():
+    """Placer of bit fields without positions into as few registers as possible.
+
+    Bit fields are packed with first fit decreasing: the widest blocks are placed first, and every block goes
+    to the lowest bits of the first register with enough free bits. So software needs fewer registers, and
+    therefore fewer bus transactions, to access all the fields. A block is either a single bit field,
+    or a list of bit fields to be kept together, which are placed in the order given in a single register.
+    Bit fields listed as aligned start at byte lanes, and a block with such fields starts at a byte lane as well.
+    Padding before aligned bit fields of a block can be taken by other bit fields.
+
+    Registers with free bits can be filled first, then new registers are created.
+    The register for a block is found in O(log r) time for r registers, so tens of thousands of bit fields
+    are placed in about a second.
+
+    Examples:
+
+        >>> from corsair import BitField, Register
+        >>> placer = BitFieldPlacer(data_width=16)
+        >>> regs = placer.place([
+        ...     BitField('en'),
+        ...     BitField('mode', width=3),
+        ...     [BitField('lo', width=6), BitField('hi', width=6)],
+        ...     BitField('data', width=8),
+        ... ], aligned=['data'])
+        >>> [[(bf.name, bf.lsb) for bf in reg] for reg in regs]
+        [[('lo', 0), ('hi', 6), ('mode', 12), ('en', 15)], [('data', 0)]]
+    """
+    def __init__(self, data_width=32, lane_width=8):
+        self.data_width = data_width
+        self.lane_width = lane_width
+
+    def __repr__(self):
+        return 'BitFieldPlacer(%s, %s)' % (repr(self.data_width), repr(self.lane_width))
+
+    def _blocks(self, items, aligned):
+        """Get blocks of (width, mask, aligned, [(bit field, offset)]) with offsets of bit fields inside them."""
+        blocks = []
+        for item in items:
+            bfields = utils.listify(item)
+            offset = 0
+            block_aligned = False
+            layout = []
+            for bf in bfields:
+                if bf.name in aligned:
+                    offset = -(-offset // self.lane_width) * self.lane_width
+                    block_aligned = True
+                layout.append((bf, offset))
+                offset += bf.width
+            if offset > self.data_width:
+                raise ValueError("Bit field(s) %s do not fit into %d bits of a register!" %
+                                 (repr([bf.name for bf in bfields]), self.data_width))
+            mask = 0
+            for bf, bf_offset in layout:
+                mask |= ((1 << bf.width) - 1) << bf_offset
+            blocks.append((offset, mask, block_aligned, layout))
+        return blocks
+
+    def place(self, items, regs=(), aligned=(), name='reg%d'):
+        """Set positions of bit fields and add them to registers.
+
+        Args:
+            items : list with bit fields and lists of bit fields to be kept together
+            regs : list with registers to be filled first; they get bit fields into their free bits
+            aligned : names of bit fields to be placed at byte lanes
+            name : format of names for new registers, which is applied to the index of a new register
+
+        Returns:
+            List of new registers.
+
+        Raises:
+            ValueError: An error occured if bit fields to be kept together do not fit into a register,
+                or a register gets bit fields with the same names. Nothing is changed in that case.
+        """
+        regs = list(regs)
+        aligned = set(aligned)
+        blocks = self._blocks(items, aligned)
+        masks = []
+        for reg in regs:
+            mask = 0
+            for bf in reg:
+                mask |= bf.mask
+            masks.append(mask)
+        bins = _Bins(masks, len(regs) + len(blocks), self.data_width, self.lane_width)
+        placed = {}
+        # the widest first, and aligned before unaligned of the same width as they are harder to place
+        for width, mask, block_aligned, layout in sorted(blocks, key=lambda block: (-block[0], not block[2])):
+            idx = bins.find(width, block_aligned)
+            pos = bins.take(idx, width, mask, block_aligned)
+            placed.setdefault(idx, []).extend((bf, pos + offset) for bf, offset in layout)
+        # names are checked before any bit field is changed, so nothing is changed if any of them is wrong
+        new_names = {}
+        for idx in sorted(placed):
+            if idx < len(regs):
+                reg_name, names = regs[idx].name, set(regs[idx].names)
+            else:
+                reg_name, names = name % len(new_names), set()
+                new_names[idx] = reg_name
+            for bf, _ in placed[idx]:
+                if bf.name in names:
+                    raise ValueError("Bit field with name '%s' is already present in '%s' register!" %
+                                     (bf.name, reg_name))
+                names.add(bf.name)
+        new_regs = []
+        for idx in sorted(placed):
+            for bf, lsb in placed[idx]:
+                bf.lsb = lsb
+            bfields = [bf for bf, _ in placed[idx]]
+            if idx < len(regs):
+                regs[idx].add_bfields(bfields)
+            else:
+                reg = Register(new_names[idx])
+                reg.add_bfields(bfields)
+                new_regs.append(reg)
+        return new_regs
@@ -7,7 +7,8 @@
 import json
 import yaml
 from .config import Configuration
-from .regmap import BitField, Register, RegisterMap
+from .regmap import BitField, Register, RegisterArray, RegisterMap
+from .columnar import ColumnarRegisterMap
 from . import utils
 
 
@@ -43,9 +44,14 @@ class RegisterMapReader(_DictReader):
           Read configuration ... OK
           Read registers ... OK
     """
-    def __call__(self, path, config=Configuration()):
+    def __call__(self, path, config=Configuration(), columnar=False):
         """Read input file.
 
+        Args:
+            path : path to file
+            config : :class:`Configuration` object to be updated with configuration from the file
+            columnar : create :class:`ColumnarRegisterMap` to save memory for a huge register map
+
         Returns:
             :class:`RegisterMap` object.
         """
@@ -62,13 +68,19 @@ class RegisterMapReader(_DictReader):
 
         # Read registers
         print("  Read registers ... ", end='')
-        rmap = RegisterMap(config=config)
-        for data_reg in data['regmap']:
-            data_reg_filtered = {k: v for k, v in data_reg.items() if k in ['name', 'description', 'address']}
-            reg = Register(**data_reg_filtered)
-            for data_bf in data_reg['bfields']:
-                reg.add_bfields(BitField(**data_bf))
-            rmap.add_regs(reg)
+        rmap = ColumnarRegisterMap(config=config) if columnar else RegisterMap(config=config)
+        with rmap.bulk():
+            for data_reg in data['regmap']:
+                if 'count' in data_reg:
+                    data_reg_filtered = {k: v for k, v in data_reg.items()
+                                         if k in ['name', 'description', 'address', 'count', 'stride']}
+                    reg = RegisterArray(**data_reg_filtered)
+                else:
+                    data_reg_filtered = {k: v for k, v in data_reg.items() if k in ['name', 'description', 'address']}
+                    reg = Register(**data_reg_filtered)
+                for data_bf in data_reg['bfields']:
+                    reg.add_bfields(BitField(**data_bf))
+                rmap.add_regs(reg)
         print("OK")
         return rmap
 
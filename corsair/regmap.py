@@ -4,13 +4,142 @@
 """Register map.
 """
 
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from itertools import groupby
+import heapq
+import hashlib
+import math
+import re
+import weakref
+from operator import attrgetter
 from . import utils
+from . import vectorized
+from .codec import RegisterCodec
 from .config import Configuration
 
+# allowed access modes of a bit field
+_ACCESS_MODES = ('rw', 'ro', 'wo')
+
+# allowed access modifiers of a bit field
+_MODIFIERS = ('sc', 'w1tc', 'w1ts', 'w1tt', 'rtc', 'const', 'hwu', 'fifo')
+
+# allowed combinations of access modifiers for every access mode
+_MODIFIERS_COMBINATIONS = {
+    'rw': (
+        (),
+        ('hwu',),
+        ('hwu', 'w1tc'),
+        ('hwu', 'w1ts'),
+        ('hwu', 'w1tt'),
+        ('fifo',),
+    ),
+    'wo': (
+        (),
+        ('sc',),
+        ('fifo',),
+    ),
+    'ro': (
+        (),
+        ('const',),
+        ('hwu',),
+        ('hwu', 'rtc'),
+        ('fifo',),
+    ),
+}
+
+# flags of a register, which registers are indexed by
+_REG_FLAGS = ('access_strobes', 'write_lock', 'complementary')
+_REG_FLAGS_KEYS = tuple(('_' + flag, ('flag', flag)) for flag in _REG_FLAGS)
+# index keys of a bit field for every combination of access mode and modifiers met
+_BF_KEYS = {}
+
+# name of a register array element: array name, which does not end with a digit, and index without leading zeros
+_ARRAY_ELEMENT_NAME = re.compile(r'(.*\D)(0|[1-9]\d*)$')
+
+
+def _mod_inverse(value, modulo):
+    """Modular multiplicative inverse of the value, which is coprime with the modulo."""
+    t, new_t, r, new_r = 0, 1, modulo, value % modulo
+    while new_r:
+        quotient = r // new_r
+        t, new_t = new_t, t - quotient * new_t
+        r, new_r = new_r, r - quotient * new_r
+    return t % modulo
+
+
+def _addr_progression(reg):
+    """Start address, step and number of addresses occupied by the register or the register array."""
+    if isinstance(reg, RegisterArray):
+        return reg.address, reg.stride, reg.count
+    return reg.address, 1, 1
+
+
+def _progressions_intersection(start_a, step_a, num_a, start_b, step_b, num_b):
+    """The lowest address, which belongs to both arithmetic progressions of addresses, or None."""
+    lo = max(start_a, start_b)
+    hi = min(start_a + step_a * (num_a - 1), start_b + step_b * (num_b - 1))
+    if lo > hi:
+        return None
+    gcd = math.gcd(step_a, step_b)
+    if (start_b - start_a) % gcd:
+        return None
+    # solve start_a + i * step_a = start_b (mod step_b) to find any common address
+    modulo = step_b // gcd
+    i = (start_b - start_a) // gcd * _mod_inverse(step_a // gcd, modulo) % modulo
+    common_step = step_a * modulo
+    addr = lo + (start_a + i * step_a - lo) % common_step
+    return addr if addr <= hi else None
+
+
+class _BitFieldSpec():
+    """Immutable definition of a bit field without its position.
+
+    Definitions are interned: equal definitions are the same object, which is shared by all the bit fields
+    with such a definition. A definition is dropped from the pool as soon as no bit field uses it.
+    """
+    __slots__ = ('name', 'description', 'initial', 'width', 'access', 'modifiers', '__weakref__')
+
+    # pool with all the definitions in use by their key attributes
+    _pool = weakref.WeakValueDictionary()
+
+    def __new__(cls, name, description, initial, width, access, modifiers):
+        key = (name, description, initial, width, access, modifiers)
+        spec = cls._pool.get(key)
+        if spec is None:
+            spec = super().__new__(cls)
+            spec.name, spec.description, spec.initial, spec.width, spec.access, spec.modifiers = key
+            cls._pool[key] = spec
+        return spec
+
+    def __repr__(self):
+        return '_BitFieldSpec(%s)' % repr(self.name)
+
+    def __reduce__(self):
+        # definition is interned again when unpickled
+        return (_BitFieldSpec, (self.name, self.description, self.initial, self.width, self.access, self.modifiers))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def replace(self, **kwargs):
+        """Get definition with some attributes replaced."""
+        attrs = {attr: getattr(self, attr) for attr in self.__slots__[:-1]}
+        attrs.update(kwargs)
+        return _BitFieldSpec(**attrs)
+
 
 class BitField():
     """Bit field.
 
+    Name, description, initial value, width, access mode and modifiers are stored in a definition,
+    which is shared by all the bit fields with the same attributes, so a huge register map with
+    a lot of repeated bit fields takes less memory. Position of a bit field is stored in every bit field.
+    Bit fields are still independent: when an attribute is changed, the bit field just takes another definition.
+
     Examples:
 
         Create a bit field:
@@ -23,19 +152,20 @@ class BitField():
           access = rw
           modifiers = []
 
-    Attributes:
-        name: Name of the bit field.
-        description: Description of the bit field.
     """
+    __slots__ = ('_parent', '_cache', '_spec', '_lsb')
+
     def __init__(self, name, description='', initial=0, width=1,
-                 lsb=0, access='rw', modifiers=[]):
-        self.name = name
-        self.description = description
-        self.initial = initial
-        self.width = width
+                 lsb=0, access='rw', modifiers=()):
+        self._parent = None
+        self._cache = None
+
+        initial = self._valid_initial(initial, name)
+        width = self._valid_width(width, name)
+        access = self._valid_access(access, name)
+        modifiers = self._valid_modifiers(modifiers, access, name)
+        self._spec = _BitFieldSpec(name, description, initial, width, access, modifiers)
         self.lsb = lsb
-        self.access = access
-        self.modifiers = modifiers
 
     def __eq__(self, other):
         if self.__class__ != other.__class__:
@@ -78,6 +208,75 @@ class BitField():
             'modifiers': self.modifiers
         }
 
+    # attributes stored in the shared definition
+    _name = property(attrgetter('_spec.name'))
+    _description = property(attrgetter('_spec.description'))
+    _initial = property(attrgetter('_spec.initial'))
+    _width = property(attrgetter('_spec.width'))
+    _access = property(attrgetter('_spec.access'))
+    _modifiers = property(attrgetter('_spec.modifiers'))
+
+    def clone(self):
+        """Returns a copy of the bit field, which is not attached to any register.
+
+        Definition of the bit field is shared with the copy, so the copy is cheap.
+        The copy takes another definition as soon as any of its attributes is changed.
+        """
+        bf = BitField.__new__(BitField)
+        bf._parent = None
+        bf._cache = None
+        bf._spec = self._spec
+        bf._lsb = self._lsb
+        return bf
+
+    def __getstate__(self):
+        # bit field is pickled without its register
+        return (self._spec, self._lsb)
+
+    def __setstate__(self, state):
+        self._parent = None
+        self._cache = None
+        self._spec, self._lsb = state
+
+    def _replace_spec(self, **kwargs):
+        """Take another definition with some attributes changed."""
+        self._spec = self._spec.replace(**kwargs)
+        self._changed()
+
+    @property
+    def name(self):
+        """Name of the bit field."""
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._parent is not None:
+            self._parent._rename_bfield(self, value)
+        self._replace_spec(name=value)
+
+    @property
+    def description(self):
+        """Description of the bit field."""
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._replace_spec(description=value)
+
+    def _changed(self):
+        """Drop cached values when any attribute of the bit field is changed."""
+        self._cache = None
+        if self._parent is not None:
+            self._parent._changed()
+
+    @staticmethod
+    def _valid_initial(value, name):
+        value = utils.try_hex_to_dec(value)
+        err_msg = ("Initial value '%s' for '%s' is wrong!"
+                   " Only non-negative integers are allowed." % (value, name))
+        utils.is_non_neg_int(value, err_msg)
+        return value
+
     @property
     def initial(self):
         """Initial value for the field. Only non-negative integers are allowed."""
@@ -85,11 +284,15 @@ class BitField():
 
     @initial.setter
     def initial(self, value):
+        self._replace_spec(initial=self._valid_initial(value, self.name))
+
+    @staticmethod
+    def _valid_width(value, name):
         value = utils.try_hex_to_dec(value)
-        err_msg = ("Initial value '%s' for '%s' is wrong!"
-                   " Only non-negative integers are allowed." % (value, self.name))
-        if utils.is_non_neg_int(value, err_msg):
-            self._initial = value
+        err_msg = ("Width value '%s' for '%s' is wrong!"
+                   " Only positive integers are allowed." % (value, name))
+        utils.is_pos_int(value, err_msg)
+        return value
 
     @property
     def width(self):
@@ -98,11 +301,9 @@ class BitField():
 
     @width.setter
     def width(self, value):
-        value = utils.try_hex_to_dec(value)
-        err_msg = ("Width value '%s' for '%s' is wrong!"
-                   " Only positive integers are allowed." % (value, self.name))
-        if utils.is_pos_int(value, err_msg):
-            self._width = value
+        self._replace_spec(width=self._valid_width(value, self.name))
+        if self._parent is not None:
+            self._parent._update_bfields_layout()
 
     @property
     def lsb(self):
@@ -116,6 +317,9 @@ class BitField():
                    " Only non-negative integers are allowed." % (value, self.name))
         if utils.is_non_neg_int(value, err_msg):
             self._lsb = value
+            self._changed()
+            if self._parent is not None:
+                self._parent._update_bfields_layout()
 
     @property
     def msb(self):
@@ -123,6 +327,11 @@ class BitField():
         return self.lsb + self.width - 1
 
     @property
+    def mask(self):
+        """Bit mask of the field inside a register."""
+        return ((1 << self.width) - 1) << self.lsb
+
+    @utils.cached_property
     def byte_strobes(self):
         """Dictionary with LSB and MSB values for every byte in write data bus."""
         strb = {}
@@ -138,6 +347,14 @@ class BitField():
                        'wdata_lsb': wdata_lsb, 'wdata_msb': wdata_msb}
         return strb
 
+    @staticmethod
+    def _valid_access(value, name):
+        try:
+            # use the shared string object
+            return _ACCESS_MODES[_ACCESS_MODES.index(value)]
+        except ValueError:
+            raise ValueError("Unknown access mode '%s' for '%s' field!" % (value, name))
+
     @property
     def access(self):
         """Bit field access mode."""
@@ -145,66 +362,38 @@ class BitField():
 
     @access.setter
     def access(self, value):
-        if value not in ['rw', 'ro', 'wo']:
-            raise ValueError("Unknown access mode '%s' for '%s' field!" % (value, self.name))
-        else:
-            self._access = value
+        self._replace_spec(access=self._valid_access(value, self.name))
 
-    @property
-    def modifiers(self):
-        """List of an access modifiers."""
-        return self._modifiers
-
-    @modifiers.setter
-    def modifiers(self, value):
+    @staticmethod
+    def _valid_modifiers(value, access, name):
         # hack to handle single elements
-        if type(value) is not list:
+        if not isinstance(value, (list, tuple)):
             value = [value]
 
         # check if all options are allowed
-        allowlist = [
-            'sc',
-            'w1tc',
-            'w1ts',
-            'w1tt',
-            'rtc',
-            'const',
-            'hwu',
-            'fifo',
-        ]
         for v in value:
-            if v not in allowlist:
-                raise ValueError("Unknown access mode '%s' for '%s' field!" % (v, self.name))
+            if v not in _MODIFIERS:
+                raise ValueError("Unknown access mode '%s' for '%s' field!" % (v, name))
 
         # check if options combination is allowed
-        allowlist_comb = {
-            'rw': [
-                [],
-                ['hwu'],
-                ['hwu', 'w1tc'],
-                ['hwu', 'w1ts'],
-                ['hwu', 'w1tt'],
-                ['fifo'],
-            ],
-            'wo': [
-                [],
-                ['sc'],
-                ['fifo'],
-            ],
-            'ro': [
-                [],
-                ['const'],
-                ['hwu'],
-                ['hwu', 'rtc'],
-                ['fifo'],
-            ],
-        }
-        if value not in allowlist_comb[self.access]:
-            raise ValueError("Unknown access modifiers combination '%s' for '%s' field!" % (value, self.name))
+        allowlist_comb = _MODIFIERS_COMBINATIONS[access]
+        value = tuple(value)
+        if value not in allowlist_comb:
+            raise ValueError("Unknown access modifiers combination '%s' for '%s' field!" % (list(value), name))
 
-        self._modifiers = value
+        # use the shared tuple object
+        return allowlist_comb[allowlist_comb.index(value)]
 
     @property
+    def modifiers(self):
+        """List of an access modifiers."""
+        return list(self._modifiers)
+
+    @modifiers.setter
+    def modifiers(self, value):
+        self._replace_spec(modifiers=self._valid_modifiers(value, self.access, self.name))
+
+    @utils.cached_property
     def bits(self):
         """Returns list with all bits positions used by a bit field"""
         return list(range(self.lsb, self.msb + 1))
@@ -264,9 +453,19 @@ class Register():
         bf_a
         bf_b
     """
+    __slots__ = ('_parent', '_cache', '_fp_part', '_bfields', '_bfields_by_name', '_msbs', '_mask',
+                 '_name', '_description', '_address', '_access_strobes', '_complementary', '_write_lock',
+                 '_bfields_src')
+
     def __init__(self, name='', description='', address=None,
                  access_strobes=False, complementary=False, write_lock=False):
+        self._parent = None
+        self._cache = None
+        self._fp_part = None
         self._bfields = []
+        self._bfields_by_name = {}
+        self._msbs = []
+        self._mask = 0
 
         self.name = name
         self.description = description
@@ -330,10 +529,10 @@ class Register():
         """
         try:
             if isinstance(key, str):
-                return next(bf for bf in self if bf.name == key)
+                return self._bfields_by_name[key]
             else:
                 return self._bfields[key]
-        except (StopIteration, TypeError, KeyError, IndexError):
+        except (TypeError, KeyError, IndexError):
             raise KeyError("There is no bit field with a name/index '%s' in '%s' register!" % (key, self.name))
 
     def __setitem__(self, key, value):
@@ -356,7 +555,55 @@ class Register():
 
     @name.setter
     def name(self, value):
+        if self._parent is not None:
+            self._parent._rename_reg(self, value if value else self._bfields_name())
         self._name = value
+        self._changed()
+
+    def _bfields_name(self):
+        """Name of the only bit field, which is used when register has no name."""
+        return self._bfields[0].name if len(self._bfields) == 1 else None
+
+    def _changed(self):
+        """Drop cached values when any attribute of the register or its bit fields is changed."""
+        self._cache = None
+        if self._parent is not None:
+            self._parent._changed(self)
+
+    def _digest_data(self):
+        """Tuple with all the register content to compute digest."""
+        return (self.name, self.description, self.address,
+                self.access_strobes, self.complementary, self.write_lock,
+                [(bf._name, bf._description, bf._initial, bf._width, bf._lsb, bf._access, bf._modifiers)
+                 for bf in self._bfields])
+
+    def _compute_digest(self):
+        """Digest of the register content as an integer."""
+        data = repr(self._digest_data())
+        return int.from_bytes(hashlib.sha256(data.encode()).digest(), 'big')
+
+    @utils.cached_property
+    def _digest(self):
+        """Digest of the register content, which is computed once until the register is changed."""
+        return self._compute_digest()
+
+    def fingerprint(self):
+        """Returns hexadecimal digest of the register content.
+
+        Digest depends only on register attributes and bit fields, but not on the way they were created.
+        """
+        return '%064x' % self._digest
+
+    def _rename_bfield(self, bf, new_name):
+        """Update bit field name index before bit field is renamed."""
+        if new_name == bf.name:
+            return
+        if new_name in self._bfields_by_name:
+            raise ValueError("Bit field with name '%s' is already present in '%s' register!" % (new_name, self.name))
+        if self._parent is not None and not self._name:
+            self._parent._rename_reg(self, new_name)
+        del self._bfields_by_name[bf.name]
+        self._bfields_by_name[new_name] = bf
 
     @property
     def address(self):
@@ -369,9 +616,15 @@ class Register():
         err_msg = ("Address value '%s' for '%s' is wrong!"
                    " Only non-negative integers are allowed." % (value, self._name))
         if value is None:
+            if self._parent is not None:
+                raise ValueError("Not able to clear address of '%s' register inside a map!" % self.name)
             self._address = None
         elif utils.is_non_neg_int(value, err_msg):
-            self._address = value
+            if self._parent is not None:
+                self._parent._move_reg(self, value)
+            else:
+                self._address = value
+        self._changed()
 
     @property
     def access_strobes(self):
@@ -382,6 +635,7 @@ class Register():
     def access_strobes(self, value):
         if isinstance(value, bool):
             self._access_strobes = value
+            self._changed()
         else:
             raise ValueError("Access strobes attribute has to be 'bool', "
                              "but '%s' provided for '%s' field!" % (type(value), self.name))
@@ -395,6 +649,7 @@ class Register():
     def complementary(self, value):
         if isinstance(value, bool):
             self._complementary = value
+            self._changed()
         else:
             raise ValueError("Complementary mode attribute has to be 'bool', "
                              "but '%s' provided for '%s' field!" % (type(value), self.name))
@@ -408,6 +663,7 @@ class Register():
     def write_lock(self, value):
         if isinstance(value, bool):
             self._write_lock = value
+            self._changed()
         else:
             raise ValueError("Write lock mode attribute has to be 'bool', "
                              "but '%s' provided for '%s' field!" % (type(value), self.name))
@@ -428,6 +684,72 @@ class Register():
     @description.setter
     def description(self, value):
         self._description = value
+        self._changed()
+
+    def clone(self):
+        """Returns a copy of the register with copies of all its bit fields.
+
+        The copy is not attached to any map, and it is a :class:`Register` even for elements of register arrays
+        and registers of submaps. Bit fields of the copy are created on first use from the definitions
+        and positions of the original bit fields, so the copy is cheap. Values computed for the register
+        are shared with the copy until any of them is changed.
+        """
+        return self._clone_to(Register.__new__(Register))
+
+    def _clone_to(self, reg):
+        """Copy all the attributes of the register to the uninitialized register object."""
+        reg._parent = None
+        # cached values are shared, since cache is dropped as a whole when a register is changed
+        reg._cache = self._cache
+        reg._fp_part = None
+        reg._bfields_src = self._bfields_state
+        reg._mask = self._mask
+        reg._name = self._name
+        reg._description = self._description
+        reg._address = self._address
+        reg._access_strobes = self._access_strobes
+        reg._complementary = self._complementary
+        reg._write_lock = self._write_lock
+        return reg
+
+    @utils.cached_property
+    def _bfields_state(self):
+        """Tuple with definitions and positions of all the bit fields."""
+        return tuple((bf._spec, bf._lsb) for bf in self._bfields)
+
+    def __getattr__(self, name):
+        # bit fields of a copy are created on first use
+        if name not in ('_bfields', '_bfields_by_name', '_msbs'):
+            raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+        bfields = []
+        self._bfields_by_name = {}
+        for spec, lsb in self._bfields_src:
+            bf = BitField.__new__(BitField)
+            bf._parent = self
+            bf._cache = None
+            bf._spec = spec
+            bf._lsb = lsb
+            bfields.append(bf)
+            self._bfields_by_name[spec.name] = bf
+        self._bfields = bfields
+        self._msbs = [bf.msb for bf in bfields]
+        del self._bfields_src
+        return getattr(self, name)
+
+    def __getstate__(self):
+        # bit fields are stored as definitions and positions, and they are created on first use after loading
+        return (self._name, self._description, self._address, self._access_strobes, self._complementary,
+                self._write_lock, self._bfields_state)
+
+    def __setstate__(self, state):
+        (self._name, self._description, self._address, self._access_strobes, self._complementary,
+         self._write_lock, self._bfields_src) = state
+        self._parent = None
+        self._cache = None
+        self._fp_part = None
+        self._mask = 0
+        for spec, lsb in self._bfields_src:
+            self._mask |= ((1 << spec.width) - 1) << lsb
 
     @property
     def bfields(self):
@@ -445,24 +767,33 @@ class Register():
         # add bit fields to list one by one
         for bf in new_bfields:
             # check existance
-            if bf.name in self.names:
+            if bf.name in self._bfields_by_name:
                 raise ValueError("Bit field with name '%s' is already present in '%s' register!" % (bf.name, self.name))
             # check fields overlapping
-            overlaps = [set(bf.bits).intersection(set(old_bf.bits)) for old_bf in self._bfields]
-            overlaps_names = [self.names[i] for i, ovl in enumerate(overlaps) if ovl]
-            if self.bfields and overlaps_names:
+            bf_mask = bf.mask
+            if self._mask & bf_mask:
+                overlaps_names = [old_bf.name for old_bf in self._bfields if old_bf.mask & bf_mask]
                 raise ValueError("Position of a bit field '%s'"
                                  " conflicts with other bit field(s): %s!" % (bf.name, repr(overlaps_names)))
             # if we here - all is ok and bit field can be added
-            try:
-                # find position to insert bit field and not to break ascending order of bit field msb positions
-                bf_idx = next(i for i, old_bf in enumerate(self._bfields) if old_bf.msb > bf.msb)
-                self._bfields.insert(bf_idx, bf)
-            except StopIteration:
-                # when bit field list is empty or all bit field msb positions are less than the current one
-                self._bfields.append(bf)
-
-    @property
+            # find position to insert bit field and not to break ascending order of bit field msb positions
+            bf_idx = bisect_right(self._msbs, bf.msb)
+            self._msbs.insert(bf_idx, bf.msb)
+            self._bfields.insert(bf_idx, bf)
+            self._mask |= bf_mask
+            self._bfields_by_name[bf.name] = bf
+            bf._parent = self
+        self._changed()
+
+    def _update_bfields_layout(self):
+        """Restore ascending order of bit fields and occupied bits mask after bit field position is changed."""
+        self._bfields.sort(key=lambda bf: bf.msb)
+        self._msbs = [bf.msb for bf in self._bfields]
+        self._mask = 0
+        for bf in self._bfields:
+            self._mask |= bf.mask
+
+    @utils.cached_property
     def initial(self):
         """Initial value of the refister after reset."""
         init = 0
@@ -470,7 +801,7 @@ class Register():
             init |= bf.initial << bf.lsb
         return init
 
-    @property
+    @utils.cached_property
     def access(self):
         """Register access mode, based on bitfields."""
         accesses = list(set([bf.access for bf in self.bfields]))
@@ -479,6 +810,11 @@ class Register():
         else:
             return 'rw'
 
+    @utils.cached_property
+    def codec(self):
+        """Encoder and decoder of the register words, see :class:`RegisterCodec`."""
+        return RegisterCodec(self)
+
     def _validate(self):
         """Last checks of the register before use."""
         # complementary checks
@@ -495,6 +831,325 @@ class Register():
                                  self.name)
 
 
+def _array_attr(name):
+    """Read-only property to get an attribute of the register array."""
+    return property(lambda self: getattr(self._array, name))
+
+
+class RegisterArray(Register):
+    """Array of control and status registers replicated from a single template.
+
+    The array is the template register itself with the address of the first element,
+    number of elements and distance between them in bytes. Register map stores the array once and checks
+    its addresses arithmetically. Elements are read-only :class:`RegisterArrayElement` objects
+    named with an index suffix, which are created on demand.
+
+    If stride is not set, data width of the register map in bytes is used.
+
+    Examples:
+
+        >>> arr = RegisterArray('ch', 'Channel', address=0x100, count=4, stride=8)
+        >>> arr.add_bfields(BitField('en', 'Enable', lsb=0))
+        >>> [(reg.name, hex(reg.address)) for reg in arr.elements()]
+        [('ch0', '0x100'), ('ch1', '0x108'), ('ch2', '0x110'), ('ch3', '0x118')]
+    """
+    __slots__ = ('_count', '_stride')
+
+    def __init__(self, name='', description='', address=None, count=1, stride=None,
+                 access_strobes=False, complementary=False, write_lock=False):
+        self._count = 1
+        self._stride = None
+        super().__init__(name, description, address, access_strobes, complementary, write_lock)
+        self.count = count
+        self.stride = stride
+
+    def __repr__(self):
+        return 'RegisterArray(%s, %s, %s, %s, %s)' % (repr(self.name), repr(self.description), repr(self.address),
+                                                      repr(self.count), repr(self.stride))
+
+    def as_str(self, indent=''):
+        """Returns indented string with the register array information."""
+        reg_str = super().as_str(indent)
+        header, _, bfields_str = reg_str.partition('\n')
+        header = indent + '(0x%x, stride 0x%x) %s[%d]: %s' % (self.address, self.stride, self.name,
+                                                              self.count, self.description)
+        return header + '\n' + bfields_str
+
+    def as_dict(self):
+        """Returns dictionary with register array's key attributes."""
+        reg_dict = super().as_dict()
+        bfields = reg_dict.pop('bfields')
+        reg_dict['count'] = self.count
+        reg_dict['stride'] = self.stride
+        reg_dict['bfields'] = bfields
+        return reg_dict
+
+    def _digest_data(self):
+        return super()._digest_data() + (self.count, self.stride)
+
+    @property
+    def count(self):
+        """Number of elements. Only positive integers are allowed."""
+        return self._count
+
+    @count.setter
+    def count(self, value):
+        value = utils.try_hex_to_dec(value)
+        err_msg = ("Count value '%s' for '%s' is wrong!"
+                   " Only positive integers are allowed." % (value, self._name))
+        if self._parent is not None:
+            raise ValueError("Not able to change count of '%s' register array inside a map!" % self.name)
+        if utils.is_pos_int(value, err_msg):
+            self._count = value
+            self._changed()
+
+    @property
+    def stride(self):
+        """Distance between addresses of the neighbour elements in bytes. Only positive integers are allowed."""
+        return self._stride
+
+    @stride.setter
+    def stride(self, value):
+        value = utils.try_hex_to_dec(value)
+        err_msg = ("Stride value '%s' for '%s' is wrong!"
+                   " Only positive integers are allowed." % (value, self._name))
+        if self._parent is not None:
+            raise ValueError("Not able to change stride of '%s' register array inside a map!" % self.name)
+        if value is None or utils.is_pos_int(value, err_msg):
+            self._stride = value
+            self._changed()
+
+    def clone(self):
+        """Returns a copy of the register array, see :meth:`Register.clone`."""
+        arr = self._clone_to(RegisterArray.__new__(RegisterArray))
+        arr._count = self._count
+        arr._stride = self._stride
+        return arr
+
+    def __getstate__(self):
+        return super().__getstate__() + (self._count, self._stride)
+
+    def __setstate__(self, state):
+        super().__setstate__(state[:-2])
+        self._count, self._stride = state[-2:]
+
+    @property
+    def last_address(self):
+        """Address of the last element."""
+        return self.address + self.stride * (self.count - 1)
+
+    def element(self, index):
+        """Get element of the array by index.
+
+        Raises:
+            KeyError: An error occured if element does not exists.
+        """
+        if not isinstance(index, int) or not (-self.count <= index < self.count):
+            raise KeyError("There is no element with an index '%s' in '%s' register array!" % (index, self.name))
+        return RegisterArrayElement(self, index % self.count)
+
+    def elements(self):
+        """Elements iterator."""
+        return (RegisterArrayElement(self, index) for index in range(self.count))
+
+    def _validate(self):
+        """Last checks of the register array before use."""
+        if self.complementary:
+            raise ValueError("Register array %s is broken. "
+                             "Complementary mode is not supported for register arrays!" % self.name)
+        super()._validate()
+
+
+class RegisterArrayElement(Register):
+    """Read-only element of a :class:`RegisterArray`.
+
+    Elements are created on demand, so two elements with the same index are different objects.
+    Bit fields are shared with the array, so a bit field changed via any element is changed for all of them.
+    """
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, array, index):
+        self._array = array
+        self._index = index
+        self._cache = None
+
+    def __repr__(self):
+        return 'RegisterArrayElement(%s, %s, %s)' % (repr(self.name), repr(self.description), repr(self.address))
+
+    def __reduce__(self):
+        # register is pickled as a copy, since it exists only in the context of its array
+        clone = self.clone()
+        return (object.__new__, (clone.__class__,), clone.__getstate__())
+
+    @property
+    def array(self):
+        """Register array of the element."""
+        return self._array
+
+    @property
+    def index(self):
+        """Index of the element in the register array."""
+        return self._index
+
+    _parent = None
+    _description = _array_attr('_description')
+    _access_strobes = _array_attr('_access_strobes')
+    _complementary = _array_attr('_complementary')
+    _write_lock = _array_attr('_write_lock')
+    _bfields = _array_attr('_bfields')
+    _bfields_by_name = _array_attr('_bfields_by_name')
+    _msbs = _array_attr('_msbs')
+    _mask = _array_attr('_mask')
+    # element is not notified when the array is changed, so nothing is cached in it
+    initial = _array_attr('initial')
+    access = _array_attr('access')
+    _bfields_state = _array_attr('_bfields_state')
+    codec = property(RegisterCodec)
+    _digest = property(Register._compute_digest)
+
+    @property
+    def _name(self):
+        return '%s%d' % (self._array.name, self._index)
+
+    @property
+    def _address(self):
+        return self._array.address + self._index * self._array.stride
+
+
+def _submap_reg_attr(name):
+    """Read-only property to get an attribute of the register of a submap."""
+    return property(lambda self: getattr(self._reg, name))
+
+
+class Submap():
+    """Register map placed into another register map at a base offset.
+
+    Submap is created with :meth:`RegisterMap.add_submap` and occupies the address range from the base
+    to the base plus size. If size is not set, the range grows with the registers of the submap.
+    Registers of the submap are seen from the parent map as read-only :class:`SubmapRegister` objects
+    with the name prefix and the base offset applied, which are created on demand.
+
+    The same register map can be placed into several parent maps or several times into the same map.
+    """
+    def __init__(self, parent, name, rmap, base, size=None, prefix=None):
+        self._parent = parent
+        self._name = name
+        self._rmap = rmap
+        self._base = base
+        self._size = size
+        self._prefix = name + '_' if prefix is None else prefix
+
+    def __repr__(self):
+        return 'Submap(%s, %s, %s)' % (repr(self.name), repr(self.base), repr(self._size))
+
+    def __len__(self):
+        """Number of registers of the submap."""
+        return len(self._rmap)
+
+    def __iter__(self):
+        """Registers iterator with the name prefix and the base offset applied."""
+        return (SubmapRegister(self, reg) for reg in self._rmap)
+
+    @property
+    def name(self):
+        """Name of the submap."""
+        return self._name
+
+    @property
+    def rmap(self):
+        """Register map placed."""
+        return self._rmap
+
+    @property
+    def parent(self):
+        """Register map, which contains the submap."""
+        return self._parent
+
+    @property
+    def base(self):
+        """Base address of the submap."""
+        return self._base
+
+    @property
+    def prefix(self):
+        """Prefix to be added to names of the registers of the submap."""
+        return self._prefix
+
+    @property
+    def size(self):
+        """Size of the address range in bytes."""
+        if self._size is not None:
+            return self._size
+        return self._rmap._addr_extent()
+
+    @property
+    def end(self):
+        """Address next to the last one of the address range."""
+        return self._base + self.size
+
+    @property
+    def last_address(self):
+        """The highest address of the registers of the submap."""
+        last_addr = self._rmap._last_addr()
+        return None if last_addr is None else self._base + last_addr
+
+
+class SubmapRegister(Register):
+    """Read-only register of a :class:`Submap` as it is seen from the parent map.
+
+    Registers are created on demand, so two registers for the same register of a submap are different objects.
+    Bit fields are shared with the register of the submap.
+    """
+    __slots__ = ('_submap', '_reg')
+
+    def __init__(self, submap, reg):
+        self._submap = submap
+        self._reg = reg
+        self._cache = None
+
+    def __repr__(self):
+        return 'SubmapRegister(%s, %s, %s)' % (repr(self.name), repr(self.description), repr(self.address))
+
+    def __reduce__(self):
+        # register is pickled as a copy, since it exists only in the context of its submap
+        clone = self.clone()
+        return (object.__new__, (clone.__class__,), clone.__getstate__())
+
+    @property
+    def submap(self):
+        """Submap of the register."""
+        return self._submap
+
+    @property
+    def reg(self):
+        """Register of the submap's register map."""
+        return self._reg
+
+    _parent = None
+    _description = _submap_reg_attr('_description')
+    _access_strobes = _submap_reg_attr('_access_strobes')
+    _complementary = _submap_reg_attr('_complementary')
+    _write_lock = _submap_reg_attr('_write_lock')
+    _bfields = _submap_reg_attr('_bfields')
+    _bfields_by_name = _submap_reg_attr('_bfields_by_name')
+    _msbs = _submap_reg_attr('_msbs')
+    _mask = _submap_reg_attr('_mask')
+    # register is not notified when the register of the submap is changed, so nothing is cached in it
+    initial = _submap_reg_attr('initial')
+    access = _submap_reg_attr('access')
+    _bfields_state = _submap_reg_attr('_bfields_state')
+    codec = property(RegisterCodec)
+    _digest = property(Register._compute_digest)
+
+    @property
+    def _name(self):
+        return self._submap.prefix + self._reg.name
+
+    @property
+    def _address(self):
+        return self._submap.base + self._reg.address
+
+
 class RegisterMap():
     """CSR map.
 
@@ -543,7 +1198,200 @@ class RegisterMap():
         self.config = config
         self.name = self.config['name'].value
         self.version = self.config['version'].value
+        self._pending = None
+        self._pending_last_addr = None
+        self._validated = False
+        self._fp_sum = 0
+        self._fp_stale = []
+        self._index = None
+        self._index_keys = {}
+        self._index_stale = []
+        self._blocks = []
+        self._block_bases = []
+        self._blocks_by_name = {}
+        self._blocks_by_prefix = {}
+        self._block_prefixes = []
+        self._stale_blocks = []
+        self._placements = []
+        self._init_storage()
+
+    def _invalidate(self):
+        """Mark the map as not validated and notify all the maps, which contain it as a submap."""
+        self._validated = False
+        for placement in self._placements:
+            placement.parent._submap_changed(placement)
+
+    def _submap_changed(self, block):
+        """Called when the register map of the submap is changed."""
+        if block in self._stale_blocks:
+            # maps above have been already notified
+            return
+        self._stale_blocks.append(block)
+        for placement in self._placements:
+            placement.parent._submap_changed(placement)
+
+    def _changed(self, reg=None):
+        """Called when the map or the specified register of the map is changed."""
+        self._invalidate()
+        if reg is None:
+            # fingerprint and indexes will be computed from scratch
+            self._fp_sum = None
+            self._index = None
+            return
+        if self._index is not None:
+            self._index_stale.append(reg)
+        if self._fp_sum is not None and reg._fp_part is not None:
+            # exclude the register from fingerprint until it is computed again
+            self._fp_sum -= reg._fp_part
+            reg._fp_part = None
+            self._fp_stale.append(reg)
+
+    def fingerprint(self):
+        """Returns hexadecimal digest of the register map content and its configuration.
+
+        Digest depends only on the content, but not on the input file format or formatting.
+        It is updated incrementally: only registers changed since the previous call are processed.
+        Submaps are represented by their own digests.
+
+        Examples:
+
+            >>> rmap1 = RegisterMap(Configuration())
+            >>> rmap1.add_regs([Register('reg_a', address='0x0'), Register('reg_b', address=4)])
+            >>> rmap2 = RegisterMap(Configuration())
+            >>> rmap2.add_regs([Register('reg_b', address=4), Register('reg_a', address=0)])
+            >>> rmap1.fingerprint() == rmap2.fingerprint()
+            True
+        """
+        if self._fp_sum is None:
+            self._fp_sum = 0
+            for reg in self._regs:
+                reg._fp_part = reg._digest
+                self._fp_sum += reg._fp_part
+        else:
+            for reg in self._fp_stale:
+                if reg._parent is self and reg._fp_part is None:
+                    reg._fp_part = reg._digest
+                    self._fp_sum += reg._fp_part
+        self._fp_stale = []
+        data = '%s:%d:%x' % (self.config.fingerprint(), len(self), self._fp_sum)
+        for block in self._blocks:
+            data += ':%s:%s:%x:%s:%s' % (block.name, block.prefix, block.base, block._size, block.rmap.fingerprint())
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _init_storage(self):
+        """Create empty containers for registers."""
         self._regs = []
+        self._regs_by_name = {}
+        self._addrs = []
+        self._arrays = []
+
+    def __getstate__(self):
+        # registers are stored in a compact form and indexes are restored after loading;
+        # submaps are stored without links to the maps they are placed to
+        return {
+            'config': self.config,
+            'name': self.name,
+            'version': self.version,
+            'storage': self._storage_state(),
+            'submaps': [(block.name, block.rmap, block.base, block._size, block.prefix) for block in self._blocks],
+            'validated': self._validated and not self._stale_blocks,
+        }
+
+    def __setstate__(self, state):
+        RegisterMap.__init__(self, state['config'])
+        self.name = state['name']
+        self.version = state['version']
+        self._restore_storage(state['storage'])
+        for name, rmap, base, size, prefix in state['submaps']:
+            block = Submap(self, name, rmap, base, size, prefix)
+            self._insert_block(block)
+            rmap._placements.append(block)
+        self._validated = state['validated']
+        if not self._validated:
+            self._stale_blocks = list(self._blocks)
+        self._fp_sum = None
+
+    def _storage_state(self):
+        """Data of the registers to be pickled."""
+        return self._regs
+
+    def _restore_storage(self, regs):
+        """Restore containers of the registers from the pickled data."""
+        self._attach_regs(regs, regs)
+
+    def _clone_storage(self, rmap):
+        """Fill containers of the empty register map with copies of the registers without any checks."""
+        regs = [reg.clone() for reg in self._regs]
+        clones = {}
+        for old_reg, reg in zip(self._regs, regs):
+            reg._parent = rmap
+            clones[id(old_reg)] = reg
+        rmap._regs = regs
+        rmap._addrs = list(self._addrs)
+        rmap._regs_by_name = {name: clones[id(reg)] for name, reg in self._regs_by_name.items()}
+        rmap._arrays = [clones[id(arr)] for arr in self._arrays]
+
+    def _addr_checks_params(self):
+        """Values of the configuration, which the checks of registers on add depend on."""
+        return (self.config['data_width'].value, self._addr_alignment())
+
+    def clone(self, config=None):
+        """Returns a copy of the register map to build a variant of it.
+
+        Registers and bit fields are copied, but definitions of bit fields and values computed for registers
+        are shared with the copy until any of them is changed, and the copy is not checked again
+        if the configuration does not affect the checks. So a lot of variants can be created from
+        a single map read from a file at a small cost. Changes of the copy do not affect the original map
+        and vice versa. Submaps are copied as well.
+
+        Addresses and strides of registers are already resolved in the original map, so they are not
+        recalculated for the configuration of the copy.
+
+        Args:
+            config : configuration of the copy; a copy of the map configuration is used if not set
+
+        Returns:
+            Register map of the same class.
+
+        Raises:
+            ValueError: An error occured if any register fails the checks with the configuration of the copy.
+
+        Examples:
+
+            >>> rmap = RegisterMap(Configuration())
+            >>> rmap.add_regs(Register('reg_a', address=0))
+            >>> rmap['reg_a'].add_bfields(BitField('en', 'Enable'))
+            >>> config = rmap.config.clone()
+            >>> config['lb_bridge']['type'].value = 'apb'
+            >>> variant = rmap.clone(config)
+            >>> variant['reg_a']['en'].description = 'Enable A'
+            >>> rmap['reg_a']['en'].description, variant['reg_a']['en'].description
+            ('Enable', 'Enable A')
+            >>> variant.config['lb_bridge']['type'].value
+            'apb'
+        """
+        return self._clone(config, {})
+
+    def _clone(self, config, clones):
+        """Copy the register map and all its submaps, which are not in the dictionary of copies by ids yet."""
+        if config is None:
+            config = self.config.clone()
+        rmap = self.__class__(config)
+        clones[id(self)] = rmap
+        if self._addr_checks_params() == rmap._addr_checks_params():
+            self._clone_storage(rmap)
+            rmap._validated = self._validated
+        else:
+            with rmap.bulk():
+                rmap.add_regs([reg.clone() for reg in self._regs])
+        rmap._fp_sum = None
+        for block in self._blocks:
+            # submap placed several times is copied once
+            block_rmap = clones.get(id(block.rmap))
+            if block_rmap is None:
+                block_rmap = block.rmap._clone(None, clones)
+            rmap.add_submap(block.name, block_rmap, block.base, block._size, block.prefix)
+        return rmap
 
     def __eq__(self, other):
         if self.__class__ != other.__class__:
@@ -571,31 +1419,59 @@ class RegisterMap():
         return indent + '%s: v%s\n' % (self.config['name'].value, self.config['version'].value) + regs_str
 
     def as_dict(self):
-        """Returns register map as a dictionary."""
-        return {reg.name: reg.as_dict() for reg in self.regs}
+        """Returns register map as a dictionary. Register arrays are not expanded, submaps are flattened."""
+        regs = self._regs
+        if self._blocks:
+            regs = heapq.merge(regs, *self._blocks, key=lambda reg: reg.address)
+        return {reg.name: reg.as_dict() for reg in regs}
 
     def __len__(self):
-        """Number of registers."""
-        return len(self._regs)
+        """Number of registers. Every element of a register array and every register of a submap is counted."""
+        return len(self._regs) + sum(arr.count - 1 for arr in self._arrays) + sum(len(block) for block in self._blocks)
 
     def __iter__(self):
-        """Registers iterator."""
-        return iter(self._regs)
+        """Registers iterator. Elements of register arrays and registers of submaps are created on demand."""
+        if not self._arrays and not self._blocks:
+            return iter(self._regs)
+        regs = (reg for reg in self._regs if not isinstance(reg, RegisterArray))
+        return heapq.merge(regs, *[arr.elements() for arr in self._arrays], *self._blocks,
+                           key=lambda reg: reg.address)
 
     def __getitem__(self, key):
-        """Get register by name or index.
+        """Get register by name or index. Register array can be also accessed by its name.
 
         Raises:
             KeyError: An error occured if register does not exists.
         """
         try:
             if isinstance(key, str):
-                return next(reg for reg in self if reg.name == key)
+                reg = self._get_reg(key)
+                if reg is None:
+                    raise KeyError(key)
+                return reg
+            elif self._arrays or self._blocks:
+                return list(self)[key]
             else:
                 return self._regs[key]
-        except (StopIteration, TypeError, KeyError, IndexError):
+        except (TypeError, KeyError, IndexError):
             raise KeyError("There is no register with a name/index '%s'!" % (key))
 
+    def _get_reg(self, name):
+        """Get register, register array, its element or register of a submap by name or None if there is no such."""
+        try:
+            return self._regs_by_name[name]
+        except KeyError:
+            pass
+        element = self._array_element(self._regs_by_name, name)
+        if element is not None:
+            return element
+        block = self._block_by_prefix(name)
+        if block is not None:
+            reg = block.rmap._get_reg(name[len(block.prefix):])
+            if reg is not None:
+                return SubmapRegister(block, reg)
+        return None
+
     def __setitem__(self, key, value):
         """Set register by key"""
         raise KeyError("Not able to set '%s' register directly!"
@@ -609,7 +1485,8 @@ class RegisterMap():
     def _addr_apply(self, reg):
         """Apply auto-calculated address for a register with no address."""
         # some error checks
-        if len(self) == 0:
+        prev_addr = self._last_addr()
+        if prev_addr is None:
             raise ValueError("Register '%s' with no address is not allowed"
                              " to be the first register in a map!" % (reg.name))
         if self.config['regmap']['address_increment_mode'].value == 'none':
@@ -619,8 +1496,6 @@ class RegisterMap():
             raise ValueError("Register '%s' with no address is not allowed"
                              " when complmentary attribute is active!" % (reg.name))
 
-        prev_addr = self.regs[-1].address
-
         if self.config['regmap']['address_increment_mode'].value == 'data_width':
             addr_step = self.config['data_width'].value // 8
         else:
@@ -628,25 +1503,37 @@ class RegisterMap():
 
         reg.address = prev_addr + addr_step
 
-    def _addr_check_alignment(self, reg):
-        """Check address alignment."""
+    def _addr_alignment(self):
+        """Address alignment in bytes."""
         if self.config['regmap']['address_alignment_mode'].value == 'data_width':
-            align_val = self.config['data_width'].value // 8
+            return self.config['data_width'].value // 8
         elif self.config['regmap']['address_alignment_mode'].value == 'custom':
-            align_val = self.config['regmap']['address_alignment_value'].value
+            return self.config['regmap']['address_alignment_value'].value
         else:
-            align_val = 1
+            return 1
 
+    def _addr_check_alignment(self, reg):
+        """Check address alignment."""
+        align_val = self._addr_alignment()
         if (reg.address % align_val) != 0:
             raise ValueError("Register '%s' with address '%d' is not %d bytes alligned!" %
                              (reg.name, reg.address, align_val))
+        if isinstance(reg, RegisterArray) and (reg.stride % align_val) != 0:
+            raise ValueError("Register array '%s' with stride '%d' is not %d bytes alligned!" %
+                             (reg.name, reg.stride, align_val))
+
+    def _addr_check_conflicts(self, reg, same_addr_regs):
+        """Check address conflicts with other registers located at the same address.
 
-    def _addr_check_conflicts(self, reg):
-        addresses = [reg.address for reg in self]
-        if reg.address in addresses:
-            conflict_reg = self[addresses.index(reg.address)]
+        Register arrays are skipped, they are checked by :meth:`_addr_check_array_conflicts`.
+        """
+        if isinstance(reg, RegisterArray):
+            return
+        same_addr_regs = [r for r in same_addr_regs if r is not reg and not isinstance(r, RegisterArray)]
+        if same_addr_regs:
+            conflict_reg = same_addr_regs[0]
             if conflict_reg.complementary and reg.complementary:
-                if addresses.count(reg.address) > 1:
+                if len(same_addr_regs) > 1:
                     raise ValueError("Complementary register '%s' with address '%d'"
                                      " conflicts with other complementary pair with the same address!" %
                                      (reg.name, reg.address))
@@ -655,53 +1542,743 @@ class RegisterMap():
                                  " conflicts with register '%s' with the same address!" %
                                  (reg.name, reg.address, conflict_reg.name))
 
+    def _addr_check_array_conflicts(self, reg, regs, addrs, arrays):
+        """Check address conflicts of the register or register array with register arrays
+        and conflicts of the register array with single registers in its address range.
+
+        Args:
+            reg : register or register array to be checked
+            regs : registers to be checked against in ascending order of addresses
+            addrs : addresses of the registers to be checked against
+            arrays : register arrays to be checked against
+        """
+        start, stride, count = _addr_progression(reg)
+        for arr in arrays:
+            if arr is reg:
+                continue
+            addr = _progressions_intersection(start, stride, count, *_addr_progression(arr))
+            if addr is not None:
+                raise ValueError("Register '%s' with address '%d'"
+                                 " conflicts with register '%s' with the same address!" %
+                                 (reg.name, addr, '%s%d' % (arr.name, (addr - arr.address) // arr.stride)))
+        if isinstance(reg, RegisterArray):
+            for other in regs[bisect_left(addrs, start):bisect_right(addrs, reg.last_address)]:
+                if other is not reg and not isinstance(other, RegisterArray) and (other.address - start) % stride == 0:
+                    raise ValueError("Register '%s' with address '%d'"
+                                     " conflicts with register '%s' with the same address!" %
+                                     ('%s%d' % (reg.name, (other.address - start) // stride), other.address,
+                                      other.name))
+
+    def _array_element(self, regs_by_name, name):
+        """Get element of a register array by the element name or None if there is no such element.
+
+        Args:
+            regs_by_name : register arrays (and any other registers, which are ignored) by names
+            name : name of the element
+        """
+        match = _ARRAY_ELEMENT_NAME.match(name)
+        if match:
+            arr = regs_by_name.get(match.group(1))
+            if isinstance(arr, RegisterArray) and int(match.group(2)) < arr.count:
+                return arr.element(int(match.group(2)))
+        return None
+
+    def _check_elements_names(self, reg, name, names, regs_by_name):
+        """Check that the name of a register does not conflict with names of register array elements
+        or names of the register array elements do not conflict with names of the registers.
+
+        Args:
+            reg : register or register array to be checked
+            name : name of the register to be checked
+            names : names of all the registers
+            regs_by_name : register arrays (and any other registers, which are ignored) by names
+        """
+        if isinstance(reg, RegisterArray):
+            if name[-1].isdigit():
+                raise ValueError("Name of register array '%s' should not end with a digit!" % (name))
+            for idx in range(reg.count):
+                if '%s%d' % (name, idx) in names:
+                    raise ValueError("Register with name '%s' is already present!" % ('%s%d' % (name, idx)))
+        elif self._array_element(regs_by_name, name) is not None:
+            raise ValueError("Register with name '%s' is already present!" % (name))
+
+    def _addr_check_submaps_conflicts(self, reg):
+        """Check address conflicts of the register or register array with address ranges of submaps."""
+        if not self._blocks:
+            return
+        start, stride, count = _addr_progression(reg)
+        last = start + stride * (count - 1)
+        # submaps do not overlap, so only the one starting before the register can contain its first address
+        for block in self._blocks[max(bisect_right(self._block_bases, start) - 1, 0):]:
+            if block.base > last:
+                break
+            addr = _progressions_intersection(start, stride, count, block.base, 1, block.size)
+            if addr is not None:
+                name = '%s%d' % (reg.name, (addr - start) // stride) if isinstance(reg, RegisterArray) else reg.name
+                raise ValueError("Register '%s' with address '%d' conflicts with submap '%s'!" %
+                                 (name, addr, block.name))
+
+    def _check_submaps_names(self, name):
+        """Check that the name of a register does not conflict with names of registers of submaps."""
+        block = self._block_by_prefix(name)
+        if block is not None and block.rmap._get_reg(name[len(block.prefix):]) is not None:
+            raise ValueError("Register with name '%s' is already present!" % (name))
+
+    def _block_by_prefix(self, name):
+        """Get the submap with the prefix the name starts with or None.
+
+        Prefixes of submaps do not start with each other, so there is a single submap at most.
+        """
+        if not self._blocks:
+            return None
+        for end in range(len(name) + 1):
+            block = self._blocks_by_prefix.get(name[:end])
+            if block is not None:
+                return block
+        return None
+
+    def _insert_block(self, block):
+        """Insert the submap into the list sorted by base addresses and into the indexes."""
+        idx = bisect_right(self._block_bases, block.base)
+        self._block_bases.insert(idx, block.base)
+        self._blocks.insert(idx, block)
+        self._blocks_by_name[block.name] = block
+        self._blocks_by_prefix[block.prefix] = block
+        insort(self._block_prefixes, block.prefix)
+
+    def _check_submap(self, block):
+        """Check the submap against the registers and the other submaps of the map.
+
+        Only the address range of the submap is checked, so the time does not depend on the size of the submap.
+        """
+        data_width = self.config['data_width'].value
+        if block.rmap.config['data_width'].value > data_width:
+            raise ValueError("Submap '%s' with data width %d exceeds interface data width %d!" %
+                             (block.name, block.rmap.config['data_width'].value, data_width))
+        if block._size is not None and block.rmap._addr_extent() > block._size:
+            raise ValueError("Registers of submap '%s' do not fit its size '%d'!" % (block.name, block._size))
+        lo, hi = block.base, block.end
+        if lo < hi:
+            idx = bisect_left(self._addrs, lo)
+            if idx < len(self._addrs) and self._addrs[idx] < hi:
+                raise ValueError("Submap '%s' with address range [0x%x, 0x%x) conflicts with register '%s'!" %
+                                 (block.name, lo, hi, self._regs[idx].name))
+            for arr in self._arrays:
+                addr = _progressions_intersection(lo, 1, hi - lo, *_addr_progression(arr))
+                if addr is not None:
+                    raise ValueError("Submap '%s' with address range [0x%x, 0x%x) conflicts with register '%s'!" %
+                                     (block.name, lo, hi, '%s%d' % (arr.name, (addr - arr.address) // arr.stride)))
+            # submaps are sorted by base addresses, so only the neighbours are checked
+            for other in self._blocks[max(bisect_left(self._block_bases, lo) - 1, 0):]:
+                if other.base >= hi:
+                    break
+                if other is not block and other.base < other.end and lo < other.end:
+                    raise ValueError("Submap '%s' with address range [0x%x, 0x%x) conflicts with submap '%s'!" %
+                                     (block.name, lo, hi, other.name))
+        for name in self._regs_by_name:
+            if name.startswith(block.prefix) and block.rmap._get_reg(name[len(block.prefix):]) is not None:
+                raise ValueError("Register with name '%s' is already present!" % (name))
+
+    def add_submap(self, name, rmap, base, size=None, prefix=None):
+        """Place register map into the map at the base address.
+
+        Address range of the submap is checked against the registers and the other submaps of the map
+        as a whole. Registers of the submap are not copied, so any change of the submap is seen by the map,
+        and only the changed submaps are checked again during validation.
+
+        Args:
+            name : name of the submap
+            rmap : register map to be placed
+            base : base address of the submap
+            size : size of the address range in bytes; if not set, the range grows with the registers of the submap
+            prefix : prefix to be added to names of the registers of the submap; name with '_' is used if not set
+
+        Returns:
+            :class:`Submap` object created.
+
+        Examples:
+
+            >>> uart = RegisterMap(Configuration())
+            >>> uart.add_regs([Register('ctrl', address=0), Register('stat', address=4)])
+            >>> top = RegisterMap(Configuration())
+            >>> top.add_regs(Register('id', address=0))
+            >>> uart0 = top.add_submap('uart0', uart, base=0x100)
+            >>> uart1 = top.add_submap('uart1', uart, base=0x200)
+            >>> top.names
+            ['id', 'uart0_ctrl', 'uart0_stat', 'uart1_ctrl', 'uart1_stat']
+            >>> hex(top['uart1_stat'].address)
+            '0x204'
+
+        Raises:
+            ValueError: An error occured if the submap can not be placed.
+        """
+        base = utils.try_hex_to_dec(base)
+        size = utils.try_hex_to_dec(size)
+        if not isinstance(rmap, RegisterMap):
+            raise ValueError("Submap '%s' should be a register map!" % (name))
+        if not name or name in self._blocks_by_name:
+            raise ValueError("Submap with name '%s' is already present or name is empty!" % (name))
+        if rmap is self or self._is_submap_of(rmap):
+            raise ValueError("Submap '%s' contains the map itself!" % (name))
+        utils.is_non_neg_int(base, "Base address '%s' of submap '%s' is wrong!"
+                             " Only non-negative integers are allowed." % (base, name))
+        if size is not None:
+            utils.is_non_neg_int(size, "Size '%s' of submap '%s' is wrong!"
+                                 " Only non-negative integers are allowed." % (size, name))
+        if base % self._addr_alignment():
+            raise ValueError("Submap '%s' with base address '%d' is not %d bytes alligned!" %
+                             (name, base, self._addr_alignment()))
+        block = Submap(self, name, rmap, base, size, prefix)
+        # prefix of another submap can start with the prefix, or the prefix can start with another one
+        other = self._block_by_prefix(block.prefix)
+        idx = bisect_left(self._block_prefixes, block.prefix)
+        if other is None and idx < len(self._block_prefixes) and self._block_prefixes[idx].startswith(block.prefix):
+            other = self._blocks_by_prefix[self._block_prefixes[idx]]
+        if other is not None:
+            raise ValueError("Prefix '%s' of submap '%s' conflicts with prefix '%s' of submap '%s'!" %
+                             (block.prefix, name, other.prefix, other.name))
+        self._check_submap(block)
+        self._insert_block(block)
+        rmap._placements.append(block)
+        self._submap_changed(block)
+        return block
+
+    def _is_submap_of(self, rmap):
+        """Check if the map is placed into the register map at any level of hierarchy."""
+        return any(placement.parent is rmap or placement.parent._is_submap_of(rmap)
+                   for placement in self._placements)
+
+    @property
+    def submaps(self):
+        """Returns list with submap objects in ascending order of base addresses."""
+        return self._blocks
+
     @property
     def regs(self):
-        """Returns list with register objects."""
-        return self._regs
+        """Returns list with register objects. Register arrays are expanded and submaps are flattened."""
+        return list(self) if self._arrays or self._blocks else self._regs
+
+    @property
+    def arrays(self):
+        """Returns list with register array objects."""
+        return self._arrays
+
+    @staticmethod
+    def _index_keys_of(reg):
+        """Categories of the register: flags set, access modes and modifiers of its bit fields."""
+        keys = {key for attr, key in _REG_FLAGS_KEYS if getattr(reg, attr)}
+        for bf in reg._bfields:
+            spec = (bf._access, bf._modifiers)
+            try:
+                keys.update(_BF_KEYS[spec])
+            except KeyError:
+                _BF_KEYS[spec] = (('access', spec[0]),) + tuple(('modifier', modifier) for modifier in spec[1])
+                keys.update(_BF_KEYS[spec])
+        return keys
+
+    def _index_update(self):
+        """Update indexes of registers by categories with the registers changed since the previous update."""
+        # changed registers are collected only after indexes are built
+        if self._index is None:
+            self._index = {}
+            self._index_keys = {}
+            regs = self._regs
+            stale = False
+        else:
+            regs = self._index_stale
+            stale = True
+        self._index_stale = []
+        index, index_keys, keys_of = self._index, self._index_keys, self._index_keys_of
+        for reg in regs:
+            reg_id = id(reg)
+            if stale:
+                for key in index_keys.pop(reg_id, ()):
+                    del index[key][reg_id]
+                if reg._parent is not self:
+                    continue
+            keys = index_keys[reg_id] = keys_of(reg)
+            for key in keys:
+                try:
+                    index[key][reg_id] = reg
+                except KeyError:
+                    index[key] = {reg_id: reg}
+
+    def _select(self, key):
+        """Get registers of the category with elements of register arrays and registers of submaps."""
+        self._index_update()
+        regs = sorted(self._index.get(key, {}).values(), key=lambda reg: reg.address)
+        if not self._arrays and not self._blocks:
+            return regs
+        elements = [reg.elements() for reg in regs if isinstance(reg, RegisterArray)]
+        regs = [reg for reg in regs if not isinstance(reg, RegisterArray)]
+        for block in self._blocks:
+            elements.append([SubmapRegister(block, reg) for reg in block.rmap._select(key)])
+        return list(heapq.merge(regs, *elements, key=lambda reg: reg.address))
+
+    def regs_with(self, flag):
+        """Returns list with registers, which have the flag set, in ascending order of addresses.
+
+        Registers are indexed by flags, access modes and modifiers of bit fields, and indexes are updated only for
+        the registers added or changed since the previous query, so templates do not need to walk the whole map.
+
+        Args:
+            flag : 'access_strobes', 'write_lock' or 'complementary'
+
+        Examples:
+
+            >>> rmap = RegisterMap(Configuration())
+            >>> rmap.add_regs([Register('reg_a', address=0), Register('reg_b', address=4, write_lock=True)])
+            >>> [reg.name for reg in rmap.regs_with('write_lock')]
+            ['reg_b']
+        """
+        if flag not in _REG_FLAGS:
+            raise ValueError("Unknown register flag '%s'!" % (flag))
+        return self._select(('flag', flag))
+
+    def bfields_with(self, modifier=None, access=None):
+        """Returns list with (register, bit field) pairs for bit fields with the modifier and the access mode.
+
+        Pairs are in ascending order of addresses of registers, see :meth:`regs_with`.
+
+        Args:
+            modifier : modifier of the bit fields
+            access : access mode of the bit fields
+
+        Examples:
+
+            >>> rmap = RegisterMap(Configuration())
+            >>> rmap.add_regs([Register('reg_a', address=0), Register('reg_b', address=4)])
+            >>> rmap['reg_b'].add_bfields([BitField('data', lsb=0, width=8, access='wo', modifiers=['fifo']),
+            ...                            BitField('full', lsb=8, access='ro')])
+            >>> [(reg.name, bf.name) for reg, bf in rmap.bfields_with(modifier='fifo')]
+            [('reg_b', 'data')]
+        """
+        if modifier is None and access is None:
+            raise ValueError("Modifier or access mode of bit fields should be specified!")
+        key = ('access', access) if modifier is None else ('modifier', modifier)
+        return [(reg, bf) for reg in self._select(key) for bf in reg
+                if (modifier is None or modifier in bf.modifiers) and (access is None or bf.access == access)]
+
+    def at(self, address):
+        """Returns list with registers located at the address.
+
+        Usually there is only one register, but complementary registers share the address.
+        Registers are found via the sorted address index, so the time grows as O(log n).
+
+        Examples:
+
+            >>> rmap = RegisterMap(Configuration())
+            >>> rmap.add_regs([Register('reg_a', address=0x0), Register('reg_b', address=0x1f4)])
+            >>> rmap.at(0x1f4)
+            [Register('reg_b', '', 500)]
+            >>> rmap.at(0x1f0)
+            []
+        """
+        address = utils.try_hex_to_dec(address)
+        return self.in_range(address, address + 1)
+
+    def in_range(self, lo, hi):
+        """Returns list with registers, which addresses are in the range from lo (inclusive) to hi (exclusive).
+
+        Registers are returned in ascending order of addresses. Elements of register arrays and registers
+        of submaps are created only for the range, so the time grows as O(log n + k),
+        where k is the number of registers found.
+
+        Examples:
+
+            >>> rmap = RegisterMap(Configuration())
+            >>> rmap.add_regs([Register('reg_%d' % i, address=i * 4) for i in range(8)])
+            >>> [reg.name for reg in rmap.in_range(0x8, 0x10)]
+            ['reg_2', 'reg_3']
+        """
+        lo, hi = utils.try_hex_to_dec(lo), utils.try_hex_to_dec(hi)
+        regs = [reg for reg in self._regs[bisect_left(self._addrs, lo):bisect_left(self._addrs, hi)]
+                if not isinstance(reg, RegisterArray)]
+        if not self._arrays and not self._blocks:
+            return regs
+        elements = []
+        for arr in self._arrays:
+            first = max(0, -((arr.address - lo) // arr.stride))
+            last = min(arr.count - 1, (hi - 1 - arr.address) // arr.stride)
+            elements.append(map(arr.element, range(first, last + 1)))
+        for block in self._blocks[max(bisect_right(self._block_bases, lo) - 1, 0):]:
+            if block.base >= hi:
+                break
+            block_regs = block.rmap.in_range(lo - block.base, hi - block.base)
+            elements.append([SubmapRegister(block, reg) for reg in block_regs])
+        return list(heapq.merge(regs, *elements, key=lambda reg: reg.address))
+
+    def gaps(self, min_size=1, align=1, lo=0, hi=None):
+        """Returns list with free address ranges of at least the specified size.
+
+        Every register occupies data width in bytes and every submap occupies its whole address range.
+        Start of every range is aligned, and the range is reported only if it is still large enough.
+        The time grows as O(log n + m), where m is the number of registers in the window from lo to hi.
+
+        Args:
+            min_size : minimal size of a range in bytes
+            align : alignment of the start of a range in bytes
+            lo : the lowest address of the window to search in
+            hi : address next to the highest one of the window; the end of the address space is used if not set
+
+        Returns:
+            List with (start, end) tuples in ascending order, where end is the address next to the last free one.
+
+        Examples:
+
+            >>> rmap = RegisterMap(Configuration())
+            >>> rmap.add_regs([Register('reg_a', address=0x0), Register('reg_b', address=0x44)])
+            >>> [(hex(start), hex(end)) for start, end in rmap.gaps(min_size=0x10, align=0x10, hi=0x100)]
+            [('0x10', '0x44'), ('0x50', '0x100')]
+        """
+        if hi is None:
+            hi = 2**self.config['address_width'].value
+        step = self.config['data_width'].value // 8
+        # the lowest address of a register, which occupies any address of the window
+        reg_lo = lo - step + 1
+        # ranges occupied by single registers, register arrays and submaps in ascending order of start addresses
+        occupied = [((reg.address, reg.address + step)
+                     for reg in self._regs[bisect_left(self._addrs, reg_lo):bisect_left(self._addrs, hi)]
+                     if not isinstance(reg, RegisterArray))]
+        for arr in self._arrays:
+            first = max(0, -((arr.address - reg_lo) // arr.stride))
+            last = min(arr.count - 1, (hi - 1 - arr.address) // arr.stride)
+            if first > last:
+                continue
+            if arr.stride - step < min_size:
+                # spaces between elements are too small, so the array is occupied as a whole
+                occupied.append([(arr.address + first * arr.stride, arr.address + last * arr.stride + step)])
+            else:
+                occupied.append([(arr.address + idx * arr.stride, arr.address + idx * arr.stride + step)
+                                 for idx in range(first, last + 1)])
+        occupied.append((block.base, block.end) for block in self._blocks
+                        if block.base < hi and block.end > lo and block.size)
+        gaps = []
+        free_addr = lo
+        for start, end in heapq.merge(*occupied):
+            if start >= hi:
+                break
+            if start > free_addr:
+                self._gap_append(gaps, free_addr, start, min_size, align)
+            free_addr = max(free_addr, end)
+        if free_addr < hi:
+            self._gap_append(gaps, free_addr, hi, min_size, align)
+        return gaps
+
+    def _gap_append(self, gaps, start, end, min_size, align):
+        """Align the start of the free range and add it to the list if it is still large enough."""
+        start = -(-start // align) * align
+        if end - start >= min_size:
+            gaps.append((start, end))
+
+    def _check_data_width(self, reg):
+        """Check bit field conflicts with data width."""
+        data_width = self.config['data_width'].value
+        if reg._mask >> data_width:
+            bf = next(bf for bf in reg if bf.msb >= data_width)
+            raise ValueError("Register '%s' has field '%s' (msb=%d) "
+                             "that exceeds interface data width %d!" %
+                             (reg.name, bf.name, bf.msb, data_width))
+
+    def _stride_apply(self, arr):
+        """Apply data width in bytes as a stride for a register array with no stride."""
+        arr.stride = self.config['data_width'].value // 8
+
+    def _last_addr(self):
+        """The highest address of the registers in the map (including ones pending in bulk mode).
+
+        Address range of a submap is occupied up to its end, so the last data word of the range is used for it.
+        """
+        last_addr = self._addrs[-1] if self._addrs else None
+        for arr in self._arrays:
+            last_addr = max(last_addr, arr.last_address)
+        for block in self._blocks:
+            if block.size:
+                block_last_addr = block.end - self.config['data_width'].value // 8
+                last_addr = block_last_addr if last_addr is None else max(last_addr, block_last_addr)
+        if self._pending:
+            last_addr = self._pending_last_addr if last_addr is None else max(last_addr, self._pending_last_addr)
+        return last_addr
+
+    def _addr_extent(self):
+        """Size of the address range from zero to the end of the last register of the map in bytes."""
+        last_addr = self._last_addr()
+        return 0 if last_addr is None else last_addr + self.config['data_width'].value // 8
 
     def add_regs(self, new_regs):
         """Add register or list of registers.
 
         Register are automatically sorted and stored in the ascending order of addresses.
+
+        Inside :meth:`bulk` context registers are only collected, and all the checks are postponed.
         """
         # hack to handle single elements
         new_regs = utils.listify(new_regs)
 
         # add registers to list one by one
         for reg in new_regs:
+            if self._pending is not None:
+                self._add_pending_reg(reg)
+                continue
             # check existance
-            if reg.name in self.names:
+            if reg.name in self._regs_by_name:
                 raise ValueError("Register with name '%s' is already present!" % (reg.name))
+            self._check_elements_names(reg, reg.name, self._regs_by_name, self._regs_by_name)
+            self._check_submaps_names(reg.name)
             # check bit field conflicts with data width
-            for bf in reg:
-                if bf.msb >= self.config['data_width'].value:
-                    raise ValueError("Register '%s' has field '%s' (msb=%d) "
-                                     "that exceeds interface data width %d!" %
-                                     (reg.name, bf.name, bf.msb, self.config['data_width'].value))
+            self._check_data_width(reg)
             # aplly calculated address if register address is empty
             if reg.address is None:
                 self._addr_apply(reg)
+            if isinstance(reg, RegisterArray) and reg.stride is None:
+                self._stride_apply(reg)
             # check address alignment
             self._addr_check_alignment(reg)
             # check address conflicts
-            self._addr_check_conflicts(reg)
+            self._addr_check_conflicts(reg, self._regs_at(reg.address))
+            self._addr_check_array_conflicts(reg, self._regs, self._addrs, self._arrays)
+            self._addr_check_submaps_conflicts(reg)
             # if we here - all is ok and register can be added
+            self._attach_reg(reg)
+            self._invalidate()
+
+    def _attach_reg(self, reg):
+        """Store checked register in the map."""
+        self._insert_reg(reg)
+        self._regs_by_name[reg.name] = reg
+        if isinstance(reg, RegisterArray):
+            self._arrays.append(reg)
+        reg._parent = self
+        reg._fp_part = None
+        self._fp_stale.append(reg)
+        if self._index is not None:
+            self._index_stale.append(reg)
+
+    @contextmanager
+    def bulk(self, vectorize=False):
+        """Context manager to add a lot of registers at once.
+
+        Registers added inside the context are sorted and validated in a single sweep on exit.
+        All the errors found are reported together and no registers are added in that case.
+
+        With vectorization enabled, attributes of registers and bit fields are packed into NumPy arrays
+        to find the wrong registers in a few array operations, and only such registers are checked one by one.
+        Errors are the same as without vectorization. If NumPy is not installed, the flag is ignored.
+
+        Examples:
+
+            >>> rmap = RegisterMap()
+            >>> with rmap.bulk():
+            ...     rmap.add_regs(Register('reg_b', 'Register B', address=4))
+            ...     rmap.add_regs(Register('reg_a', 'Register A', address=0))
+            >>> rmap.names
+            ['reg_a', 'reg_b']
+
+        Args:
+            vectorize : use vectorized checks
+
+        Raises:
+            ValueError: An error occured if any of the registers added is wrong.
+        """
+        if self._pending is not None:
+            # already in bulk mode
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+            pending = self._pending
+        finally:
+            self._pending = None
+            self._pending_last_addr = None
+        self._add_regs_bulk(pending, vectorize and vectorized.is_available())
+
+    def _add_pending_reg(self, reg):
+        """Collect register to be added on exit from bulk mode."""
+        if reg.address is None:
+            self._addr_apply(reg)
+        last_addr = reg.address
+        if isinstance(reg, RegisterArray):
+            if reg.stride is None:
+                self._stride_apply(reg)
+            last_addr = reg.last_address
+        if self._pending_last_addr is None or last_addr > self._pending_last_addr:
+            self._pending_last_addr = last_addr
+        self._pending.append(reg)
+
+    def _add_regs_bulk(self, new_regs, vectorize=False):
+        """Validate registers in one sweep over the sorted addresses and add them to the map."""
+        errors = []
+        new_regs = sorted(new_regs, key=lambda reg: reg.address)
+        # check existance
+        old_names = set(self._regs_by_name)
+        names = set(old_names)
+        for reg in new_regs:
+            if reg.name in names:
+                errors.append("Register with name '%s' is already present!" % (reg.name))
+            names.add(reg.name)
             try:
-                # find position to insert register and not to break ascending order of addresses
-                reg_idx = next(i for i, r in enumerate(self._regs) if r.address > reg.address)
-                self._regs.insert(reg_idx, reg)
-            except StopIteration:
-                # when registers list is empty or all addresses are less than the current one
-                self._regs.append(reg)
+                self._check_submaps_names(reg.name)
+            except ValueError as e:
+                errors.append(str(e))
+        new_arrays = [reg for reg in new_regs if isinstance(reg, RegisterArray)]
+        arrays = self._arrays + new_arrays
+        if arrays:
+            # new single registers are checked against all the arrays, so new arrays are checked only against
+            # registers already in the map to report every conflict once
+            arrays_by_name = {arr.name: arr for arr in arrays}
+            for reg in new_regs:
+                try:
+                    self._check_elements_names(reg, reg.name, old_names, arrays_by_name)
+                except ValueError as e:
+                    errors.append(str(e))
+        # check bit fields and addresses
+        checked_regs = new_regs
+        if vectorize:
+            # register arrays are always checked one by one
+            suspects = vectorized.find_suspects(self._pack_regs(new_regs), self.config['data_width'].value,
+                                                self._addr_alignment(), self._block_bases,
+                                                [block.end for block in self._blocks])
+            checked_regs = [reg for reg, suspect in zip(new_regs, suspects)
+                            if suspect or isinstance(reg, RegisterArray)]
+        for reg in checked_regs:
+            for check in [self._check_data_width, self._addr_check_alignment, self._addr_check_submaps_conflicts]:
+                try:
+                    check(reg)
+                except ValueError as e:
+                    errors.append(str(e))
+        # check address conflicts
+        regs = list(heapq.merge(self._regs, new_regs, key=lambda reg: reg.address))
+        if vectorize:
+            # only groups of registers with the same address are checked
+            addrs = [reg.address for reg in regs]
+            for addr in vectorized.find_same_addrs(addrs):
+                group_start, group_end = bisect_left(addrs, addr), bisect_right(addrs, addr)
+                for i in range(group_start + 1, group_end):
+                    try:
+                        self._addr_check_conflicts(regs[i], regs[group_start:i])
+                    except ValueError as e:
+                        errors.append(str(e))
+        else:
+            group_start = 0
+            for i, reg in enumerate(regs):
+                if reg.address != regs[group_start].address:
+                    group_start = i
+                elif i > group_start:
+                    try:
+                        self._addr_check_conflicts(reg, regs[group_start:i])
+                    except ValueError as e:
+                        errors.append(str(e))
+        # check address conflicts with register arrays
+        if arrays:
+            for i, arr in enumerate(new_arrays):
+                try:
+                    self._addr_check_array_conflicts(arr, self._regs, self._addrs, self._arrays + new_arrays[:i])
+                except ValueError as e:
+                    errors.append(str(e))
+            for reg in new_regs:
+                if not isinstance(reg, RegisterArray):
+                    try:
+                        self._addr_check_array_conflicts(reg, [], [], arrays)
+                    except ValueError as e:
+                        errors.append(str(e))
+        if errors:
+            raise ValueError('\n'.join(errors))
+        # if we here - all is ok and registers can be added
+        self._attach_regs(new_regs, regs)
+        self._changed()
+
+    def _pack_regs(self, regs):
+        """Pack attributes of the registers and their bit fields into arrays for vectorized checks."""
+        return vectorized.pack_regs(regs)
+
+    def _attach_regs(self, new_regs, regs):
+        """Store checked registers in the map.
+
+        Args:
+            new_regs : list with registers to be added
+            regs : list with all registers of the map (including new ones) in ascending order of addresses
+        """
+        self._regs = regs
+        self._addrs = [reg.address for reg in regs]
+        for reg in new_regs:
+            self._regs_by_name[reg.name] = reg
+            if isinstance(reg, RegisterArray):
+                self._arrays.append(reg)
+            reg._parent = self
+        if self._index is not None:
+            self._index_stale.extend(new_regs)
+
+    def _regs_at(self, address):
+        """Returns list with registers located at the address."""
+        return self._regs[bisect_left(self._addrs, address):bisect_right(self._addrs, address)]
+
+    def _insert_reg(self, reg):
+        """Insert register to the list and to the sorted address index."""
+        # find position to insert register and not to break ascending order of addresses
+        reg_idx = bisect_right(self._addrs, reg.address)
+        self._addrs.insert(reg_idx, reg.address)
+        self._regs.insert(reg_idx, reg)
+
+    def _remove_reg(self, reg):
+        """Remove register from the list and from the sorted address index."""
+        lo = bisect_left(self._addrs, reg.address)
+        hi = bisect_right(self._addrs, reg.address)
+        reg_idx = next(i for i in range(lo, hi) if self._regs[i] is reg)
+        del self._addrs[reg_idx]
+        del self._regs[reg_idx]
+
+    def _rename_reg(self, reg, new_name):
+        """Update register name index before register is renamed."""
+        old_name = reg.name
+        if new_name == old_name:
+            return
+        if not new_name:
+            raise ValueError("Not able to clear name of '%s' register inside a map!" % (old_name))
+        if new_name in self._regs_by_name:
+            raise ValueError("Register with name '%s' is already present!" % (new_name))
+        self._check_elements_names(reg, new_name, self._regs_by_name, self._regs_by_name)
+        self._check_submaps_names(new_name)
+        del self._regs_by_name[old_name]
+        self._regs_by_name[new_name] = reg
+
+    def _move_reg(self, reg, new_address):
+        """Change address of the register and keep the list ordered."""
+        self._remove_reg(reg)
+        old_address = reg._address
+        reg._address = new_address
+        try:
+            self._addr_check_alignment(reg)
+            self._addr_check_conflicts(reg, self._regs_at(reg.address))
+            self._addr_check_array_conflicts(reg, self._regs, self._addrs, self._arrays)
+            self._addr_check_submaps_conflicts(reg)
+        except ValueError:
+            reg._address = old_address
+            raise
+        finally:
+            self._insert_reg(reg)
 
     def _validate(self):
-        """Last checks of the register map before use."""
-        for reg in self.regs:
-            reg._validate()
-            # complementary checks
-            if reg.complementary:
-                other_regs = [(reg_.address, reg_.complementary) for reg_ in self.regs if reg_.name != reg.name]
-                if (reg.address, reg.complementary) not in other_regs:
+        """Last checks of the register map before use.
+
+        Checks are skipped if the map has not been changed since the last successful validation.
+        Only the submaps changed since the last successful validation are checked again.
+        """
+        if not self._validated:
+            # registers are sorted by addresses, so all registers with the same address are neighbours
+            for _, same_addr_regs in groupby(self._regs, key=lambda reg: reg.address):
+                compl_regs = []
+                for reg in same_addr_regs:
+                    reg._validate()
+                    if reg.complementary:
+                        compl_regs.append(reg)
+                # complementary checks
+                if len(compl_regs) == 1:
                     raise ValueError("Register %s is broken. "
-                                     "Not able to find complementary pair!" % self.name)
+                                     "Not able to find complementary pair!" % compl_regs[0].name)
+            self._validated = True
+        while self._stale_blocks:
+            block = self._stale_blocks[-1]
+            block.rmap._validate()
+            self._check_submap(block)
+            self._stale_blocks.pop()
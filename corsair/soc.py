@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Address space of a system on chip built from many register maps.
+"""
+
+import random
+from bisect import bisect_left, insort
+from .config import Configuration
+from .regmap import RegisterMap, Submap
+from .readers import RegisterMapReader
+from . import utils
+
+
+class _Node():
+    """Node of the interval tree."""
+    __slots__ = ('start', 'end', 'key', 'prio', 'left', 'right', 'max_end')
+
+    def __init__(self, start, end, key, prio):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.prio = prio
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    def update(self):
+        self.max_end = self.end
+        for child in (self.left, self.right):
+            if child is not None and child.max_end > self.max_end:
+                self.max_end = child.max_end
+
+
+class _IntervalTree():
+    """Interval tree as a treap ordered by starts of intervals, where every node keeps the largest end of its subtree.
+
+    Intervals are inserted and removed in O(log n) expected time, and all the intervals overlapping a range
+    are found in O(log n + k) for k intervals found.
+    """
+    def __init__(self):
+        self._root = None
+        self._rnd = random.Random(0)
+
+    def _split(self, node, order, inclusive=False):
+        """Split the subtree into subtrees with nodes before the order (or at it if inclusive) and the rest."""
+        if node is None:
+            return None, None
+        if (node.start, node.key) < order or (inclusive and (node.start, node.key) == order):
+            node.right, right = self._split(node.right, order, inclusive)
+            node.update()
+            return node, right
+        left, node.left = self._split(node.left, order, inclusive)
+        node.update()
+        return left, node
+
+    def _merge(self, left, right):
+        """Merge subtrees, where all nodes of the left one are before the nodes of the right one."""
+        if left is None or right is None:
+            return left or right
+        if left.prio > right.prio:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
+
+    def insert(self, start, end, key):
+        left, right = self._split(self._root, (start, key))
+        node = _Node(start, end, key, self._rnd.random())
+        self._root = self._merge(self._merge(left, node), right)
+
+    def remove(self, start, key):
+        left, right = self._split(self._root, (start, key))
+        _, right = self._split(right, (start, key), inclusive=True)
+        self._root = self._merge(left, right)
+
+    def overlaps(self, lo, hi):
+        """Get keys of the intervals overlapping the range from lo (inclusive) to hi (exclusive)."""
+        keys = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end <= lo:
+                continue
+            stack.append(node.left)
+            if node.start < hi:
+                if node.end > lo and node.start < node.end:
+                    keys.append(node.key)
+                stack.append(node.right)
+        return keys
+
+
+class AddressSpace():
+    """Address space of a system on chip, where register maps of blocks are placed into address windows.
+
+    Unlike :meth:`RegisterMap.add_submap`, blocks are not rejected when they are added, but all the problems
+    are reported by :meth:`check`: windows overlapping, registers out of their windows, prefixes of names
+    of registers conflicting, data width of a block exceeding the one of the address space, and errors
+    of the register maps themselves. Windows are kept in
+    an interval tree, so a block is checked in O(log n + k) time for n blocks and k problems found, and the time
+    does not depend on the number of registers. Only the blocks added, moved or changed since the previous check
+    are checked again, including the changes made to their register maps directly.
+
+    Examples:
+
+        >>> from corsair import Register, RegisterMap, Configuration
+        >>> uart = RegisterMap(Configuration())
+        >>> uart.add_regs([Register('ctrl', address=0x0), Register('stat', address=0x4)])
+        >>> soc = AddressSpace()
+        >>> soc.add_block('uart0', uart, base=0x1000, size=0x100)
+        >>> soc.add_block('uart1', uart, base=0x1080, size=0x100)
+        >>> soc.add_block('uart2', uart, base=0x2000, size=0x4)
+        >>> for issue in soc.check():
+        ...     print(issue)
+        Window [0x1080, 0x1180) of block 'uart1' overlaps window [0x1000, 0x1100) of block 'uart0'!
+        1 register(s) of block 'uart2' are out of its window [0x2000, 0x2004), the first is 'stat'!
+        >>> soc.move_block('uart1', base=0x1100)
+        >>> soc.move_block('uart2', size=0x100)
+        >>> soc.check()
+        []
+        >>> [(reg.name, hex(reg.address)) for reg in soc.build().in_range(0x1100, 0x2000)]
+        [('uart1_ctrl', '0x1100'), ('uart1_stat', '0x1104')]
+    """
+    def __init__(self, config=None):
+        self.config = Configuration() if config is None else config
+        self._blocks = {}
+        self._intervals = {}
+        self._tree = _IntervalTree()
+        self._stale = set()
+        # blocks by prefixes and sorted prefixes to find the prefixes starting with each other
+        self._names_by_prefix = {}
+        self._prefixes = []
+        # problems of the blocks and problems of the pairs of blocks by kinds of problems and pairs
+        self._issues = {}
+        self._pair_issues = {}
+        self._pairs = {}
+        self._maps_by_path = {}
+        self._built = None
+
+    def __repr__(self):
+        return 'AddressSpace(%d blocks)' % len(self._blocks)
+
+    def __len__(self):
+        """Number of blocks."""
+        return len(self._blocks)
+
+    def __iter__(self):
+        """Blocks iterator in ascending order of base addresses."""
+        return iter(self.blocks)
+
+    def __getitem__(self, name):
+        """Get block by name.
+
+        Raises:
+            KeyError: An error occured if block does not exists.
+        """
+        try:
+            return self._blocks[name]
+        except KeyError:
+            raise KeyError("There is no block with a name '%s'!" % (name))
+
+    @property
+    def blocks(self):
+        """Returns list with :class:`Submap` objects of the blocks in ascending order of base addresses."""
+        return sorted(self._blocks.values(), key=lambda block: (block.base, block.name))
+
+    def _read(self, path, columnar):
+        """Read register map from file once for all the blocks."""
+        if path not in self._maps_by_path:
+            self._maps_by_path[path] = RegisterMapReader()(path, Configuration(), columnar=columnar)
+        return self._maps_by_path[path]
+
+    def add_block(self, name, rmap, base, size=None, prefix=None, columnar=False):
+        """Place register map of a block into the address window.
+
+        Args:
+            name : name of the block
+            rmap : register map or path to the register map file; every file is read once
+            base : base address of the window
+            size : size of the window in bytes; if not set, the window grows with the registers of the block
+            prefix : prefix to be added to names of the registers of the block; name with '_' is used if not set
+            columnar : read file into :class:`ColumnarRegisterMap` to save memory
+
+        Raises:
+            ValueError: An error occured if the name is already used, or the base or the size are wrong.
+        """
+        base = utils.try_hex_to_dec(base)
+        size = utils.try_hex_to_dec(size)
+        if not name or name in self._blocks:
+            raise ValueError("Block with name '%s' is already present or name is empty!" % (name))
+        utils.is_non_neg_int(base, "Base address '%s' of block '%s' is wrong!"
+                             " Only non-negative integers are allowed." % (base, name))
+        if size is not None:
+            utils.is_non_neg_int(size, "Size '%s' of block '%s' is wrong!"
+                                 " Only non-negative integers are allowed." % (size, name))
+        if not isinstance(rmap, RegisterMap):
+            rmap = self._read(rmap, columnar)
+        block = Submap(self, name, rmap, base, size, prefix)
+        rmap._placements.append(block)
+        self._blocks[name] = block
+        if block.prefix not in self._names_by_prefix:
+            self._names_by_prefix[block.prefix] = set()
+            insort(self._prefixes, block.prefix)
+        self._names_by_prefix[block.prefix].add(name)
+        self._stale.add(name)
+
+    def remove_block(self, name):
+        """Remove block from the address space."""
+        block = self[name]
+        del self._blocks[name]
+        block.rmap._placements.remove(block)
+        self._names_by_prefix[block.prefix].discard(name)
+        if not self._names_by_prefix[block.prefix]:
+            del self._names_by_prefix[block.prefix]
+            del self._prefixes[bisect_left(self._prefixes, block.prefix)]
+        if name in self._intervals:
+            self._tree.remove(self._intervals.pop(name)[0], name)
+        self._drop_issues(name)
+        self._stale.discard(name)
+
+    def move_block(self, name, base=None, size=None):
+        """Change the base address or the size of the window of the block."""
+        block = self[name]
+        if base is not None:
+            base = utils.try_hex_to_dec(base)
+            utils.is_non_neg_int(base, "Base address '%s' of block '%s' is wrong!"
+                                 " Only non-negative integers are allowed." % (base, name))
+            block._base = base
+        if size is not None:
+            size = utils.try_hex_to_dec(size)
+            utils.is_non_neg_int(size, "Size '%s' of block '%s' is wrong!"
+                                 " Only non-negative integers are allowed." % (size, name))
+            block._size = size
+        self._stale.add(name)
+
+    def _submap_changed(self, block):
+        """Called when the register map of the block is changed."""
+        self._stale.add(block.name)
+
+    def _is_submap_of(self, rmap):
+        """Address space is not placed into any register map."""
+        return False
+
+    def _drop_issues(self, name):
+        """Forget problems of the block and of the pairs with the block."""
+        self._issues.pop(name, None)
+        for key in self._pairs.pop(name, ()):
+            self._pair_issues.pop(key, None)
+            for other in key[1]:
+                if other != name:
+                    self._pairs[other].discard(key)
+
+    def _add_pair_issue(self, kind, name, other, message):
+        """Remember problem of the pair of blocks, where message is formatted with the blocks in order of bases."""
+        key = (kind, frozenset((name, other)))
+        first, second = sorted((self._blocks[name], self._blocks[other]), key=lambda block: (block.base, block.name))
+        self._pair_issues[key] = (first.base, first.name, message(first, second))
+        for member in key[1]:
+            self._pairs.setdefault(member, set()).add(key)
+
+    def _conflicting_prefixes(self, prefix):
+        """Get names of the other blocks with prefixes, which start with the prefix or the prefix starts with."""
+        names = []
+        for end in range(len(prefix)):
+            names.extend(self._names_by_prefix.get(prefix[:end], ()))
+        idx = bisect_left(self._prefixes, prefix)
+        while idx < len(self._prefixes) and self._prefixes[idx].startswith(prefix):
+            names.extend(self._names_by_prefix[self._prefixes[idx]])
+            idx += 1
+        return names
+
+    def _check_block(self, name):
+        """Find problems of the block and the windows overlapping its window."""
+        block = self._blocks[name]
+        self._drop_issues(name)
+        lo, hi = block.base, block.end
+        if self._intervals.get(name) != (lo, hi):
+            if name in self._intervals:
+                self._tree.remove(self._intervals[name][0], name)
+            self._tree.insert(lo, hi, name)
+            self._intervals[name] = (lo, hi)
+        issues = []
+        try:
+            block.rmap._validate()
+        except ValueError as e:
+            issues.append("Block '%s' is broken: %s" % (name, e))
+        if block.rmap.config['data_width'].value > self.config['data_width'].value:
+            issues.append("Block '%s' with data width %d exceeds interface data width %d!" %
+                          (name, block.rmap.config['data_width'].value, self.config['data_width'].value))
+        extent = block.rmap._addr_extent()
+        if extent > block.size:
+            # registers, which end after the end of the window
+            step = block.rmap.config['data_width'].value // 8
+            outside = block.rmap.in_range(max(block.size - step + 1, 0), extent)
+            issues.append("%d register(s) of block '%s' are out of its window [0x%x, 0x%x), the first is '%s'!" %
+                          (len(outside), name, lo, hi, outside[0].name))
+        self._issues[name] = issues
+        for other in self._tree.overlaps(lo, hi):
+            if other != name:
+                self._add_pair_issue('overlap', name, other, lambda first, second: (
+                    "Window [0x%x, 0x%x) of block '%s' overlaps window [0x%x, 0x%x) of block '%s'!" %
+                    (second.base, second.end, second.name, first.base, first.end, first.name)))
+        for other in self._conflicting_prefixes(block.prefix):
+            if other != name:
+                self._add_pair_issue('prefix', name, other, lambda first, second: (
+                    "Prefix '%s' of block '%s' conflicts with prefix '%s' of block '%s'!" %
+                    (second.prefix, second.name, first.prefix, first.name)))
+
+    def check(self):
+        """Check the blocks added, moved or changed since the previous check.
+
+        Returns:
+            List with messages about all the problems of the address space in ascending order of base addresses.
+        """
+        for name in list(self._stale):
+            self._check_block(name)
+            self._stale.discard(name)
+        issues = [(self._blocks[name].base, name, issue) for name, block_issues in self._issues.items()
+                  for issue in block_issues]
+        issues.extend(self._pair_issues.values())
+        return [issue for _, _, issue in sorted(issues)]
+
+    def build(self):
+        """Build register map of the whole address space with register maps of the blocks as submaps.
+
+        Registers of the blocks are not copied, and the map can be used for documentation and decoding of dumps.
+        Blocks placed into the map built before are removed from it.
+
+        Returns:
+            :class:`RegisterMap` object.
+
+        Raises:
+            ValueError: An error occured if the address space has problems.
+        """
+        issues = self.check()
+        if issues:
+            raise ValueError("Address space has %d problem(s), the first is: %s" % (len(issues), issues[0]))
+        if self._built is not None:
+            for rmap in {id(block.rmap): block.rmap for block in self._built.submaps}.values():
+                rmap._placements = [block for block in rmap._placements if block.parent is not self._built]
+        self._built = RegisterMap(self.config)
+        try:
+            for block in self.blocks:
+                self._built.add_submap(block.name, block.rmap, block.base, block._size, block.prefix)
+        except ValueError:
+            # registers maps should not notify the map, which is not built
+            for block in self._built.submaps:
+                block.rmap._placements.remove(block)
+            self._built = None
+            raise
+        return self._built
@@ -65,6 +65,25 @@ def try_int_to_str(val, max_dec=1024):
         return val
 
 
+def cached_property(func):
+    """Property which value is computed once and then stored in the '_cache' dictionary of the object.
+
+    Object is responsible to reset '_cache' to None when any attribute the value depends on is changed.
+    """
+    name = func.__name__
+
+    def getter(self):
+        if self._cache is None:
+            self._cache = {}
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = func(self)
+            return value
+    getter.__doc__ = func.__doc__
+    return property(getter)
+
+
 def get_file_ext(path):
     _, ext = os.path.splitext(path)
     return ext.lower()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Vectorized checks of registers with NumPy.
+
+NumPy is an optional dependency. Checks pack register and bit field attributes into arrays and find
+the registers, which may be wrong, in a few array operations. Only such registers are checked
+by the usual per-register checks later, so the errors reported are the same.
+"""
+
+from operator import attrgetter
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def is_available():
+    """NumPy is installed and vectorized checks can be used."""
+    return np is not None
+
+
+def pack_regs(regs):
+    """Pack addresses of the registers and positions of their bit fields into arrays.
+
+    Returns:
+        Tuple with arrays of register addresses, and register indexes, LSB positions and widths of bit fields.
+    """
+    addrs = np.fromiter(map(attrgetter('address'), regs), dtype=np.uint64, count=len(regs))
+    bfields_nums = np.fromiter(map(len, regs), dtype=np.int64, count=len(regs))
+    bfields = [bf for reg in regs for bf in reg._bfields]
+    bf_reg = np.repeat(np.arange(len(regs)), bfields_nums)
+    bf_lsb = np.fromiter(map(attrgetter('_lsb'), bfields), dtype=np.int64, count=len(bfields))
+    bf_width = np.fromiter(map(attrgetter('_width'), bfields), dtype=np.int64, count=len(bfields))
+    return addrs, bf_reg, bf_lsb, bf_width
+
+
+def find_suspects(packed, data_width, align, block_bases, block_ends):
+    """Find registers, which fail alignment, data width or submap checks.
+
+    Args:
+        packed : arrays with attributes of registers and bit fields, see :func:`pack_regs`
+        data_width : interface data width
+        align : address alignment in bytes
+        block_bases : base addresses of submaps in ascending order
+        block_ends : addresses next to the last ones of submaps
+
+    Returns:
+        Boolean array with True for every register to be checked by the per-register checks.
+    """
+    addrs, bf_reg, bf_lsb, bf_width = packed
+    bf_lsb = bf_lsb.astype(np.int64)
+    bf_width = bf_width.astype(np.int64)
+    # address alignment
+    suspects = addrs % np.uint64(align) != 0
+    # bit fields exceed data width
+    suspects[bf_reg[bf_lsb + bf_width > data_width]] = True
+    # registers inside address ranges of submaps
+    if len(block_bases):
+        idx = np.searchsorted(np.array(block_bases, dtype=np.uint64), addrs, side='right') - 1
+        ends = np.array(block_ends, dtype=np.uint64)
+        suspects |= (idx >= 0) & (addrs < ends[np.maximum(idx, 0)])
+    return suspects
+
+
+def find_same_addrs(addrs):
+    """Find addresses shared by several registers.
+
+    Args:
+        addrs : addresses of registers in ascending order
+
+    Returns:
+        List with addresses, which are present more than once.
+    """
+    addrs = np.array(addrs, dtype=np.uint64)
+    return np.unique(addrs[1:][addrs[1:] == addrs[:-1]]).tolist()
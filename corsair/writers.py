@@ -10,6 +10,7 @@ import yaml
 import jinja2
 from corsair import __version__
 from . import utils
+from .regmap import RegisterArrayElement
 from pathlib import Path
 import wavedrom
 
@@ -97,6 +98,18 @@ class ConfigurationWriter(_DictWriter):
 class _Jinja2Writer():
     """Basic class for rendering Jinja2 templates."""
 
+    # environment is shared between all writers to compile every template only once
+    _j2_env = None
+
+    @classmethod
+    def _get_j2_env(cls):
+        """Get Jinja2 environment with loader of the package templates."""
+        if _Jinja2Writer._j2_env is None:
+            templates_path = str(Path(__file__).parent / 'templates')
+            _Jinja2Writer._j2_env = jinja2.Environment(loader=jinja2.FileSystemLoader(searchpath=templates_path),
+                                                       trim_blocks=True, lstrip_blocks=True)
+        return _Jinja2Writer._j2_env
+
     def _render_to_file(self, template, vars, path):
         """Render text with Jinja2 and save it to file
 
@@ -106,10 +119,7 @@ class _Jinja2Writer():
             path : path to output file
         """
         print("  Load template ... ", end='')
-        templates_path = str(Path(__file__).parent / 'templates')
-        j2_env = jinja2.Environment(loader=jinja2.FileSystemLoader(searchpath=templates_path),
-                                    trim_blocks=True, lstrip_blocks=True)
-        j2_template = j2_env.get_template(template)
+        j2_template = self._get_j2_env().get_template(template)
         print("OK")
 
         print("  Render text ... ", end='')
@@ -196,11 +206,29 @@ class HdlWriter(_Jinja2Writer):
             rmap.config['name'].value = Path(path).stem
         j2_vars['rmap'] = rmap
         j2_vars['config'] = rmap.config
+        j2_vars['regs'], j2_vars['arrays'] = self._split_regs(rmap)
+        # registers and bit fields of every category are selected once for the whole template
+        j2_vars['read_regs'] = [reg for reg in j2_vars['regs'] if not (reg.complementary and reg.access == 'wo')]
+        fifo_bfields = rmap.bfields_with(modifier='fifo')
+        j2_vars['fifo_wr'] = [(reg, bf) for reg, bf in fifo_bfields if 'w' in bf.access]
+        j2_vars['fifo_rd'] = [(reg, bf) for reg, bf in fifo_bfields if 'r' in bf.access]
 
         print("OK")
 
         self._render_to_file(j2_template, j2_vars, path)
 
+    def _split_regs(self, rmap):
+        """Split registers to the ones to be unrolled and register arrays to be created with generate loops."""
+        if rmap.config['register_arrays'].value != 'generate':
+            return list(rmap), []
+        # FIFO chains are built for every bit field separately, so such arrays are always unrolled
+        arrays = [arr for arr in rmap.arrays if not any('fifo' in bf.modifiers for bf in arr)]
+        if not arrays:
+            return list(rmap), []
+        arrays_ids = set(id(arr) for arr in arrays)
+        regs = [reg for reg in rmap if not (isinstance(reg, RegisterArrayElement) and id(reg.array) in arrays_ids)]
+        return regs, arrays
+
 
 class DocsWriter(_Jinja2Writer):
     """Create documentation for a register map.
@@ -70,6 +70,9 @@ setuptools.setup(
         'jinja2',
         'wavedrom',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -127,6 +127,40 @@ def gen_rtl(tmpdir, bridge, reset):
     return (regmap_path, bridge_path, rmap.config)
 
 
+def gen_rtl_array(tmpdir, bridge, reset):
+    config = corsair.Configuration()
+    config['data_width'].value = 32
+    config['address_width'].value = 12
+    config['register_reset'].value = reset
+    config['register_arrays'].value = 'generate'
+    config['regmap']['read_filler'].value = 0xdeadc0de
+    config['lb_bridge']['type'].value = bridge
+    rmap = corsair.RegisterMap(config)
+
+    # CSR ID
+    csr_id = corsair.Register('ID', 'Identifier', 0x0)
+    csr_id.add_bfields(corsair.BitField('VAL', 'Value', width=32, initial=0x42, access='ro', modifiers=['const']))
+    rmap.add_regs(csr_id)
+
+    # CSR array CH
+    csr_ch = corsair.RegisterArray('CH', 'Channel control', 0x10, count=4, stride=8)
+    csr_ch.add_bfields([
+        corsair.BitField('EN', 'Channel enable',
+                         lsb=0, width=1, access='rw'),
+        corsair.BitField('DIV', 'Clock divider',
+                         lsb=8, width=8, initial=0x3, access='rw'),
+        corsair.BitField('CNT', 'Events counter',
+                         lsb=16, width=8, access='ro', modifiers=['hwu'])])
+    rmap.add_regs(csr_ch)
+
+    regmap_path = path_join(tmpdir, 'regs.v')
+    corsair.HdlWriter()(regmap_path, rmap)
+
+    bridge_path = path_join(tmpdir, '%s2lb.v' % bridge)
+    corsair.LbBridgeWriter()(bridge_path, config)
+    return (regmap_path, bridge_path, rmap.config)
+
+
 @pytest.fixture()
 def simtool():
     return 'modelsim'
@@ -142,7 +176,7 @@ def reset(request):
     return request.param
 
 
-@pytest.fixture(params=['tb_rw', 'tb_wo', 'tb_ro', 'tb_compl', 'tb_fifo'])
+@pytest.fixture(params=['tb_rw', 'tb_wo', 'tb_ro', 'tb_compl', 'tb_fifo', 'tb_array'])
 def tb(request):
     return request.param
 
@@ -159,7 +193,11 @@ def test(tmpdir, tb, bridge, reset, simtool, defines=[], gui=False, pytest_run=T
     sim.top = tb
     sim.setup()
     # prepare test
-    dut_src, bridge_src, config = gen_rtl(tmpdir, bridge, reset)
+    if tb == 'tb_array':
+        dut_src, bridge_src, config = gen_rtl_array(tmpdir, bridge, reset)
+        sim.defines += ['DUT_ARRAY']
+    else:
+        dut_src, bridge_src, config = gen_rtl(tmpdir, bridge, reset)
     sim.sources += [dut_src, bridge_src]
     sim.defines += [
         'DUT_DATA_W=%d' % config['data_width'].value,
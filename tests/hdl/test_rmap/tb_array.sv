@@ -0,0 +1,120 @@
+`timescale 1ns/1ps
+
+module tb_array;
+
+// Test environment with DUT and bridge to LocalBus
+`include "env.svh"
+
+// Test body
+int errors = 0;
+logic [ADDR_W-1:0] addr;
+logic [DATA_W-1:0] data;
+logic [STRB_W-1:0] strb;
+
+localparam CH_BASE   = 'h10;
+localparam CH_STRIDE = 'h8;
+localparam CH_COUNT  = 4;
+
+// test reset values of all the elements
+task test_reset;
+    $display("%t, Start reset tests!", $time);
+    // ID register before the array
+    addr = 'h0;
+    mst.read(addr, data);
+    if (data != 'h00000042)
+        errors++;
+    for (int i = 0; i < CH_COUNT; i++) begin
+        addr = CH_BASE + CH_STRIDE * i;
+        data = 'heeeeeeee;
+        mst.read(addr, data);
+        if (data != 'h00000300)
+            errors++;
+        if (csr_ch_en_out[i] != 0)
+            errors++;
+        if (csr_ch_div_out[8 * i +: 8] != 'h3)
+            errors++;
+    end
+endtask
+
+// test writes to the elements with read back
+task test_rw;
+    $display("%t, Start read/write tests!", $time);
+    // write different values to every element
+    for (int i = 0; i < CH_COUNT; i++) begin
+        addr = CH_BASE + CH_STRIDE * i;
+        data = ((8'h10 + i) << 8) | (i % 2);
+        mst.write(addr, data);
+    end
+    @(posedge clk);
+    // every element holds its own value
+    for (int i = 0; i < CH_COUNT; i++) begin
+        if (csr_ch_en_out[i] != (i % 2))
+            errors++;
+        if (csr_ch_div_out[8 * i +: 8] != 8'h10 + i)
+            errors++;
+        addr = CH_BASE + CH_STRIDE * i;
+        data = 'heeeeeeee;
+        mst.read(addr, data);
+        if (data != (((8'h10 + i) << 8) | (i % 2)))
+            errors++;
+    end
+    // byte write to a single element doesn't touch the others
+    addr = CH_BASE + CH_STRIDE * 2;
+    data = 'h0000a501;
+    strb = 'b0010;
+    mst.write(addr, data, strb);
+    @(posedge clk);
+    if (csr_ch_div_out != 'h13a51110)
+        errors++;
+    if (csr_ch_en_out != 'b1010)
+        errors++;
+    // gaps between the elements are not mapped
+    addr = CH_BASE + CH_STRIDE + 'h4;
+    data = 'heeeeeeee;
+    mst.read(addr, data);
+    if (data != 'hdeadc0de)
+        errors++;
+endtask
+
+// test read only bit fields updated by hardware
+task test_ext_upd;
+    $display("%t, Start external update tests!", $time);
+    // update CNT bit fields of elements 1 and 3 only
+    @(posedge clk);
+    csr_ch_cnt_in = 'h77006600;
+    csr_ch_cnt_upd = 'b1010;
+    @(posedge clk);
+    csr_ch_cnt_upd = 0;
+    @(posedge clk);
+    for (int i = 0; i < CH_COUNT; i++) begin
+        addr = CH_BASE + CH_STRIDE * i;
+        data = 'heeeeeeee;
+        mst.read(addr, data);
+        if (data[23:16] != csr_ch_cnt_in[8 * i +: 8])
+            errors++;
+    end
+endtask
+
+initial begin : main
+    wait(!rst);
+    repeat(5) @(posedge clk);
+
+    test_reset();
+    test_rw();
+    test_ext_upd();
+
+    repeat(5) @(posedge clk);
+    if (errors)
+        $display("!@# TEST FAILED - %d ERRORS #@!", errors);
+    else
+        $display("!@# TEST PASSED #@!");
+    $finish;
+end
+
+initial begin : timeout
+    #5000;
+    $display("!@# TEST FAILED - TIMEOUT #@!");
+    $finish;
+end
+
+endmodule
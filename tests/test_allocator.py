@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Address allocator module tests.
+"""
+
+import pytest
+from corsair import BitField, Register, RegisterArray, RegisterMap, AddressAllocator
+from corsair import Configuration
+
+
+def _make_rmap():
+    rmap = RegisterMap(Configuration())
+    rmap.add_regs([Register('reg_a', 'Register A', 0x0), Register('reg_b', 'Register B', 0x10),
+                   Register('reg_c', 'Register C', 0x40)])
+    return rmap
+
+
+def _make_compl(name, access):
+    reg = Register(name, 'Complementary register', complementary=True)
+    reg.add_bfields(BitField('data', 'Data', width=8, access=access))
+    return reg
+
+
+class TestAddressAllocator:
+    """Class 'AddressAllocator' testing."""
+    def test_first_fit(self):
+        """Registers take the lowest free addresses."""
+        rmap = _make_rmap()
+        alloc = AddressAllocator(rmap)
+        alloc.add_regs([Register('reg_%d' % i, 'Register') for i in range(5)] + [Register('reg_x', 'X', 0x4)])
+        assert [(reg.name, reg.address) for reg in rmap] == [
+            ('reg_a', 0x0), ('reg_x', 0x4), ('reg_0', 0x8), ('reg_1', 0xc), ('reg_b', 0x10),
+            ('reg_2', 0x14), ('reg_3', 0x18), ('reg_4', 0x1c), ('reg_c', 0x40)]
+
+    def test_atomic(self):
+        """No registers are added and no addresses are left allocated, if any register fails the checks."""
+        rmap = _make_rmap()
+        regs = [Register('reg_x', 'X', 0x4), Register('reg_y', 'Y'), Register('reg_y', 'Y'), RegisterArray('ch', 'C')]
+        with pytest.raises(ValueError, match="'reg_y' is already present"):
+            AddressAllocator(rmap).add_regs(regs)
+        assert rmap.names == ['reg_a', 'reg_b', 'reg_c']
+        assert [reg.address for reg in regs] == [0x4, None, None, None]
+        alloc = AddressAllocator(rmap, hi=0x14)
+        with pytest.raises(ValueError, match="free address range"):
+            alloc.add_regs(regs[:2] + [Register('reg_z%d' % i, 'Z') for i in range(2)])
+        assert rmap.names == ['reg_a', 'reg_b', 'reg_c']
+        assert regs[1].address is None
+        alloc.add_regs(regs[:2])
+        assert [(reg.name, reg.address) for reg in rmap][:3] == [('reg_a', 0x0), ('reg_x', 0x4), ('reg_y', 0x8)]
+
+    def test_best_fit(self):
+        """Registers and arrays take the smallest free ranges large enough."""
+        rmap = _make_rmap()
+        rmap.add_regs(Register('reg_e', 'Register E', 0x38))
+        alloc = AddressAllocator(rmap, fit='best')
+        alloc.add_regs(Register('reg_d', 'Register D'))
+        assert rmap['reg_d'].address == 0x3c
+        arr = RegisterArray('ch', 'Channel', count=3)
+        alloc.add_regs([arr, Register('reg_f', 'Register F')])
+        assert (arr.address, arr.stride) == (0x4, 0x4)
+        assert rmap['reg_f'].address == 0x14
+        arr = RegisterArray('dma', 'DMA', count=9)
+        alloc.add_regs(arr)
+        assert arr.address == 0x44
+
+    def test_alignment(self):
+        """Addresses follow the address alignment of the map."""
+        rmap = _make_rmap()
+        rmap.config['regmap']['address_alignment_mode'].value = 'custom'
+        rmap.config['regmap']['address_alignment_value'].value = 0x10
+        alloc = AddressAllocator(rmap)
+        alloc.add_regs([Register('reg_d', 'Register D'), Register('reg_e', 'Register E')])
+        assert (rmap['reg_d'].address, rmap['reg_e'].address) == (0x20, 0x30)
+
+    def test_reserved(self):
+        """Reserved ranges and the window are never used."""
+        rmap = _make_rmap()
+        alloc = AddressAllocator(rmap, reserved=[('0x4', '0xa'), (0x8, 0x10), (0x14, 0x40)], lo=0x4, hi=0x50)
+        assert alloc.reserved == [(0x4, 0x10), (0x14, 0x40)]
+        alloc.add_regs([Register('reg_%d' % i, 'Register') for i in range(3)])
+        assert [rmap['reg_%d' % i].address for i in range(3)] == [0x44, 0x48, 0x4c]
+        with pytest.raises(ValueError, match="'reg_3'"):
+            alloc.add_regs(Register('reg_3', 'Register'))
+        with pytest.raises(ValueError):
+            AddressAllocator(rmap, reserved=[(0x8, 0x8)])
+
+    def test_complementary(self):
+        """Complementary registers are placed in pairs."""
+        rmap = _make_rmap()
+        alloc = AddressAllocator(rmap)
+        alloc.add_regs([_make_compl('rx', 'ro'), Register('reg_d', 'Register D'), _make_compl('tx', 'wo')])
+        assert (rmap['rx'].address, rmap['tx'].address, rmap['reg_d'].address) == (0x4, 0x4, 0x8)
+        rmap._validate()
+        with pytest.raises(ValueError, match='complementary pair'):
+            alloc.add_regs(_make_compl('rx1', 'ro'))
+
+    def test_utilization(self):
+        """Utilization is reported for the range up to the last register."""
+        rmap = _make_rmap()
+        alloc = AddressAllocator(rmap, reserved=[(0x20, 0x30)])
+        assert alloc.utilization() == {'span': 0x44, 'used': 0xc, 'reserved': 0x10, 'free': 0x28, 'gaps': 3,
+                                       'ratio': 0.18}
+        alloc.add_regs([Register('reg_%d' % i, 'Register') for i in range(9)])
+        assert alloc.utilization()['free'] == 0x4
@@ -7,6 +7,7 @@
 import pytest
 import os
 import sys
+import json
 from corsair.__main__ import main as corsair_main
 from py._path.local import LocalPath
 import corsair
@@ -84,6 +85,49 @@ class TestRegisterMap(_TestCLI):
         assert 'Read registers ... OK' in captured.out
         assert 'Save data to file ... OK' in captured.out
 
+    def test_diff(self, datadir, tmpdir, capsys):
+        """Show difference between register maps."""
+        rmap_json = str(datadir.join('map.json'))
+        rmap_yaml = str(datadir.join('map.yaml'))
+        exit_code = self._run_cli(['--diff', rmap_json, rmap_yaml])
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert 'No differences found.' in captured.out
+        # change a register and compare again
+        rmap = corsair.RegisterMapReader()(rmap_json, corsair.Configuration())
+        rmap['LEN'].description = 'Changed'
+        rmap_new = str(tmpdir.join('map.json'))
+        corsair.RegisterMapWriter()(rmap_new, rmap)
+        exit_code = self._run_cli(['--diff', rmap_json, rmap_new])
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "~ LEN @ 0x0: description 'Length of pulse' -> 'Changed'" in captured.out
+
+    def test_decode_dump(self, datadir, tmpdir, capsys):
+        """Decode binary dumps of the register space."""
+        rmap_json = str(datadir.join('map.json'))
+        rmap = corsair.RegisterMapReader()(rmap_json, corsair.Configuration())
+        dump_old = str(tmpdir.join('old.bin'))
+        dump_new = str(tmpdir.join('new.bin'))
+        with open(dump_old, 'wb') as f:
+            f.write(bytes(rmap.regs[-1].address + 4))
+        with open(dump_new, 'wb') as f:
+            f.write(b'\xff' * 4 + bytes(rmap.regs[-1].address))
+        capsys.readouterr()
+        exit_code = self._run_cli(['-r', rmap_json, '--decode-dump', dump_old, '--dump-format', 'csv'])
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        # progress of reading the map does not get into the report
+        assert 'Read registers ... OK' in captured.err
+        assert captured.out.splitlines() == ['register,address,value,field,field_value'] + [
+            '%s,0x%x,0x0,%s,0x0' % (reg.name, reg.address, bf.name) for reg in rmap for bf in reg]
+        exit_code = self._run_cli(['-r', rmap_json, '--decode-dump', dump_old, dump_new, '--dump-base', '0x0'])
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert [json.loads(line)['register'] for line in captured.out.splitlines()] == ['LEN'] * len(rmap['LEN'])
+        exit_code = self._run_cli(['-r', rmap_json, '--decode-dump', dump_old, dump_old])
+        assert exit_code == 0
+
 
 class TestConfig(_TestCLI):
     """Configuration related testing."""
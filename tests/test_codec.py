@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Register codec module tests.
+"""
+
+import pytest
+from corsair import BitField, Register, RegisterCodec
+
+
+def _make_reg():
+    reg = Register('reg_a', 'Register A', 0x0)
+    reg.add_bfields([
+        BitField('bf_a', 'Bit field A', lsb=0, width=4, initial=0xa),
+        BitField('bf_b', 'Bit field B', lsb=8, width=8, access='wo'),
+        BitField('bf_c', 'Bit field C', lsb=16, width=16, initial=0x1234, access='ro'),
+    ])
+    return reg
+
+
+class TestRegisterCodec:
+    """Class 'RegisterCodec' testing."""
+    def test_scalar(self):
+        """Test of encoding and decoding of integers."""
+        codec = RegisterCodec(_make_reg())
+        assert codec.encode() == 0x1234000a
+        assert codec.encode({'bf_a': 0x5}, bf_b=0xff) == 0x1234ff05
+        assert codec.decode(0xbeef3c17) == {'bf_a': 0x7, 'bf_b': 0x3c, 'bf_c': 0xbeef}
+        assert codec.decode(0xbeef3c17, ['bf_c']) == {'bf_c': 0xbeef}
+
+    def test_errors(self):
+        """Test of wrong bit fields and values."""
+        codec = RegisterCodec(_make_reg())
+        with pytest.raises(KeyError):
+            codec.encode(bf_x=1)
+        with pytest.raises(KeyError):
+            codec.decode(0, ['bf_x'])
+        with pytest.raises(ValueError, match='read-only'):
+            codec.encode(bf_c=1)
+        with pytest.raises(ValueError):
+            codec.encode(bf_a=0x10)
+        with pytest.raises(ValueError):
+            codec.encode(bf_a=-1)
+        with pytest.raises(ValueError):
+            codec.encode(bf_a='1')
+
+    def test_arrays(self):
+        """Test of encoding and decoding of NumPy arrays."""
+        np = pytest.importorskip('numpy')
+        codec = RegisterCodec(_make_reg())
+        words = np.array([0xbeef3c17, 0x0, 0xffffffff], dtype=np.uint32)
+        fields = codec.decode(words)
+        assert fields['bf_a'].tolist() == [0x7, 0x0, 0xf]
+        assert fields['bf_c'].tolist() == [0xbeef, 0x0, 0xffff]
+        assert codec.encode(bf_a=fields['bf_a'], bf_b=fields['bf_b']).tolist() == [0x12343c07, 0x12340000, 0x1234ff0f]
+        assert codec.encode(bf_a=np.arange(2), bf_b=1).tolist() == [0x12340100, 0x12340101]
+        with pytest.raises(ValueError):
+            codec.encode(bf_a=np.array([0x10]))
+
+    def test_wide(self):
+        """Test of register wider than 64 bits."""
+        reg = Register('reg_a', 'Register A', 0x0)
+        reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=60, width=8))
+        codec = RegisterCodec(reg)
+        assert codec.encode(bf_a=0xff) == 0xff << 60
+        assert codec.decode(0xab << 60) == {'bf_a': 0xab}
+        np = pytest.importorskip('numpy')
+        with pytest.raises(ValueError):
+            codec.decode(np.zeros(4, dtype=np.uint64))
+
+    def test_register(self):
+        """Test of codec created again after the register is changed."""
+        reg = _make_reg()
+        codec = reg.codec
+        assert reg.codec is codec
+        reg['bf_a'].lsb = 4
+        assert reg.codec is not codec
+        assert reg.codec.encode(bf_a=0x1) == 0x12340010
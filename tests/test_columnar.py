@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Columnar register map module tests.
+"""
+
+import pickle
+import pytest
+from corsair import BitField, Register, RegisterMap, ColumnarRegisterMap
+from corsair import RegisterMapReader, Configuration
+
+
+def _make_regs():
+    reg_a = Register('reg_a', 'Register A', 0x8, access_strobes=True)
+    reg_a.add_bfields([
+        BitField('bf_a', 'Bit field A', lsb=0, width=8, initial=0x42, access='rw', modifiers=['hwu']),
+        BitField('bf_b', 'Bit field B', lsb=16, width=4, access='ro'),
+    ])
+    reg_b = Register(address=0x0)
+    reg_b.add_bfields(BitField('CNT', 'Counter', width=32, access='ro', modifiers=['hwu', 'rtc']))
+    reg_c = Register('reg_c', 'Register C', 0x4, write_lock=True)
+    reg_c.add_bfields(BitField('bf_a', 'Bit field A', lsb=31, access='wo', modifiers=['sc']))
+    return [reg_a, reg_b, reg_c]
+
+
+class TestColumnarRegisterMap:
+    """Class 'ColumnarRegisterMap' testing."""
+    def test_create(self):
+        """Test of a columnar register map creation."""
+        rmap = RegisterMap()
+        rmap.add_regs(_make_regs())
+        cmap = ColumnarRegisterMap()
+        cmap.add_regs(_make_regs())
+        print(repr(cmap))
+        print(cmap)
+        assert cmap.as_dict() == rmap.as_dict()
+        assert cmap.names == ['CNT', 'reg_c', 'reg_a']
+        assert cmap['reg_a']['bf_a'].modifiers == ['hwu']
+        assert cmap['CNT'].description == 'Counter'
+        assert cmap[-1].name == 'reg_a'
+        assert cmap['reg_c'].write_lock is True
+
+    def test_fingerprint(self):
+        """Test of the same fingerprint for the same content of a columnar map."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs(_make_regs())
+        cmap = ColumnarRegisterMap(Configuration())
+        cmap.add_regs(_make_regs()[:2])
+        fp = cmap.fingerprint()
+        cmap.add_regs(_make_regs()[2])
+        assert fp != cmap.fingerprint()
+        assert cmap.fingerprint() == rmap.fingerprint()
+
+    def test_indexes(self):
+        """Test of the same categories of registers for a columnar map."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs(_make_regs())
+        cmap = ColumnarRegisterMap(Configuration())
+        cmap.add_regs(_make_regs()[:2])
+        assert [reg.name for reg, _ in cmap.bfields_with(modifier='hwu')] == ['CNT', 'reg_a']
+        cmap.add_regs(_make_regs()[2])
+        for rm in (rmap, cmap):
+            assert [reg.name for reg in rm.regs_with('write_lock')] == ['reg_c']
+            assert [(reg.name, bf.name) for reg, bf in rm.bfields_with(access='wo')] == [('reg_c', 'bf_a')]
+
+    def test_clone(self):
+        """Test of a columnar map copy."""
+        cmap = ColumnarRegisterMap(Configuration())
+        cmap.add_regs(_make_regs())
+        clone = cmap.clone()
+        assert isinstance(clone, ColumnarRegisterMap)
+        assert clone.as_dict() == cmap.as_dict()
+        assert clone.fingerprint() == cmap.fingerprint()
+        clone.add_regs(Register('reg_d', 'Register D', 0xc))
+        assert cmap.names == ['CNT', 'reg_c', 'reg_a']
+        assert clone.names == ['CNT', 'reg_c', 'reg_a', 'reg_d']
+        reg = cmap['reg_a'].clone()
+        reg['bf_a'].initial = 1
+        assert reg.__class__ is Register
+        assert cmap['reg_a']['bf_a'].initial == 0x42
+
+    def test_pickle(self):
+        """Test of a columnar map pickling."""
+        cmap = ColumnarRegisterMap(Configuration())
+        cmap.add_regs(_make_regs())
+        loaded = pickle.loads(pickle.dumps(cmap))
+        assert isinstance(loaded, ColumnarRegisterMap)
+        assert loaded.as_dict() == cmap.as_dict()
+        assert loaded.fingerprint() == cmap.fingerprint()
+        loaded.add_regs(Register('reg_d', 'Register D', 0xc))
+        assert loaded.names == ['CNT', 'reg_c', 'reg_a', 'reg_d']
+        reg = pickle.loads(pickle.dumps(cmap['reg_a']))
+        assert reg.__class__ is Register
+        assert reg.as_dict() == cmap['reg_a'].as_dict()
+
+    def test_bulk(self):
+        """Test of adding registers in bulk mode."""
+        cmap = ColumnarRegisterMap()
+        with cmap.bulk():
+            cmap.add_regs(_make_regs())
+        assert [reg.address for reg in cmap] == [0x0, 0x4, 0x8]
+        assert cmap['reg_a'].access_strobes is True
+
+    def test_bulk_errors(self):
+        """Test of dropping packed data when errors found in bulk mode."""
+        cmap = ColumnarRegisterMap()
+        cmap.add_regs(Register('reg_x', 'Register X', 0x10))
+        with pytest.raises(ValueError):
+            with cmap.bulk():
+                cmap.add_regs(_make_regs())
+                cmap.add_regs(Register('reg_d', 'Register D', 0x4))
+        assert cmap.names == ['reg_x']
+        assert len(cmap._reg_addr) == 1
+        assert len(cmap._bf_lsb) == 0
+
+    def test_conflicts(self):
+        """Test of the same checks as for a regular map."""
+        cmap = ColumnarRegisterMap()
+        cmap.add_regs(_make_regs())
+        with pytest.raises(ValueError):
+            cmap.add_regs(Register('reg_a', 'Register A copypaste', 0x10))
+        with pytest.raises(ValueError):
+            cmap.add_regs(Register('reg_d', 'Register D', 0x4))
+
+    def test_bfields_out_of_columns(self):
+        """Test of the same errors for bit fields, which do not fit the columns, as for a register map."""
+        errors = []
+        for rmap_cls in [RegisterMap, ColumnarRegisterMap]:
+            for bulk, vectorize in [(False, False), (True, False), (True, True)]:
+                reg_a = Register('reg_a', 'Register A', 0x0)
+                reg_a.add_bfields(BitField('bf_a', 'Bit field A', lsb=70000, width=70000))
+                reg_b = Register('reg_b', 'Register B', 0x4)
+                reg_b.add_bfields(BitField('bf_b', 'Bit field B', lsb=40))
+                rmap = rmap_cls(Configuration())
+                with pytest.raises(ValueError) as excinfo:
+                    if bulk:
+                        with rmap.bulk(vectorize):
+                            rmap.add_regs([reg_b, reg_a])
+                    else:
+                        rmap.add_regs([reg_a, reg_b])
+                errors.append(str(excinfo.value))
+                assert len(rmap) == 0
+        assert errors[0] == "Register 'reg_a' has field 'bf_a' (msb=139999) that exceeds interface data width 32!"
+        assert errors[1].splitlines() == [
+            "Register 'reg_a' has field 'bf_a' (msb=139999) that exceeds interface data width 32!",
+            "Register 'reg_b' has field 'bf_b' (msb=40) that exceeds interface data width 32!",
+        ]
+        assert errors == errors[:3] * 2
+
+    def test_read_only(self):
+        """Test that registers and bit fields can't be modified inside a map."""
+        cmap = ColumnarRegisterMap()
+        cmap.add_regs(_make_regs())
+        with pytest.raises(AttributeError):
+            cmap['reg_a'].address = 0x10
+        with pytest.raises(AttributeError):
+            cmap['reg_a']['bf_a'].lsb = 1
+
+    def test_wide_initial(self):
+        """Test of bit field with initial value wider than 64 bits."""
+        config = Configuration()
+        config['data_width'].value = 128
+        cmap = ColumnarRegisterMap(config)
+        reg = Register('reg_a', 'Register A', 0x0)
+        reg.add_bfields(BitField('bf_a', 'Bit field A', width=128, initial=2**100 + 1))
+        cmap.add_regs(reg)
+        assert cmap['reg_a']['bf_a'].initial == 2**100 + 1
+
+    def test_bulk_vectorized(self):
+        """Test of vectorized checks with data taken from the columns."""
+        pytest.importorskip('numpy')
+        config = Configuration()
+        config['data_width'].value = 128
+        wide_reg = Register('reg_w', 'Register W', 0x10)
+        wide_reg.add_bfields(BitField('bf_a', 'Bit field A', width=100, initial=2**101))
+        errors = []
+        for vectorize in [False, True]:
+            cmap = ColumnarRegisterMap(config)
+            with pytest.raises(ValueError) as e:
+                with cmap.bulk(vectorize):
+                    cmap.add_regs(_make_regs() + [wide_reg, Register('reg_d', 'Register D', 0x6)])
+            errors.append(str(e.value))
+        assert errors[1].splitlines() == [
+            "Register 'reg_c' with address '4' is not 16 bytes alligned!",
+            "Register 'reg_d' with address '6' is not 16 bytes alligned!",
+            "Register 'reg_a' with address '8' is not 16 bytes alligned!",
+        ]
+        assert errors[0] == errors[1]
+        cmap = ColumnarRegisterMap(Configuration())
+        with cmap.bulk(vectorize=True):
+            cmap.add_regs(_make_regs())
+        assert cmap.names == ['CNT', 'reg_c', 'reg_a']
+        # initial value wider than a bit field is accepted as without vectorization
+        cmap = ColumnarRegisterMap(config)
+        with cmap.bulk(vectorize=True):
+            cmap.add_regs(wide_reg)
+        assert cmap['reg_w']['bf_a'].initial == 2**101
+
+    def test_read(self):
+        """Test of reading a file to a columnar map."""
+        rmap = RegisterMapReader()('tests/data/map.json')
+        cmap = RegisterMapReader()('tests/data/map.json', columnar=True)
+        assert isinstance(cmap, ColumnarRegisterMap)
+        assert cmap.as_dict() == rmap.as_dict()
+        cmap._validate()
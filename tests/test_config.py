@@ -5,8 +5,9 @@
 """
 
 import pytest
-from corsair import Parameter, ParameterGroup, Configuration
+from corsair import Parameter, ParameterGroup, Configuration, OneOf, OneOfFor
 import copy
+import pickle
 
 
 class TestParameter:
@@ -239,6 +240,43 @@ class TestConfiguration:
                 config['regmap']['address_increment_mode'].value)
         assert new_values['group_a'] == config['group_a'].values
 
+    def test_set_values_order(self):
+        """Test of loading values, which depend on each other, in any order"""
+        config = Configuration()
+        config['lb_bridge']['type'].value = 'apb'
+        config.values = {'data_width': 64, 'address_width': 64, 'lb_bridge': {'type': 'axil'}}
+        assert config['data_width'].value == 64
+        config.values = {'lb_bridge': {'type': 'amm'}, 'data_width': 128, 'address_width': 40}
+        assert config['data_width'].value == 128
+        # values are not changed if any of them fails the check
+        with pytest.raises(ValueError, match='"data_width".*"address_width"'):
+            config.values = {'lb_bridge': {'type': 'axil'}, 'read_filler': 1}
+        assert config['lb_bridge']['type'].value == 'amm'
+        assert 'read_filler' not in config.names
+        with pytest.raises(ValueError):
+            config.values = {'regmap': 1}
+
+    def test_schema(self):
+        """Test of rules depending on parameters added after the configuration is created"""
+        config = Configuration()
+        config.values = {'data_width': 16}
+        config.add_params(ParameterGroup('fifo'))
+        config['fifo'].add_params(Parameter('depth', 4))
+        config.add_params(Parameter('width', 16, OneOfFor(config['fifo']['depth'], {4: [8, 16], 8: [8]})))
+        with pytest.raises(ValueError):
+            config.values = {'fifo': {'depth': 8}}
+        config.values = {'width': 8, 'fifo': {'depth': 8}}
+        # validator is changed
+        config['width'].validator = OneOfFor(config['data_width'], {16: [8], 32: [16]})
+        with pytest.raises(ValueError):
+            config.values = {'data_width': 32}
+        clone = pickle.loads(pickle.dumps(config)).clone()
+        with pytest.raises(ValueError):
+            clone.values = {'data_width': 32}
+        clone.values = {'data_width': 32, 'width': 16}
+        assert clone['width'].validator.param is clone['data_width']
+        assert config['data_width'].value == 16
+
     def test_address_calculation_validator(self):
         config = Configuration()
         # no exception here
@@ -264,3 +302,47 @@ class TestConfiguration:
         # exception on not allowed value
         with pytest.raises(ValueError):
             config['data_width'].value = 64
+
+    def test_fingerprint(self):
+        """Test of a configuration fingerprint"""
+        config = Configuration()
+        fp = config.fingerprint()
+        assert fp == Configuration().fingerprint()
+        config['regmap']['read_filler'].value = 42
+        assert fp != config.fingerprint()
+        config['regmap']['read_filler'].value = 0
+        assert fp == config.fingerprint()
+
+    def test_pickle(self):
+        """Test of a configuration pickling."""
+        config = Configuration()
+        config['lb_bridge']['type'].value = 'axil'
+        config['data_width'].value = 64
+        config.add_params(Parameter('depth', 4, OneOf([4, 8])))
+        loaded = pickle.loads(pickle.dumps(config))
+        assert loaded == config
+        assert loaded['data_width'].validator == config['data_width'].validator
+        loaded['lb_bridge']['type'].value = 'amm'
+        loaded['data_width'].value = 128
+        with pytest.raises(ValueError):
+            config['data_width'].value = 128
+        with pytest.raises(ValueError):
+            loaded['depth'].value = 5
+
+    def test_clone(self):
+        """Test of a configuration copy."""
+        config = Configuration()
+        config['lb_bridge']['type'].value = 'axil'
+        config.add_params(Parameter('depth', 4, lambda val: val < 8))
+        clone = config.clone()
+        assert clone == config
+        assert clone.fingerprint() == config.fingerprint()
+        # validators are bound to the copy
+        clone['lb_bridge']['type'].value = 'amm'
+        clone['data_width'].value = 128
+        with pytest.raises(ValueError):
+            config['data_width'].value = 128
+        with pytest.raises(ValueError):
+            clone['depth'].value = 8
+        clone['depth'].value = 6
+        assert config['depth'].value == 4
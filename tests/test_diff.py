@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Register map difference module tests.
+"""
+
+import pytest
+from corsair import BitField, Register, RegisterMap, ColumnarRegisterMap, RegisterMapDiff
+from corsair import Configuration
+
+
+def _make_rmap(rmap_cls=RegisterMap):
+    reg_a = Register('reg_a', 'Register A', 0x0)
+    reg_a.add_bfields([
+        BitField('bf_a', 'Bit field A', lsb=0, width=8, initial=1),
+        BitField('bf_b', 'Bit field B', lsb=8, width=8, access='ro'),
+    ])
+    reg_b = Register('reg_b', 'Register B', 0x4)
+    reg_b.add_bfields(BitField('bf_a', 'Bit field A', width=32))
+    reg_c = Register('reg_c', 'Register C', 0x8)
+    reg_c.add_bfields(BitField('bf_a', 'Bit field A', width=32, access='wo'))
+    rmap = rmap_cls(Configuration())
+    rmap.add_regs([reg_a, reg_b, reg_c])
+    return rmap
+
+
+class TestRegisterMapDiff:
+    """Class 'RegisterMapDiff' testing."""
+    def test_same(self):
+        """Test of maps with the same content."""
+        rmap_diff = RegisterMapDiff(_make_rmap(), _make_rmap(ColumnarRegisterMap))
+        print(rmap_diff)
+        assert not rmap_diff
+        assert str(rmap_diff) == ''
+
+    def test_regs(self):
+        """Test of added, removed and moved registers."""
+        old = _make_rmap()
+        new = _make_rmap()
+        new['reg_c'].address = 0x10
+        new.add_regs(Register('reg_d', 'Register D', 0x14))
+        old.add_regs(Register('reg_x', 'Register X', 0x20))
+        rmap_diff = RegisterMapDiff(old, new)
+        print(rmap_diff)
+        assert [reg.name for reg in rmap_diff.added] == ['reg_d']
+        assert [reg.name for reg in rmap_diff.removed] == ['reg_x']
+        assert [change.new.name for change in rmap_diff.moved] == ['reg_c']
+        assert rmap_diff.moved[0].changes == {'address': (0x8, 0x10)}
+        assert rmap_diff.modified == []
+
+    def test_renamed(self):
+        """Test of a renamed register matched by address."""
+        old = _make_rmap()
+        new = _make_rmap()
+        new['reg_b'].name = 'reg_bb'
+        rmap_diff = RegisterMapDiff(old, new)
+        print(rmap_diff)
+        assert not rmap_diff.added and not rmap_diff.removed
+        assert [change.changes for change in rmap_diff.modified] == [{'name': ('reg_b', 'reg_bb')}]
+
+    def test_bfields(self):
+        """Test of added, removed and modified bit fields."""
+        old = _make_rmap()
+        new = _make_rmap()
+        new['reg_a']['bf_a'].initial = 2
+        new['reg_a']['bf_b'].name = 'bf_bb'
+        new['reg_a'].add_bfields(BitField('bf_c', 'Bit field C', lsb=16, width=8))
+        new['reg_a'].description = 'Register A'
+        rmap_diff = RegisterMapDiff(old, new)
+        print(rmap_diff)
+        assert len(rmap_diff.changed) == 1
+        change = rmap_diff.changed[0]
+        assert change.changes == {}
+        assert [bf.name for bf in change.added_bfields] == ['bf_c']
+        assert change.removed_bfields == []
+        assert [(bf_change.new.name, bf_change.changes) for bf_change in change.modified_bfields] == [
+            ('bf_a', {'initial': (1, 2)}),
+            ('bf_bb', {'name': ('bf_b', 'bf_bb')}),
+        ]
+        assert str(rmap_diff).splitlines() == [
+            '~ reg_a @ 0x0: ~ bf_a: initial 0x1 -> 0x2',
+            "~ reg_a @ 0x0: ~ bf_bb: name 'bf_b' -> 'bf_bb'",
+            '~ reg_a @ 0x0: + bf_c',
+        ]
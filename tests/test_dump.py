@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Binary dump module tests.
+"""
+
+import io
+import pytest
+from corsair import BitField, Register, RegisterMap, DumpDecoder
+from corsair import Configuration
+
+
+def _make_rmap():
+    reg_a = Register('reg_a', 'Register A', 0x100)
+    reg_a.add_bfields([
+        BitField('bf_a', 'Bit field A', lsb=0, width=8),
+        BitField('bf_b', 'Bit field B', lsb=16, width=16, access='ro'),
+    ])
+    reg_b = Register('reg_b', 'Register B', 0x108)
+    reg_b.add_bfields(BitField('bf_a', 'Bit field A', width=32))
+    rmap = RegisterMap(Configuration())
+    rmap.add_regs([reg_a, reg_b])
+    return rmap
+
+
+def _write_dump(path, words, endian='little'):
+    with open(path, 'wb') as f:
+        for word in words:
+            f.write(word.to_bytes(4, endian))
+    return path
+
+
+class TestDumpDecoder:
+    """Class 'DumpDecoder' testing."""
+    def test_decode(self, tmpdir):
+        """Test of decoding registers from a file."""
+        path = _write_dump(str(tmpdir.join('dump.bin')), [0xbeef0012, 0x0, 0xcafe], 'big')
+        records = list(DumpDecoder(_make_rmap(), base=0x100, endian='big').decode(path))
+        assert records == [
+            {'register': 'reg_a', 'address': 0x100, 'value': 0xbeef0012, 'fields': {'bf_a': 0x12, 'bf_b': 0xbeef}},
+            {'register': 'reg_b', 'address': 0x108, 'value': 0xcafe, 'fields': {'bf_a': 0xcafe}},
+        ]
+
+    def test_decode_partial(self, tmpdir):
+        """Test of registers outside of the dump."""
+        path = _write_dump(str(tmpdir.join('dump.bin')), [0x1, 0x2])
+        assert [r['register'] for r in DumpDecoder(_make_rmap(), base=0x100).decode(path)] == ['reg_a']
+        assert [r['register'] for r in DumpDecoder(_make_rmap(), base=0x104).decode(path)] == ['reg_b']
+        assert list(DumpDecoder(_make_rmap(), base=0x10c).decode(path)) == []
+        empty = str(tmpdir.join('empty.bin'))
+        open(empty, 'wb').close()
+        assert list(DumpDecoder(_make_rmap()).decode(empty)) == []
+        with pytest.raises(ValueError):
+            DumpDecoder(_make_rmap(), endian='middle')
+
+    def test_diff(self, tmpdir):
+        """Test of comparing two dumps."""
+        old = _write_dump(str(tmpdir.join('old.bin')), [0xbeef0012, 0x0, 0xcafe])
+        new = _write_dump(str(tmpdir.join('new.bin')), [0xbeee0012, 0x0, 0xcafe])
+        records = list(DumpDecoder(_make_rmap(), base=0x100).diff(old, new))
+        assert records == [{'register': 'reg_a', 'address': 0x100, 'field': 'bf_b', 'old': 0xbeef, 'new': 0xbeee}]
+
+    def test_write(self):
+        """Test of writing reports."""
+        decoder = DumpDecoder(_make_rmap(), base=0x100)
+        records = decoder.decode_bytes((0xbeef0012).to_bytes(4, 'little'))
+        stream = io.StringIO()
+        assert decoder.write(records, stream) == 1
+        assert stream.getvalue() == ('{"register": "reg_a", "address": "0x100", "value": "0xbeef0012", '
+                                     '"fields": {"bf_a": "0x12", "bf_b": "0xbeef"}}\n')
+        stream = io.StringIO()
+        decoder.write(records, stream, 'csv')
+        assert stream.getvalue().splitlines() == [
+            'register,address,value,field,field_value',
+            'reg_a,0x100,0xbeef0012,bf_a,0x12',
+            'reg_a,0x100,0xbeef0012,bf_b,0xbeef',
+        ]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Layout optimizer module tests.
+"""
+
+import pytest
+from corsair import BitField, Register, RegisterArray, RegisterMap, LayoutOptimizer
+from corsair import Configuration
+
+
+def _make_reg(name, address, *bfields, **kwargs):
+    reg = Register(name, 'Register %s' % name, address, **kwargs)
+    lsb = 0
+    for bf_name, width, access in bfields:
+        reg.add_bfields(BitField(bf_name, 'Bit field', width=width, lsb=lsb, access=access))
+        lsb += width
+    return reg
+
+
+def _make_rmap():
+    rmap = RegisterMap(Configuration())
+    rmap.add_regs([
+        _make_reg('ctrl', 0x0, ('en', 1, 'rw'), ('mode', 20, 'rw')),
+        _make_reg('stat', 0x4, ('irq', 4, 'ro')),
+        _make_reg('cfg', 0x8, ('div', 16, 'rw')),
+        _make_reg('cnt', 0xc, ('val', 24, 'ro')),
+        _make_reg('err', 0x10, ('code', 8, 'ro')),
+        _make_reg('tx', 0x14, ('data', 8, 'wo'), complementary=True),
+        _make_reg('rx', 0x14, ('data', 8, 'ro'), complementary=True),
+    ])
+    return rmap
+
+
+class TestLayoutOptimizer:
+    """Class 'LayoutOptimizer' testing."""
+    def test_merge(self):
+        """Bit fields accessed together are moved into a single register."""
+        rmap = _make_rmap()
+        opt = LayoutOptimizer(rmap, [(['stat.irq', 'err.code', 'cnt.val'], 1000)])
+        new_rmap, report = opt.optimize()
+        assert [(reg.name, reg.address) for reg in new_rmap] == [
+            ('stat_err', 0x0), ('cnt', 0x4), ('ctrl', 0x8), ('cfg', 0xc), ('tx', 0x10), ('rx', 0x10)]
+        assert [(bf.name, bf.lsb) for bf in new_rmap['stat_err']] == [('irq', 0), ('code', 4)]
+        assert report == {'transactions': 3000, 'transactions_optimized': 2000, 'bursts': 2000,
+                          'bursts_optimized': 1000, 'reduction': 0.33,
+                          'renamed': {'stat': 'stat_err', 'err': 'stat_err'}}
+        # original map is not changed
+        assert [reg.name for reg in rmap] == ['ctrl', 'stat', 'cfg', 'cnt', 'err', 'tx', 'rx']
+        assert rmap['err']['code'].lsb == 0
+        assert new_rmap.config is not rmap.config
+        assert new_rmap.config.fingerprint() == rmap.config.fingerprint()
+        new_rmap.config['data_width'].value = 64
+        assert rmap.config['data_width'].value == 32
+        new_rmap.config['data_width'].value = 32
+        new_rmap._validate()
+
+    def test_rename(self):
+        """Bit fields with the same names get names of their registers as prefixes."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([_make_reg('lo', 0x0, ('val', 8, 'ro')), _make_reg('hi', 0x4, ('val', 8, 'ro'), ('en', 1, 'rw'))])
+        opt = LayoutOptimizer(rmap, [(['lo.val', 'hi.val'], 10), (['hi'], 1)])
+        new_rmap, report = opt.optimize()
+        assert [(bf.name, bf.lsb) for bf in new_rmap['lo_hi']] == [('val', 0), ('hi_val', 8), ('en', 16)]
+        assert report['renamed'] == {'lo': 'lo_hi', 'hi': 'lo_hi', 'hi.val': 'lo_hi.hi_val'}
+        assert (report['transactions'], report['transactions_optimized']) == (21, 11)
+        assert opt.estimate(new_rmap, report['renamed']) == {'transactions': 11, 'bursts': 11}
+
+    def test_hot_first(self):
+        """Registers of the most frequent sequences are contiguous at the lowest addresses."""
+        rmap = _make_rmap()
+        opt = LayoutOptimizer(rmap, [(['ctrl', 'cfg'], 1), (['rx.data', 'cnt'], 50)])
+        new_rmap, report = opt.optimize()
+        assert [(reg.name, reg.address) for reg in new_rmap] == [
+            ('tx', 0x0), ('rx', 0x0), ('cnt', 0x4), ('ctrl', 0x8), ('cfg', 0xc), ('stat', 0x10), ('err', 0x14)]
+        assert (report['transactions'], report['transactions_optimized']) == (102, 102)
+        assert (report['bursts'], report['bursts_optimized']) == (102, 51)
+        assert report['renamed'] == {}
+        new_rmap._validate()
+
+    def test_arrays_and_submaps(self):
+        """Register arrays are moved as a whole and submaps keep their base addresses."""
+        sub = RegisterMap(Configuration())
+        sub.add_regs(_make_reg('id', 0x0, ('val', 32, 'ro')))
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([_make_reg('ctrl', 0x100), RegisterArray('ch', 'Channel', 0x104, count=4)])
+        rmap.add_submap('sub', sub, 0x118)
+        new_rmap, report = LayoutOptimizer(rmap, [(['ch2', 'sub_id'], 10)]).optimize()
+        assert [(reg.name, reg.address) for reg in new_rmap] == [
+            ('ch0', 0x100), ('ch1', 0x104), ('ch2', 0x108), ('ch3', 0x10c), ('ctrl', 0x110), ('sub_id', 0x118)]
+        assert (report['transactions'], report['transactions_optimized']) == (20, 20)
+
+    def test_unknown(self):
+        """Names from the profile are checked."""
+        rmap = _make_rmap()
+        with pytest.raises(KeyError):
+            LayoutOptimizer(rmap, [(['stat.foo'], 1)]).estimate()
+        with pytest.raises(KeyError):
+            LayoutOptimizer(rmap, [(['foo'], 1)]).optimize()
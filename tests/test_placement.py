@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Bit field placement module tests.
+"""
+
+import pytest
+from corsair import BitField, Register, BitFieldPlacer
+
+
+def _layout(regs):
+    return [[(bf.name, bf.lsb) for bf in reg] for reg in regs]
+
+
+class TestBitFieldPlacer:
+    """Class 'BitFieldPlacer' testing."""
+    def test_pack(self):
+        """Bit fields are packed into the minimum number of registers."""
+        placer = BitFieldPlacer(data_width=8)
+        widths = [5, 3, 4, 4, 6, 2, 1, 7]
+        regs = placer.place([BitField('bf%d' % i, width=w) for i, w in enumerate(widths)])
+        assert len(regs) == 4
+        assert [reg.name for reg in regs] == ['reg0', 'reg1', 'reg2', 'reg3']
+        assert _layout(regs) == [[('bf7', 0), ('bf6', 7)], [('bf4', 0), ('bf5', 6)],
+                                 [('bf0', 0), ('bf1', 5)], [('bf2', 0), ('bf3', 4)]]
+
+    def test_aligned(self):
+        """Aligned bit fields start at byte lanes."""
+        placer = BitFieldPlacer(data_width=16)
+        regs = placer.place([BitField('flag'), BitField('byte', width=4), BitField('nib', width=3)],
+                            aligned=['byte'])
+        assert _layout(regs) == [[('byte', 0), ('nib', 4), ('flag', 7)]]
+        regs = placer.place([BitField('a', width=5), BitField('b', width=5), BitField('c', width=5)],
+                            aligned=['b', 'c'])
+        assert _layout(regs) == [[('b', 0), ('c', 8)], [('a', 0)]]
+
+    def test_keep_together(self):
+        """Bit fields of a group are placed in the order given in a single register."""
+        placer = BitFieldPlacer(data_width=16)
+        group = [BitField('lo', width=4), BitField('hi', width=8)]
+        regs = placer.place([BitField('x', width=10), group, BitField('y', width=2)], aligned=['hi'])
+        assert _layout(regs) == [[('lo', 0), ('y', 4), ('hi', 8)], [('x', 0)]]
+        with pytest.raises(ValueError, match='do not fit'):
+            placer.place([[BitField('a', width=10), BitField('b', width=10)]])
+
+    def test_fill_regs(self):
+        """Free bits of the registers are filled before new registers are created."""
+        reg = Register('ctrl', 'Control', 0x0)
+        reg.add_bfields([BitField('en', lsb=0), BitField('mode', lsb=8, width=8)])
+        placer = BitFieldPlacer()
+        regs = placer.place([BitField('a', width=7), BitField('b', width=16), BitField('c', width=20)],
+                            regs=[reg], name='extra%d')
+        assert _layout([reg]) == [[('en', 0), ('a', 1), ('mode', 8), ('b', 16)]]
+        assert [reg.name for reg in regs] == ['extra0']
+        assert _layout(regs) == [[('c', 0)]]
+
+    def test_atomic(self):
+        """Nothing is changed if any register gets bit fields with the same names."""
+        reg = Register('ctrl', 'Control', 0x0)
+        reg.add_bfields([BitField('en', lsb=0), BitField('mode', lsb=8, width=8)])
+        bf_a, bf_b = BitField('a', width=7), BitField('b', width=8)
+        placer = BitFieldPlacer()
+        with pytest.raises(ValueError, match="'en' is already present in 'ctrl'"):
+            placer.place([bf_a, bf_b, BitField('en')], regs=[reg])
+        with pytest.raises(ValueError, match="'x' is already present in 'reg0'"):
+            placer.place([bf_a, [BitField('x', width=20), BitField('x', width=4)]], regs=[reg])
+        assert _layout([reg]) == [[('en', 0), ('mode', 8)]]
+        assert (bf_a.lsb, bf_b.lsb) == (0, 0)
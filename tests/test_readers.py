@@ -5,7 +5,7 @@
 """
 
 import pytest
-from corsair import RegisterMapReader, ConfigurationReader
+from corsair import RegisterMapReader, ConfigurationReader, Configuration
 
 
 class TestRegisterMapReader:
@@ -32,6 +32,12 @@ class TestRegisterMapReader:
         print('input_file:', input_file)
         self._read(input_file)
 
+    def test_same_fingerprint(self):
+        """Test of the same fingerprint of the map read from different formats."""
+        rmap_json = RegisterMapReader()('tests/data/map.json', config=Configuration())
+        rmap_yaml = RegisterMapReader()('tests/data/map.yaml', config=Configuration())
+        assert rmap_json.fingerprint() == rmap_yaml.fingerprint()
+
 
 class TestConfigurationReader:
     """Class 'ConfigurationReader' testing."""
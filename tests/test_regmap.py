@@ -5,9 +5,10 @@
 """
 
 import pytest
-from corsair import BitField, Register, RegisterMap
+from corsair import BitField, Register, RegisterArray, RegisterMap
 from corsair import Configuration
 import copy
+import pickle
 
 
 class TestBitField:
@@ -130,11 +131,33 @@ class TestBitField:
         with pytest.raises(ValueError):
             bf.modifiers = 'sc'
 
+    def test_modifiers_tuple(self):
+        """Test of setting 'modifiers' attribute of a bit field with a tuple."""
+        bf = BitField('bf_a', access='ro', modifiers=('hwu', 'rtc'))
+        assert bf.modifiers == ['hwu', 'rtc']
+
+    def test_modifiers_copy(self):
+        """Test that modification of the returned list doesn't affect the bit field."""
+        bf = BitField('bf_a', access='rw')
+        bf.modifiers.append('hwu')
+        assert bf.modifiers == []
+
+    def test_unknown_attr(self):
+        """Test of setting an attribute that bit field doesn't have."""
+        bf = BitField('bf_a')
+        with pytest.raises(AttributeError):
+            bf.acess = 'ro'
+
     def test_bits(self):
         """Test of adding a field with position that  overlaps with other field in a register."""
         bf = BitField('bf_a', lsb=5, width=4)
         assert bf.bits == [5, 6, 7, 8]
 
+    def test_mask(self):
+        """Test of bit mask of the bit field."""
+        bf = BitField('bf_a', lsb=5, width=4)
+        assert bf.mask == 0x1E0
+
     def test_byte_strobes(self):
         """Test byte strobes info of the bit field."""
         bf_a = BitField('bf_a', lsb=0, width=16)
@@ -160,6 +183,44 @@ class TestBitField:
                                      3: {'bf_lsb': 10, 'bf_msb': 13,
                                          'wdata_lsb': 24, 'wdata_msb': 27}}
 
+    def test_cache_invalidation(self):
+        """Test of derived values update after bit field attributes are changed."""
+        bf = BitField('bf_a', lsb=0, width=4)
+        assert bf.bits == [0, 1, 2, 3]
+        assert list(bf.byte_strobes.keys()) == [0]
+        bf.lsb = 6
+        assert bf.bits == [6, 7, 8, 9]
+        assert list(bf.byte_strobes.keys()) == [0, 1]
+        bf.width = 1
+        assert bf.bits == [6]
+        assert bf.msb == 6
+
+    def test_shared_definition(self):
+        """Test of a definition shared by bit fields with the same attributes."""
+        bf_a = BitField('en', 'Enable', lsb=0)
+        bf_b = BitField(''.join(['e', 'n']), ''.join(['Enable']), lsb=4)
+        assert bf_a._spec is bf_b._spec
+        assert bf_a._spec is copy.deepcopy(bf_a)._spec
+        bf_b.description = 'Enable B'
+        assert bf_a._spec is not bf_b._spec
+        assert (bf_a.description, bf_b.description) == ('Enable', 'Enable B')
+        assert (bf_a.lsb, bf_b.lsb) == (0, 4)
+        bf_a.description = 'Enable B'
+        bf_a.lsb = 4
+        assert bf_a._spec is bf_b._spec
+        assert bf_a == bf_b
+
+    def test_clone(self):
+        """Test of a bit field copy."""
+        reg = Register('reg_a', 'Register A')
+        reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=4, width=4, initial=3))
+        bf = reg['bf_a'].clone()
+        assert bf == reg['bf_a']
+        assert bf._parent is None
+        bf.initial = 5
+        bf.lsb = 0
+        assert (reg['bf_a'].initial, reg['bf_a'].lsb) == (3, 4)
+
 
 class TestRegister:
     """Class 'Register' testing."""
@@ -290,6 +351,17 @@ class TestRegister:
         with pytest.raises(ValueError):
             reg.add_bfields(BitField('bf_c', 'Bit field C', lsb=4, width=10))
 
+    def test_field_position_conflict_names(self):
+        """Test of names of the conflicting fields in the error message."""
+        reg = Register('REGA', 'Register A')
+        reg.add_bfields([
+            BitField('bf_a', 'Bit field A', lsb=0, width=8),
+            BitField('bf_b', 'Bit field B', lsb=8, width=8),
+            BitField('bf_c', 'Bit field C', lsb=16, width=8),
+        ])
+        with pytest.raises(ValueError, match=r"\['bf_a', 'bf_b'\]"):
+            reg.add_bfields(BitField('bf_d', 'Bit field D', lsb=4, width=10))
+
     def test_field_order(self):
         """Test of adding fields and check that they are presented in ascending order in a register."""
         reg = Register('REGA', 'Register A')
@@ -299,6 +371,46 @@ class TestRegister:
         reg.add_bfields(BitField('bf_d', 'Bit field D', lsb=18, width=12))
         assert reg.names == ['bf_a', 'bf_c', 'bf_b', 'bf_d']
 
+    def test_field_rename(self):
+        """Test of access to a bit field by a new name after renaming."""
+        reg = Register('REGA', 'Register A')
+        reg.add_bfields([
+            BitField('bf_a', 'Bit field A', lsb=0),
+            BitField('bf_b', 'Bit field B', lsb=1)
+        ])
+        reg['bf_a'].name = 'bf_c'
+        assert reg['bf_c'].lsb == 0
+        with pytest.raises(KeyError):
+            reg['bf_a']
+        with pytest.raises(ValueError):
+            reg['bf_c'].name = 'bf_b'
+
+    def test_field_move(self):
+        """Test of fields order and overlapping checks after bit field position is changed."""
+        reg = Register('REGA', 'Register A')
+        reg.add_bfields([
+            BitField('bf_a', 'Bit field A', lsb=0, width=4),
+            BitField('bf_b', 'Bit field B', lsb=8, width=4)
+        ])
+        reg['bf_a'].lsb = 12
+        assert reg.names == ['bf_b', 'bf_a']
+        reg.add_bfields(BitField('bf_c', 'Bit field C', lsb=0, width=8))
+        with pytest.raises(ValueError):
+            reg.add_bfields(BitField('bf_d', 'Bit field D', lsb=14, width=1))
+
+    def test_cache_invalidation(self):
+        """Test of derived values update after register's bit fields are changed."""
+        reg = Register('REGA', 'Register A')
+        reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=4, initial=1, access='ro'))
+        assert (reg.access, reg.initial) == ('ro', 0x1)
+        reg.add_bfields(BitField('bf_b', 'Bit field B', lsb=4, width=4, initial=2, access='ro'))
+        assert (reg.access, reg.initial) == ('ro', 0x21)
+        reg['bf_b'].access = 'wo'
+        reg['bf_b'].initial = 3
+        assert (reg.access, reg.initial) == ('rw', 0x31)
+        reg['bf_b'].lsb = 8
+        assert reg.initial == 0x301
+
     def test_access_strobes_access(self):
         """Test of accessing to 'access_strobes' attribute of a register."""
         reg = Register('REGA', 'Register A')
@@ -316,6 +428,76 @@ class TestRegister:
         with pytest.raises(ValueError):
             reg.access_strobes = 0
 
+    def test_clone(self):
+        """Test of a register copy."""
+        reg = Register('reg_a', 'Register A', 0x4, write_lock=True)
+        reg.add_bfields([BitField('bf_a', 'Bit field A', lsb=0), BitField('bf_b', 'Bit field B', lsb=1)])
+        assert reg.initial == 0
+        clone = reg.clone()
+        reg['bf_a'].description = 'Bit field AA'
+        assert clone['bf_a'].description == 'Bit field A'
+        reg['bf_a'].description = 'Bit field A'
+        assert clone == reg
+        assert clone.write_lock is True
+        assert clone['bf_b']._parent is clone
+        clone['bf_b'].initial = 1
+        clone.add_bfields(BitField('bf_c', 'Bit field C', lsb=2))
+        assert (reg.initial, clone.initial) == (0, 2)
+        assert reg.names == ['bf_a', 'bf_b']
+
+
+class TestRegisterArray:
+    """Class 'RegisterArray' testing."""
+    def _create(self, name='ch', address=0x100, count=4, stride=8):
+        arr = RegisterArray(name, 'Channel', address=address, count=count, stride=stride)
+        arr.add_bfields(BitField('en', 'Enable', lsb=0))
+        return arr
+
+    def test_create(self):
+        """Test of a register array creation."""
+        arr = self._create()
+        print(repr(arr))
+        print(arr)
+        assert arr.last_address == 0x118
+        assert [(reg.name, reg.address) for reg in arr.elements()] == [
+            ('ch0', 0x100), ('ch1', 0x108), ('ch2', 0x110), ('ch3', 0x118)]
+        assert arr.element(-1).index == 3
+        assert arr.element(2)['en'] is arr['en']
+        with pytest.raises(KeyError):
+            arr.element(4)
+
+    def test_wrong_count(self):
+        """Test of a register array creation with wrong count or stride."""
+        with pytest.raises(ValueError):
+            RegisterArray('ch', count=0)
+        with pytest.raises(ValueError):
+            RegisterArray('ch', stride=-4)
+
+    def test_element_read_only(self):
+        """Test of element attributes are read-only."""
+        element = self._create().element(1)
+        with pytest.raises(AttributeError):
+            element.address = 0
+
+    def test_element_changed(self):
+        """Test of element values follow the changes of the array bit fields."""
+        arr = self._create()
+        element = arr.element(1)
+        values = (element.initial, element.access, element.codec.initial, element.fingerprint())
+        assert values[:3] == (0, 'rw', 0)
+        arr['en'].initial = 1
+        arr['en'].access = 'ro'
+        assert (element.initial, element.access, element.codec.initial) == (1, 'ro', 1)
+        assert element.fingerprint() != values[3]
+        assert element.fingerprint() == arr.element(1).fingerprint()
+        assert element.clone().as_dict() == arr.element(1).as_dict()
+
+    def test_as_dict(self):
+        """Test of a register array dictionary."""
+        arr_dict = self._create().as_dict()
+        assert arr_dict['count'] == 4
+        assert arr_dict['stride'] == 8
+
 
 class TestRegisterMap:
     """Class 'RegisterMap' testing."""
@@ -448,6 +630,52 @@ class TestRegisterMap:
         rmap.add_regs(Register('reg_d', 'Register D', 0x14))
         assert rmap.names == ['reg_a', 'reg_c', 'reg_b', 'reg_d']
 
+    def test_reg_rename(self):
+        """Test of access to a register by a new name after renaming."""
+        rmap = RegisterMap()
+        rmap.add_regs([
+            Register('reg_a', 'Register A', 0x0),
+            Register('reg_b', 'Register B', 0x4),
+        ])
+        rmap['reg_a'].name = 'reg_c'
+        assert rmap['reg_c'].address == 0x0
+        with pytest.raises(KeyError):
+            rmap['reg_a']
+        with pytest.raises(ValueError):
+            rmap['reg_c'].name = 'reg_b'
+
+    def test_reg_rename_by_field(self):
+        """Test of access to a register with no name after renaming of its bit field."""
+        reg = Register(address=0x0)
+        reg.add_bfields(BitField('CNT', 'Counter'))
+        rmap = RegisterMap()
+        rmap.add_regs(reg)
+        reg['CNT'].name = 'LEN'
+        assert rmap['LEN'] is reg
+
+    def test_reg_readdress(self):
+        """Test of changing address of a register inside a map."""
+        rmap = RegisterMap()
+        rmap.add_regs([
+            Register('reg_a', 'Register A', 0x0),
+            Register('reg_b', 'Register B', 0x4),
+            Register('reg_c', 'Register C', 0x8),
+        ])
+        rmap['reg_a'].address = 0xC
+        assert rmap.names == ['reg_b', 'reg_c', 'reg_a']
+        with pytest.raises(ValueError):
+            rmap['reg_a'].address = 0x4
+        assert rmap['reg_a'].address == 0xC
+        assert rmap.names == ['reg_b', 'reg_c', 'reg_a']
+
+    def test_reg_addr_order_random(self):
+        """Test of adding registers in random order of addresses."""
+        addresses = [0x10, 0x4, 0x1C, 0x0, 0x8, 0x14, 0xC, 0x18]
+        rmap = RegisterMap()
+        for addr in addresses:
+            rmap.add_regs(Register('reg_%x' % addr, 'Register', addr))
+        assert [reg.address for reg in rmap] == sorted(addresses)
+
     def test_reg_addr_auto_incr_data_width(self):
         """Test of auto increment of a register's address based on interface data width."""
         config = Configuration()
@@ -481,6 +709,103 @@ class TestRegisterMap:
         with pytest.raises(ValueError):
             rmap.add_regs(Register('reg_b', 'Register B'))
 
+    def test_bulk(self):
+        """Test of adding registers in bulk mode."""
+        config = Configuration()
+        config['regmap']['address_increment_mode'].value = 'data_width'
+        rmap = RegisterMap(config)
+        rmap.add_regs(Register('reg_a', 'Register A', 0x10))
+        with rmap.bulk():
+            rmap.add_regs(Register('reg_b', 'Register B', 0x4))
+            rmap.add_regs(Register('reg_c', 'Register C'))
+            rmap.add_regs(Register('reg_d', 'Register D', 0x0))
+            assert len(rmap) == 1
+        assert rmap.names == ['reg_d', 'reg_b', 'reg_a', 'reg_c']
+        assert rmap['reg_c'].address == 0x14
+
+    def test_bulk_errors(self):
+        """Test of reporting all errors found in bulk mode."""
+        rmap = RegisterMap()
+        rmap.add_regs(Register('reg_a', 'Register A', 0x0))
+        reg_d = Register('reg_d', 'Register D', 0xC)
+        reg_d.add_bfields(BitField('bf_a', 'Bit field A', lsb=16, width=32))
+        with pytest.raises(ValueError) as e:
+            with rmap.bulk():
+                rmap.add_regs([
+                    Register('reg_a', 'Register A copypaste', 0x8),
+                    Register('reg_b', 'Register B', 0x0),
+                    Register('reg_c', 'Register C', 0x6),
+                    reg_d,
+                ])
+        msgs = str(e.value).split('\n')
+        assert len(msgs) == 4
+        assert "'reg_a' is already present" in msgs[0]
+        assert "conflicts with register 'reg_a'" in msgs[-1]
+        assert rmap.names == ['reg_a']
+
+    def _create_bulk_regs(self):
+        regs = []
+        for i in range(8):
+            reg = Register('reg_%d' % i, 'Register', i * 4)
+            reg.add_bfields([
+                BitField('bf_a', 'Bit field A', lsb=0, width=8, initial=0xff),
+                BitField('bf_b', 'Bit field B', lsb=8, width=8),
+            ])
+            regs.append(reg)
+        regs.append(Register('reg_c0', 'Register', 0x40, complementary=True))
+        regs.append(Register('reg_c1', 'Register', 0x40, complementary=True))
+        regs.append(self._create_array('ch', 0x100, 4, 8))
+        return regs
+
+    def _bulk_errors(self, regs, vectorize):
+        rmap = RegisterMap(Configuration())
+        rmap.add_submap('ip', self._create_ip(), 0x200)
+        try:
+            with rmap.bulk(vectorize):
+                rmap.add_regs(regs)
+        except ValueError as e:
+            return str(e)
+        return ''
+
+    def test_bulk_vectorized(self):
+        """Vectorized checks in bulk mode report the same errors."""
+        pytest.importorskip('numpy')
+        assert self._bulk_errors(self._create_bulk_regs(), True) == ''
+        regs = self._create_bulk_regs()
+        # initial values and positions of bit fields are not checked by the map
+        regs[1]['bf_b'].lsb = 4
+        regs[2]['bf_a'].initial = 0x100
+        regs[3]['bf_b'].width = 30
+        regs[4].address = 0x2
+        regs[5].address = 0x0
+        regs[6].address = 0x204
+        regs[7].address = 0x108
+        regs[8].complementary = False
+        errors = self._bulk_errors(regs, True)
+        assert errors.splitlines() == [
+            "Register 'reg_4' with address '2' is not 4 bytes alligned!",
+            "Register 'reg_3' has field 'bf_b' (msb=37) that exceeds interface data width 32!",
+            "Register 'reg_6' with address '516' conflicts with submap 'ip'!",
+            "Register 'reg_5' with address '0' conflicts with register 'reg_0' with the same address!",
+            "Register 'reg_c1' with address '64' conflicts with register 'reg_c0' with the same address!",
+            "Register 'reg_7' with address '264' conflicts with register 'ch1' with the same address!",
+        ]
+        assert errors == self._bulk_errors(regs, False)
+
+    def test_bf_initial_wider(self):
+        """Initial value wider than a bit field is accepted by a map with and without bulk mode."""
+        for bulk, vectorize in [(False, False), (True, False), (True, True)]:
+            reg = Register('reg_a', 'Register A', 0x4)
+            reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=4))
+            reg['bf_a'].initial = 0x10
+            rmap = RegisterMap()
+            if bulk:
+                with rmap.bulk(vectorize):
+                    rmap.add_regs(reg)
+            else:
+                rmap.add_regs(reg)
+            assert rmap['reg_a']['bf_a'].initial == 0x10
+
     def test_bf_datawidth_conflict(self):
         """Wait exception when bf.msb value exceeds data width."""
         reg = Register('reg_a', 'Register A', 0x4)
@@ -550,6 +875,44 @@ class TestRegisterMap:
             Register('rega_r', 'Register A read part', 0x0, complementary=True),
         ])
 
+    def test_compl_validate(self):
+        """Validate complementary pair in a map."""
+        rmap = RegisterMap()
+        rmap.add_regs(Register('reg_a', 'Register A', 0x0))
+        rmap.add_regs(Register('rega_w', 'Register A write part', 0x4, complementary=True))
+        rmap.add_regs(Register('reg_b', 'Register B', 0x8))
+        rmap.add_regs(Register('rega_r', 'Register A read part', 0x4, complementary=True))
+        rmap['rega_w'].add_bfields(BitField('bf_a', 'Bit field A', access='wo'))
+        rmap['rega_r'].add_bfields(BitField('bf_a', 'Bit field A', access='ro'))
+        rmap._validate()
+
+    def test_validate_once(self, monkeypatch):
+        """Unchanged map is validated only once."""
+        rmap = RegisterMap()
+        rmap.add_regs([
+            Register('reg_a', 'Register A', 0x0),
+            Register('reg_b', 'Register B', 0x4),
+        ])
+        calls = []
+        orig_validate = Register._validate
+        monkeypatch.setattr(Register, '_validate', lambda reg: calls.append(reg.name) or orig_validate(reg))
+        rmap._validate()
+        rmap._validate()
+        assert calls == ['reg_a', 'reg_b']
+
+    def test_validate_after_change(self):
+        """Map is validated again after any of its registers is changed."""
+        reg = Register('reg_a', 'Register A', 0x4)
+        reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=16, access='ro'))
+        rmap = RegisterMap()
+        rmap.add_regs(reg)
+        rmap._validate()
+        rmap['reg_a'].write_lock = True
+        with pytest.raises(ValueError):
+            rmap._validate()
+        rmap['reg_a']['bf_a'].access = 'rw'
+        rmap._validate()
+
     def test_wlock_ro(self):
         """Exception when write_lock is active in register with no write bitfields."""
         reg = Register('rega', 'Register A', 0x0, write_lock=True)
@@ -560,3 +923,363 @@ class TestRegisterMap:
         rmap.add_regs(reg)
         with pytest.raises(ValueError):
             rmap._validate()
+
+    def test_fingerprint(self):
+        """Fingerprint depends only on the map content."""
+        def create(addrs):
+            rmap = RegisterMap(Configuration())
+            for name, addr in addrs:
+                reg = Register(name, 'Register', addr)
+                reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=8, initial=3))
+                rmap.add_regs(reg)
+            return rmap
+        rmap = create([('reg_a', 0x0), ('reg_b', 0x4)])
+        fp = rmap.fingerprint()
+        assert fp == create([('reg_b', 0x4), ('reg_a', 0x0)]).fingerprint()
+        assert fp != create([('reg_a', 0x0), ('reg_b', 0x8)]).fingerprint()
+        assert fp != create([('reg_a', 0x0)]).fingerprint()
+
+    def test_fingerprint_update(self):
+        """Fingerprint is updated after any change of the map or its configuration."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([Register('reg_a', 'Register A', 0x0), Register('reg_b', 'Register B', 0x4)])
+        rmap['reg_a'].add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=8))
+        fp = rmap.fingerprint()
+        rmap['reg_a']['bf_a'].initial = 5
+        rmap['reg_a']['bf_a'].width = 4
+        fp_changed = rmap.fingerprint()
+        assert fp != fp_changed
+        rmap['reg_a']['bf_a'].width = 8
+        rmap['reg_a']['bf_a'].initial = 0
+        assert fp == rmap.fingerprint()
+        rmap['reg_b'].address = 0x8
+        assert fp != rmap.fingerprint()
+        rmap['reg_b'].address = 0x4
+        assert fp == rmap.fingerprint()
+        rmap.config['regmap']['read_filler'].value = 1
+        assert fp != rmap.fingerprint()
+        rmap.config['regmap']['read_filler'].value = 0
+        assert fp == rmap.fingerprint()
+        with rmap.bulk():
+            rmap.add_regs(Register('reg_c', 'Register C', 0xC))
+        assert fp != rmap.fingerprint()
+
+    def _create_array(self, name='ch', address=0x100, count=4, stride=8):
+        arr = RegisterArray(name, 'Channel', address=address, count=count, stride=stride)
+        arr.add_bfields(BitField('en', 'Enable', lsb=0))
+        return arr
+
+    def test_arrays(self):
+        """Register arrays are expanded during iteration."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([Register('reg_a', 'Register A', 0x104), self._create_array()])
+        assert len(rmap) == 5
+        assert rmap.names == ['ch0', 'reg_a', 'ch1', 'ch2', 'ch3']
+        assert rmap['ch2'].address == 0x110
+        assert rmap[4].name == 'ch3'
+        assert rmap['ch'].count == 4
+        assert rmap.arrays == [rmap['ch']]
+        with pytest.raises(KeyError):
+            rmap['ch4']
+
+    def test_arrays_conflicts(self):
+        """Address conflicts of register arrays are found."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs(self._create_array())
+        with pytest.raises(ValueError, match="'ch2'"):
+            rmap.add_regs(Register('reg_a', 'Register A', 0x110))
+        with pytest.raises(ValueError, match="'ch3'"):
+            rmap.add_regs(self._create_array('dma', 0x10c, 4, 12))
+        with pytest.raises(ValueError, match="'ch1'"):
+            rmap.add_regs(self._create_array('dma', 0x0, 10, 0x108))
+        rmap.add_regs(self._create_array('dma', 0x104, 16, 8))
+        rmap.add_regs(Register('reg_a', 'Register A', 0x200))
+        with pytest.raises(ValueError):
+            rmap['reg_a'].address = 0x17c
+        with pytest.raises(ValueError):
+            rmap['dma'].address = 0x100
+
+    def test_arrays_names(self):
+        """Names of register arrays elements are unique."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([self._create_array(), Register('ch10', 'Register', 0x0)])
+        with pytest.raises(ValueError):
+            rmap.add_regs(Register('ch1', 'Register', 0x4))
+        with pytest.raises(ValueError):
+            rmap.add_regs(self._create_array('ch1', 0x200))
+        with pytest.raises(ValueError):
+            rmap.add_regs(self._create_array('ch', 0x200, 11))
+
+    def test_arrays_bulk(self):
+        """Register arrays are checked in bulk mode."""
+        rmap = RegisterMap(Configuration())
+        with pytest.raises(ValueError) as e:
+            with rmap.bulk():
+                rmap.add_regs([self._create_array(), Register('ch2', 'Register', 0x0)])
+                rmap.add_regs([Register('reg_a', 'Register A', 0x118), self._create_array('dma', 0x110, 2, 0x20)])
+        print(e.value)
+        assert len(str(e.value).splitlines()) == 3
+        rmap.config['regmap']['address_increment_mode'].value = 'data_width'
+        with rmap.bulk():
+            rmap.add_regs([self._create_array(), Register('reg_a', 'Register A', 0x11c)])
+            rmap.add_regs(self._create_array('dma', address=None, stride=4))
+        assert rmap['dma'].address == 0x120
+        assert rmap['dma'].last_address == 0x12c
+
+    def _create_ip(self, regs_num=2):
+        rmap = RegisterMap(Configuration())
+        for i in range(regs_num):
+            reg = Register('reg%d' % i, 'Register', i * 4)
+            reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=8))
+            rmap.add_regs(reg)
+        return rmap
+
+    def test_submaps(self):
+        """Registers of submaps are flattened during iteration."""
+        ip = self._create_ip()
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs(Register('reg_a', 'Register A', 0x0))
+        rmap.add_submap('ip0', ip, 0x100)
+        rmap.add_submap('ip1', ip, '0x200', prefix='ipb_')
+        assert len(rmap) == 5
+        assert rmap.names == ['reg_a', 'ip0_reg0', 'ip0_reg1', 'ipb_reg0', 'ipb_reg1']
+        assert rmap['ipb_reg1'].address == 0x204
+        assert rmap['ipb_reg1']['bf_a'] is ip['reg1']['bf_a']
+        assert rmap[2].name == 'ip0_reg1'
+        assert list(rmap.as_dict()) == rmap.names
+        assert [block.name for block in rmap.submaps] == ['ip0', 'ip1']
+        ip.add_regs(Register('reg2', 'Register', 0x8))
+        assert rmap['ip0_reg2'].address == 0x108
+        with pytest.raises(KeyError):
+            rmap['ip0_reg3']
+        rmap.config['regmap']['address_increment_mode'].value = 'data_width'
+        rmap.add_regs(Register('reg_b', 'Register B'))
+        assert rmap['reg_b'].address == 0x20c
+
+    def test_submaps_nested(self):
+        """Submaps can be nested."""
+        cluster = RegisterMap(Configuration())
+        cluster.add_submap('ip', self._create_ip(), 0x10)
+        rmap = RegisterMap(Configuration())
+        rmap.add_submap('cl', cluster, 0x1000)
+        assert rmap.names == ['cl_ip_reg0', 'cl_ip_reg1']
+        assert rmap['cl_ip_reg1'].address == 0x1014
+        with pytest.raises(ValueError):
+            cluster.add_submap('top', rmap, 0x100)
+
+    def test_submaps_conflicts(self):
+        """Address and name conflicts of submaps are found."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([Register('reg_a', 'Register A', 0x0), Register('ip0_reg1', 'Register', 0x8)])
+        with pytest.raises(ValueError, match="'reg_a'"):
+            rmap.add_submap('ip', self._create_ip(), 0x0)
+        with pytest.raises(ValueError, match="'ip0_reg1'"):
+            rmap.add_submap('ip0', self._create_ip(), 0x100)
+        with pytest.raises(ValueError, match="alligned"):
+            rmap.add_submap('ip', self._create_ip(), 0x102)
+        rmap.add_submap('ip', self._create_ip(), 0x100)
+        with pytest.raises(ValueError, match="submap 'ip'"):
+            rmap.add_submap('ip1', self._create_ip(), 0xf8, size=0x10)
+        with pytest.raises(ValueError, match="prefix"):
+            rmap.add_submap('ip_b', self._create_ip(), 0x200)
+        with pytest.raises(ValueError, match="prefix 'ip_'"):
+            rmap.add_submap('ipx', self._create_ip(), 0x200, prefix='i')
+        with pytest.raises(ValueError, match="'ip_reg0'"):
+            rmap.add_regs(Register('ip_reg0', 'Register', 0x200))
+        with pytest.raises(ValueError, match="submap 'ip'"):
+            rmap.add_regs(Register('reg_b', 'Register B', 0x104))
+        with pytest.raises(ValueError, match="submap 'ip'"):
+            rmap.add_regs(self._create_array('ch', 0xf8, 4, 8))
+        with pytest.raises(ValueError, match="fit"):
+            rmap.add_submap('ipc', self._create_ip(4), 0x200, size=8)
+        with pytest.raises(ValueError):
+            with rmap.bulk():
+                rmap.add_regs(Register('reg_b', 'Register B', 0x104))
+        rmap['reg_a'].address = 0x108
+        assert rmap['reg_a'].address == 0x108
+
+    def test_submaps_validate(self, monkeypatch):
+        """Only the changed submaps are validated again."""
+        ips = [self._create_ip() for _ in range(3)]
+        rmap = RegisterMap(Configuration())
+        for i, ip in enumerate(ips):
+            rmap.add_submap('ip%d' % i, ip, 0x100 * (i + 1))
+        rmap._validate()
+        calls = []
+        orig_validate = Register._validate
+        monkeypatch.setattr(Register, '_validate', lambda reg: calls.append(reg.name) or orig_validate(reg))
+        ips[1]['reg1']['bf_a'].width = 4
+        rmap._validate()
+        assert calls == ['reg0', 'reg1']
+        calls.clear()
+        rmap._validate()
+        assert calls == []
+        # submap grows and overlaps the next one
+        ips[0].add_regs(Register('reg2', 'Register', 0x100))
+        with pytest.raises(ValueError, match="submap 'ip1'"):
+            rmap._validate()
+
+    def test_submaps_fingerprint(self):
+        """Fingerprint is changed with submaps."""
+        ip = self._create_ip()
+        rmap = RegisterMap(Configuration())
+        rmap.add_submap('ip', ip, 0x100)
+        fp = rmap.fingerprint()
+        ip['reg0']['bf_a'].initial = 1
+        assert fp != rmap.fingerprint()
+        ip['reg0']['bf_a'].initial = 0
+        assert fp == rmap.fingerprint()
+
+    def test_submaps_changed(self):
+        """Registers of a submap follow the changes of the registers they are created for."""
+        ip = self._create_ip()
+        rmap = RegisterMap(Configuration())
+        rmap.add_submap('ip', ip, 0x100)
+        rmap._validate()
+        fp = rmap.fingerprint()
+        reg = rmap['ip_reg0']
+        values = (reg.initial, reg.access, reg.codec.initial, reg.fingerprint())
+        assert values[:3] == (0, 'rw', 0)
+        ip['reg0']['bf_a'].initial = 1
+        ip['reg0']['bf_a'].access = 'ro'
+        assert (reg.initial, reg.access, reg.codec.initial) == (1, 'ro', 1)
+        assert reg.fingerprint() != values[3]
+        assert reg.fingerprint() == rmap['ip_reg0'].fingerprint()
+        assert rmap._stale_blocks == rmap.submaps
+        assert rmap.fingerprint() != fp
+
+    def test_at_in_range(self):
+        """Registers are found by addresses."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([
+            Register('reg_a', 'Register A', 0x0),
+            Register('reg_b', 'Register B', 0x1f4, complementary=True),
+            Register('reg_c', 'Register C', 0x1f4, complementary=True),
+            self._create_array('ch', 0x104, 4, 8),
+        ])
+        rmap.add_submap('ip', self._create_ip(), 0x200)
+        assert [reg.name for reg in rmap.at(0x1f4)] == ['reg_b', 'reg_c']
+        assert [reg.name for reg in rmap.at('0x10c')] == ['ch1']
+        assert [reg.name for reg in rmap.at(0x204)] == ['ip_reg1']
+        assert rmap.at(0x108) == []
+        assert [reg.name for reg in rmap.in_range(0x10c, 0x204)] == ['ch1', 'ch2', 'ch3', 'reg_b', 'reg_c', 'ip_reg0']
+        assert [reg.name for reg in rmap.in_range(0x0, 0x1000)] == rmap.names
+        assert rmap.in_range(0x300, 0x400) == []
+
+    def test_gaps(self):
+        """Free address ranges are found."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([
+            Register('reg_a', 'Register A', 0x0),
+            Register('reg_b', 'Register B', 0x48),
+            self._create_array('ch', 0x100, 4, 0x10),
+            self._create_array('dma', 0x104, 4, 0x10),
+        ])
+        rmap.add_submap('ip', self._create_ip(), 0x200, size=0x100)
+        assert rmap.gaps(hi=0x400) == [(0x4, 0x48), (0x4c, 0x100), (0x108, 0x110), (0x118, 0x120),
+                                       (0x128, 0x130), (0x138, 0x200), (0x300, 0x400)]
+        assert rmap.gaps(min_size=0x10, hi=0x400) == [(0x4, 0x48), (0x4c, 0x100), (0x138, 0x200), (0x300, 0x400)]
+        assert rmap.gaps(min_size=0x40, align=0x40, hi=0x400) == [(0x80, 0x100), (0x140, 0x200), (0x300, 0x400)]
+        assert rmap.gaps(lo=0x2, hi=0x46) == [(0x4, 0x46)]
+        assert rmap.gaps(min_size=0x100)[-1] == (0x300, 2**32)
+
+    def test_indexes(self):
+        """Registers and bit fields are found by categories after changes of the map and its registers."""
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([
+            Register('reg_a', 'Register A', 0x8, write_lock=True),
+            Register('reg_b', 'Register B', 0x4),
+            self._create_array('ch', 0x100, 2, 8),
+        ])
+        rmap['reg_b'].add_bfields(BitField('data', 'Data', width=8, access='wo', modifiers=['fifo']))
+        assert [reg.name for reg in rmap.regs_with('write_lock')] == ['reg_a']
+        assert [(reg.name, bf.name) for reg, bf in rmap.bfields_with(modifier='fifo')] == [('reg_b', 'data')]
+        assert [reg.name for reg, _ in rmap.bfields_with(access='rw')] == ['ch0', 'ch1']
+        # indexes are updated for the registers changed and added since the previous query
+        rmap['reg_b']['data'].modifiers = []
+        rmap['reg_a'].add_bfields(BitField('data', 'Data', width=8, access='ro', modifiers=['fifo']))
+        rmap.add_regs(Register('reg_c', 'Register C', 0x0, write_lock=True))
+        assert [reg.name for reg in rmap.regs_with('write_lock')] == ['reg_c', 'reg_a']
+        assert [(reg.name, bf.name) for reg, bf in rmap.bfields_with(modifier='fifo', access='ro')] == [
+            ('reg_a', 'data')]
+        assert rmap.bfields_with(modifier='fifo', access='wo') == []
+        rmap.add_submap('ip', self._create_ip(), 0x200)
+        rmap.submaps[0].rmap['reg1']['bf_a'].modifiers = ['hwu']
+        assert [(reg.name, reg.address) for reg, _ in rmap.bfields_with(modifier='hwu')] == [('ip_reg1', 0x204)]
+        with pytest.raises(ValueError):
+            rmap.regs_with('fifo')
+        with pytest.raises(ValueError):
+            rmap.bfields_with()
+
+    def test_clone(self):
+        """Copy of a map is independent of the original map."""
+        ip = self._create_ip()
+        rmap = RegisterMap(Configuration())
+        rmap.add_regs([Register('reg_a', 'Register A', 0x0), self._create_array('ch', 0x100, 4, 0x10)])
+        rmap.add_submap('ip0', ip, 0x200)
+        rmap.add_submap('ip1', ip, 0x300)
+        clone = rmap.clone()
+        assert clone.as_dict() == rmap.as_dict()
+        assert clone.fingerprint() == rmap.fingerprint()
+        assert clone.arrays == [clone['ch']]
+        assert clone.submaps[0].rmap is clone.submaps[1].rmap
+        assert clone.submaps[0].rmap is not ip
+        clone['reg_a'].address = 0x4
+        clone['ch1']  # elements are resolved by the copy
+        clone['ch']['en'].initial = 1
+        clone.config['regmap']['read_filler'].value = 42
+        clone.submaps[0].rmap['reg0'].description = 'Register 0'
+        clone.add_regs(Register('reg_b', 'Register B', 0x0))
+        assert rmap['reg_a'].address == 0x0
+        assert rmap['ch']['en'].initial == 0
+        assert rmap.config['regmap']['read_filler'].value == 0
+        assert rmap['ip1_reg0'].description == 'Register'
+        assert clone['ip1_reg0'].description == 'Register 0'
+        assert 'reg_b' not in rmap.names
+        assert clone.fingerprint() != rmap.fingerprint()
+
+    def test_pickle(self):
+        """Map is pickled with all its registers, submaps and configuration."""
+        ip = self._create_ip()
+        rmap = RegisterMap(Configuration())
+        rmap.config['lb_bridge']['type'].value = 'apb'
+        reg = Register(address=0x0)
+        reg.add_bfields(BitField('cnt', 'Counter', width=16, initial=3, access='ro', modifiers=['hwu']))
+        rmap.add_regs([reg, self._create_array('ch', 0x100, 4, 0x10)])
+        rmap.add_submap('ip0', ip, 0x200)
+        rmap.add_submap('ip1', ip, 0x300)
+        rmap._validate()
+        loaded = pickle.loads(pickle.dumps(rmap))
+        assert loaded.as_dict() == rmap.as_dict()
+        assert loaded.fingerprint() == rmap.fingerprint()
+        assert loaded._validated
+        assert loaded.submaps[0].rmap is loaded.submaps[1].rmap
+        assert loaded['cnt']['cnt']._spec is reg['cnt']._spec
+        assert loaded['ch2'].address == 0x120
+        with pytest.raises(ValueError):
+            loaded.config['data_width'].value = 64
+        loaded.submaps[0].rmap.add_regs(Register('reg2', 'Register', 0x8))
+        assert loaded['ip1_reg2'].address == 0x308
+        element = pickle.loads(pickle.dumps(rmap['ch1']))
+        assert (element.__class__, element.name, element.address) == (Register, 'ch1', 0x110)
+        bf = pickle.loads(pickle.dumps(rmap['ip0_reg1']['bf_a']))
+        assert bf == ip['reg1']['bf_a']
+
+    def test_clone_config(self):
+        """Copy of a map is checked with a configuration, which affects checks."""
+        rmap = RegisterMap(Configuration())
+        reg = Register('reg_a', 'Register A', 0x4)
+        reg.add_bfields(BitField('bf_a', 'Bit field A', lsb=0, width=32))
+        rmap.add_regs(reg)
+        config = Configuration()
+        config['lb_bridge']['type'].value = 'apb'
+        config['register_reset'].value = 'async_neg'
+        assert rmap.clone(config).config['register_reset'].value == 'async_neg'
+        config = Configuration()
+        config['data_width'].value = 16
+        with pytest.raises(ValueError):
+            rmap.clone(config)
+        config = Configuration()
+        config['data_width'].value = 64
+        with pytest.raises(ValueError, match="alligned"):
+            rmap.clone(config)
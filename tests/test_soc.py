@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""SoC address space module tests.
+"""
+
+import pytest
+from corsair import BitField, Register, RegisterMap, AddressSpace
+from corsair import Configuration
+
+
+def _make_rmap(regs_num=2, data_width=32):
+    config = Configuration()
+    config['data_width'].value = data_width
+    rmap = RegisterMap(config)
+    rmap.add_regs([Register('reg_%d' % i, 'Register', i * data_width // 8) for i in range(regs_num)])
+    return rmap
+
+
+class TestAddressSpace:
+    """Class 'AddressSpace' testing."""
+    def test_overlaps(self):
+        """All windows overlapping are reported in order of base addresses."""
+        soc = AddressSpace()
+        rmap = _make_rmap()
+        soc.add_block('a', rmap, 0x0, 0x100)
+        soc.add_block('b', rmap, 0x200, 0x100)
+        soc.add_block('c', rmap, 0x80, 0x200)
+        soc.add_block('d', RegisterMap(Configuration()), 0x300, 0x0)
+        assert soc.check() == [
+            "Window [0x80, 0x280) of block 'c' overlaps window [0x0, 0x100) of block 'a'!",
+            "Window [0x200, 0x300) of block 'b' overlaps window [0x80, 0x280) of block 'c'!",
+        ]
+        assert [block.name for block in soc] == ['a', 'c', 'b', 'd']
+
+    def test_out_of_window(self):
+        """Registers out of the windows and data width of the blocks are reported."""
+        soc = AddressSpace()
+        soc.add_block('a', _make_rmap(regs_num=8), 0x0, 0x10)
+        soc.add_block('b', _make_rmap(data_width=64), 0x100)
+        assert soc.check() == [
+            "4 register(s) of block 'a' are out of its window [0x0, 0x10), the first is 'reg_4'!",
+            "Block 'b' with data width 64 exceeds interface data width 32!",
+        ]
+
+    def test_window_unaligned(self):
+        """Registers crossing the end of a window, which size is not a multiple of data width, are reported."""
+        soc = AddressSpace()
+        soc.add_block('a', _make_rmap(), 0x0, 6)
+        assert soc.check() == ["1 register(s) of block 'a' are out of its window [0x0, 0x6), the first is 'reg_1'!"]
+        soc.move_block('a', size=2)
+        assert soc.check() == ["2 register(s) of block 'a' are out of its window [0x0, 0x2), the first is 'reg_0'!"]
+
+    def test_prefixes(self):
+        """Prefixes of names of registers starting with each other are reported, and nothing is left after build."""
+        soc = AddressSpace()
+        rmap_a = RegisterMap(Configuration())
+        rmap_a.add_regs(Register('b_c', 'Register', 0x0))
+        rmap_ab = RegisterMap(Configuration())
+        rmap_ab.add_regs(Register('c', 'Register', 0x0))
+        soc.add_block('a', rmap_a, 0x0, 0x10)
+        soc.add_block('a_b', rmap_ab, 0x10, 0x10)
+        soc.add_block('c', rmap_ab, 0x20, 0x10, prefix='a_')
+        assert soc.check() == [
+            "Prefix 'a_' of block 'c' conflicts with prefix 'a_' of block 'a'!",
+            "Prefix 'a_b_' of block 'a_b' conflicts with prefix 'a_' of block 'a'!",
+            "Prefix 'a_' of block 'c' conflicts with prefix 'a_b_' of block 'a_b'!",
+        ]
+        with pytest.raises(ValueError, match='3 problem'):
+            soc.build()
+        soc.remove_block('c')
+        soc.move_block('a', base=0x40)
+        assert len(soc.check()) == 1
+        # forget the problems found to make add_submap() fail during build
+        soc._stale.clear()
+        soc._pair_issues.clear()
+        with pytest.raises(ValueError, match='conflicts'):
+            soc.build()
+        assert len(rmap_a._placements) == 1
+        assert len(rmap_ab._placements) == 1
+        soc.remove_block('a_b')
+        assert soc.check() == []
+        assert soc.build()['a_b_c'].address == 0x40
+
+    def test_incremental(self):
+        """Only blocks changed are checked again, including changes of their register maps."""
+        soc = AddressSpace()
+        rmap = _make_rmap()
+        for i in range(4):
+            soc.add_block('blk%d' % i, rmap, i * 0x10, 0x10)
+        soc.add_block('other', _make_rmap(), 0x100, 0x10)
+        assert soc.check() == []
+        soc.move_block('blk1', base=0x8)
+        assert soc.check() == ["Window [0x8, 0x18) of block 'blk1' overlaps window [0x0, 0x10) of block 'blk0'!"]
+        soc.move_block('blk1', base=0x10)
+        assert soc._stale == {'blk1'}
+        assert soc.check() == []
+        rmap.add_regs(Register('reg_big', 'Register', 0x10))
+        assert soc._stale == {'blk0', 'blk1', 'blk2', 'blk3'}
+        assert len(soc.check()) == 4
+        soc.remove_block('blk0')
+        assert len(soc) == 4
+        with pytest.raises(KeyError):
+            soc['blk0']
+        assert len(soc.check()) == 3
+
+    def test_build(self):
+        """Register map of the address space has all the blocks as submaps."""
+        soc = AddressSpace()
+        rmap = _make_rmap()
+        rmap['reg_1'].add_bfields(BitField('bf', 'Bit field', width=8))
+        soc.add_block('a', rmap, 0x100, 0x100)
+        soc.add_block('b', 'tests/data/map.json', 0x0, prefix='B_')
+        soc.add_block('c', 'tests/data/map.json', 0x200, 0x100, prefix='C_')
+        assert soc['b'].rmap is soc['c'].rmap
+        top = soc.build()
+        assert [block.name for block in top.submaps] == ['b', 'a', 'c']
+        assert top['a_reg_1'].address == 0x104
+        assert top['C_VERSION'].address == 0x240
+        assert len(top) == 16
+        soc.move_block('c', base=0x80)
+        with pytest.raises(ValueError, match='1 problem'):
+            soc.build()
+        soc.move_block('c', base=0x300)
+        assert soc.build()['C_VERSION'].address == 0x340
+        assert len(rmap._placements) == 2
@@ -8,7 +8,7 @@ import pytest
 from corsair import RegisterMapReader, ConfigurationReader
 from corsair import RegisterMapWriter, ConfigurationWriter, LbBridgeWriter
 from corsair import HdlWriter, DocsWriter
-from corsair import Configuration, RegisterMap
+from corsair import Configuration, RegisterMap, Register, RegisterArray, BitField
 
 
 class TestRegisterMapWriter:
@@ -23,6 +23,34 @@ class TestRegisterMapWriter:
         rmap_test = RegisterMapReader()(path)
         assert rmap_test == rmap_orig
 
+    def test_write_arrays(self, tmpdir):
+        """Test of writing register map with register arrays."""
+        output_file = str(tmpdir.join('map_out.yaml'))
+        rmap_orig = RegisterMap(Configuration())
+        arr = RegisterArray('ch', 'Channel', address=0x10, count=4, stride=8)
+        arr.add_bfields(BitField('en', 'Enable', lsb=0))
+        rmap_orig.add_regs([Register('reg_a', 'Register A', 0x0), arr])
+        RegisterMapWriter()(output_file, rmap_orig)
+        rmap_test = RegisterMapReader()(output_file, Configuration())
+        assert rmap_test == rmap_orig
+        assert rmap_test.names == ['reg_a', 'ch0', 'ch1', 'ch2', 'ch3']
+
+    def test_write_submaps(self, tmpdir):
+        """Test of writing register map with submaps, which are flattened."""
+        output_file = str(tmpdir.join('map_out.yaml'))
+        ip = RegisterMap(Configuration())
+        ip.add_regs(Register('ctrl', 'Control', 0x0))
+        ip['ctrl'].add_bfields(BitField('en', 'Enable', lsb=0))
+        rmap_orig = RegisterMap(Configuration())
+        rmap_orig.add_regs(Register('reg_a', 'Register A', 0x0))
+        rmap_orig.add_submap('ip0', ip, 0x100)
+        rmap_orig.add_submap('ip1', ip, 0x200)
+        RegisterMapWriter()(output_file, rmap_orig)
+        rmap_test = RegisterMapReader()(output_file, Configuration())
+        assert rmap_test.names == ['reg_a', 'ip0_ctrl', 'ip1_ctrl']
+        assert rmap_test['ip1_ctrl'].address == 0x200
+        assert rmap_test['ip1_ctrl']['en'].width == 1
+
     def test_write_json(self, tmpdir):
         """Test of writing register map to a JSON file."""
         output_file = str(tmpdir.join('map_out.json'))
@@ -98,6 +126,34 @@ class TestHdlWriter:
         assert 'module regs' in raw_str
         assert 'endmodule' in raw_str
 
+    def _write_arrays(self, path, mode):
+        config = Configuration()
+        config['register_arrays'].value = mode
+        rmap = RegisterMap(config)
+        arr = RegisterArray('ch', 'Channel', address=0x10, count=4, stride=8)
+        arr.add_bfields([
+            BitField('en', 'Enable', lsb=0),
+            BitField('cnt', 'Counter', lsb=8, width=8, access='ro', modifiers=['hwu']),
+        ])
+        rmap.add_regs(arr)
+        HdlWriter()(path, rmap)
+        with open(path, 'r') as f:
+            return ''.join(f.readlines())
+
+    def test_verilog_arrays_unroll(self, tmpdir):
+        """Test of creating regmap module with unrolled register arrays in Verilog."""
+        raw_str = self._write_arrays(str(tmpdir.join('regs.v')), 'unroll')
+        assert 'csr_ch3_en_out,' in raw_str
+        assert 'generate' not in raw_str
+
+    def test_verilog_arrays_generate(self, tmpdir):
+        """Test of creating regmap module with register arrays as generate loops in Verilog."""
+        raw_str = self._write_arrays(str(tmpdir.join('regs.v')), 'generate')
+        assert 'output [3:0] csr_ch_en_out' in raw_str
+        assert 'input [31:0] csr_ch_cnt_in' in raw_str
+        assert 'for (csr_ch_i = 0; csr_ch_i < 4; csr_ch_i = csr_ch_i + 1) begin : csr_ch_gen' in raw_str
+        assert 'csr_ch3' not in raw_str
+
 
 class TestDocsWriter:
     """Class 'DocsWriter' testing."""